@@ -0,0 +1,54 @@
+"""
+Teklif API'si komutu
+  python -m api                         # API_HOST:API_PORT, API_WORKERS işçi
+  python -m api --host 0.0.0.0 --port 8600 --workers 8
+  curl -s localhost:8600/quote -d '{"vessel_name": "MV X", "port": "TEKIRDAG", "nrt": 2196, "grt": 5197}'
+Streamlit arayüzünden bağımsız çalışır; aynı tarife dizini, kur kaynağı ve
+motor kullanılır. Ctrl+C ile bekleyen teklifler tamamlanıp kapanır.
+"""
+import argparse
+import asyncio
+import sys
+
+from config.settings import API_HOST, API_PORT, API_WORKERS, API_BATCH_MAX, API_BATCH_WAIT_MS, API_MAX_INFLIGHT
+from calculators.result_cache import default_cache
+from api.server import serve
+from api.service import QuoteService
+from utils import metrics
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api", description="HTTP/JSON proforma teklif servisi")
+    parser.add_argument("--host", default=API_HOST, help="Dinlenecek adres")
+    parser.add_argument("--port", type=int, default=API_PORT, help="Port")
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="İşçi süreç sayısı (0: süreç içi tek thread)")
+    parser.add_argument("--batch-max", type=int, default=API_BATCH_MAX, help="İşçiye giden parça başına en fazla teklif")
+    parser.add_argument("--batch-wait-ms", type=float, default=API_BATCH_WAIT_MS, help="Mikro toplama penceresi (ms)")
+    parser.add_argument("--max-inflight", type=int, default=API_MAX_INFLIGHT,
+                        help="Aynı anda hesaplanan parça sayısı (0: işçi x 2)")
+    parser.add_argument("--no-cache", action="store_true", help="Sonuç cache'ini kullanma (RESULT_CACHE_MB / RESULT_CACHE_DB)")
+    args = parser.parse_args(argv)
+
+    metrics.configure()
+
+    async def run():
+        service = QuoteService(args.workers, args.batch_max, args.batch_wait_ms, args.max_inflight,
+                               cache=None if args.no_cache else default_cache())
+        ready = asyncio.Event()
+        server = asyncio.create_task(serve(args.host, args.port, service, ready))
+        waiting = asyncio.create_task(ready.wait())
+        await asyncio.wait({server, waiting}, return_when=asyncio.FIRST_COMPLETED)
+        if server.done():
+            waiting.cancel()
+            await server  # başlatma hatası (port kullanımda vb.)
+        print(f"Teklif API'si: http://{args.host}:{args.port} ({args.workers} işçi)", file=sys.stderr)
+        await server
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Sunucu başlatılamadı: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,199 @@
+"""
+HTTP/JSON teklif sunucusu - asyncio.start_server üzerinde küçük bir HTTP/1.1
+Uç noktalar:
+  POST /quote    tek uğrama kaydı (batch.records alanları) -> çıktı kaydı
+  POST /quotes   {"calls": [kayıt, ...]} veya liste -> {"results": [...]}
+  GET  /health   durum, güncel tarife sürümü, bekleyen teklif sayısı
+  GET  /metrics  Prometheus metni (utils.metrics)
+Bağlantılar keep-alive'dır; gövde Content-Length ile okunur (chunked
+desteklenmez). Hatalı kayıt 422, kuyruk dolu 503 (Retry-After), beklenmeyen
+hata 500 (JSON gövdeli) döner.
+"""
+import asyncio
+import json
+import sys
+import time
+import traceback
+from http import HTTPStatus
+from typing import Optional
+
+from config.settings import API_MAX_BATCH, API_MAX_BODY_BYTES, API_IDLE_TIMEOUT_SEC
+from calculators.tariff_sets import registry
+from api.service import QuoteService, ServiceBusy
+from utils import metrics
+
+MAX_HEADER_BYTES = 16 * 1024
+
+JSON_TYPE = "application/json; charset=utf-8"
+TEXT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _response(status: int, body: bytes, content_type: str = JSON_TYPE, keep_alive: bool = True, extra: str = "") -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"{extra}\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[tuple[str, str, dict, bytes]]:
+    """(yöntem, yol, başlıklar, gövde); bağlantı kapandıysa None"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HttpError(400, "Eksik istek başlığı")
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, "İstek başlığı çok büyük")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Geçersiz istek satırı")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(411, "Content-Length gerekli (chunked desteklenmez)")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(400, "Geçersiz Content-Length")
+    if length > API_MAX_BODY_BYTES:
+        raise HttpError(413, f"Gövde en fazla {API_MAX_BODY_BYTES} bayt olabilir")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _body_json(body: bytes):
+    try:
+        return json.loads(body or b"null")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HttpError(400, f"Geçersiz JSON: {e}")
+
+
+class QuoteServer:
+    """Yönlendirme ve bağlantı döngüsü"""
+
+    def __init__(self, service: QuoteService):
+        self.service = service
+        self.started = time.time()
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[int, bytes, str]:
+        if path == "/quote":
+            self._allow(method, "POST")
+            record = _body_json(body)
+            if not isinstance(record, dict):
+                raise HttpError(400, "Gövde bir JSON nesnesi olmalı")
+            output, error, status = await self.service.quote(record)
+            if error is not None:
+                return status, _json({"id": str(record.get("id") or 1), "error": error}), JSON_TYPE
+            return 200, _json(output), JSON_TYPE
+        if path == "/quotes":
+            self._allow(method, "POST")
+            payload = _body_json(body)
+            calls = payload.get("calls") if isinstance(payload, dict) else payload
+            if not isinstance(calls, list):
+                raise HttpError(400, 'Gövde {"calls": [...]} veya liste olmalı')
+            if len(calls) > API_MAX_BATCH:
+                raise HttpError(413, f"İstek başına en fazla {API_MAX_BATCH} teklif")
+            results = await self.service.quote_many(calls)
+            items = []
+            for i, (call, (output, error, _status)) in enumerate(zip(calls, results), start=1):
+                if error is None:
+                    items.append(output)
+                else:
+                    record_id = call.get("id") if isinstance(call, dict) else None
+                    items.append({"id": str(record_id or i), "error": error})
+            errors = sum(1 for _, error, _ in results if error is not None)
+            return 200, _json({"count": len(items), "errors": errors, "results": items}), JSON_TYPE
+        if path == "/health":
+            self._allow(method, "GET")
+            payload = {
+                "status": "ok",
+                "tariff_version": registry().active().version,
+                "uptime_sec": round(time.time() - self.started, 1),
+                **self.service.stats(),
+            }
+            return 200, _json(payload), JSON_TYPE
+        if path == "/metrics":
+            self._allow(method, "GET")
+            return 200, metrics.render_prometheus().encode("utf-8"), TEXT_TYPE
+        raise HttpError(404, f"Bilinmeyen yol: {path}")
+
+    @staticmethod
+    def _allow(method: str, expected: str):
+        if method != expected:
+            raise HttpError(405, f"{expected} bekleniyor")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Bağlantı: istemci kapatana veya boşta kalma süresi dolana kadar istekleri sırayla işle"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), API_IDLE_TIMEOUT_SEC)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    writer.write(_response(e.status, _json({"error": e.message}), keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                start = time.perf_counter()
+                extra = ""
+                try:
+                    status, payload, content_type = await self.route(method, path, body)
+                except HttpError as e:
+                    status, payload, content_type = e.status, _json({"error": e.message}), JSON_TYPE
+                except ServiceBusy as e:
+                    status, payload, content_type = 503, _json({"error": str(e)}), JSON_TYPE
+                    extra = "Retry-After: 1\r\n"
+                except Exception as e:  # noqa: BLE001 - bağlantı cevapsız kapanmasın
+                    traceback.print_exc(file=sys.stderr)
+                    status, payload, content_type = 500, _json({"error": f"İç hata: {type(e).__name__}"}), JSON_TYPE
+                metrics.histogram("api_request_seconds", "HTTP istek süresi", path=path if status != 404 else "other",
+                                  status=str(status)).observe(time.perf_counter() - start)
+                writer.write(_response(status, payload, content_type, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host: str, port: int, service: QuoteService, ready: Optional[asyncio.Event] = None):
+    """Sunucuyu başlat ve iptal edilene kadar çalıştır"""
+    server = QuoteServer(service)
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES)
+    if ready is not None:
+        ready.set()
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await service.close()
@@ -0,0 +1,245 @@
+"""
+Fiyat teklifi servisi - asyncio tarafı ile işçi süreçleri arasındaki köprü
+Her teklif (kayıt + tarife sürümü + kurlar) kanonik bir anahtara indirgenir:
+aynı anahtarla zaten bekleyen bir teklif varsa yeni istek onun sonucunu
+bekler (istek birleştirme). Bekleyen teklifler kısa bir pencere
+(API_BATCH_WAIT_MS) veya API_BATCH_MAX kayıt dolana kadar toplanıp tek
+parça olarak işçi havuzuna gönderilir; aynı anda en fazla API_MAX_INFLIGHT
+parça hesaplanır. Bekleyen teklif sayısı API_MAX_PENDING'i aşarsa yeni
+istekler ServiceBusy ile reddedilir. Hesap batch.pipeline.price_record ile
+yapılır: sayfa ve toplu fiyatlamayla aynı motor, aynı çıktı kaydı.
+Sonuç cache'i (calculators.result_cache) ana süreçte sorulur: daha önce
+hesaplanmış bir teklif işçiye gitmeden, hesaplayıcılar çağrılmadan döner.
+"""
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Sequence
+
+from config.settings import API_WORKERS, API_BATCH_MAX, API_BATCH_WAIT_MS, API_MAX_INFLIGHT, API_MAX_PENDING
+from calculators.engine import ProformaEngine, Rates
+from calculators.result_cache import ResultCache, decode_proforma, default_cache, encode_output, proforma_key
+from calculators.tariff_sets import TariffSet, current_tariffs, registry, use_tariffs
+from batch.pipeline import price_record
+from batch.records import to_output, to_port_call
+from utils import metrics
+from utils.rates import get_rate_provider
+
+QUOTES = metrics.counter("api_quotes_total", "Fiyatlanan teklif sayısı (birleştirilenler hariç)")
+COALESCED = metrics.counter("api_coalesced_total", "Bekleyen aynı teklife bağlanan istek sayısı")
+REJECTED = metrics.counter("api_rejected_total", "Kuyruk dolu diye reddedilen teklif sayısı")
+CHUNK_SIZE = metrics.histogram("api_chunk_items", "İşçiye giden parçadaki teklif sayısı",
+                               buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+# (çıktı, hata, HTTP durumu) - başarılıda hata None
+Result = tuple[Optional[dict], Optional[str], int]
+
+
+class ServiceBusy(RuntimeError):
+    """Bekleyen teklif sınırı aşıldı"""
+
+
+# İşçi süreci durumu (_init_worker ile bir kez kurulur)
+_worker_engine: Optional[ProformaEngine] = None
+_worker_sets: dict[str, TariffSet] = {}
+
+
+def _init_worker(tariff_sets: Sequence[TariffSet]):
+    """İşçi başlangıcı: derlenmiş tarife setleri bir kez gelir"""
+    global _worker_engine, _worker_sets
+    _worker_engine = ProformaEngine(tariff_sets=tuple(tariff_sets))
+    _worker_sets = {s.version: s for s in tariff_sets}
+
+
+def _quote_chunk(items: list[tuple[dict, str, Rates]]) -> list[Result]:
+    """Parçadaki teklifleri fiyatla; beklenmeyen hata sadece o teklifi düşürür"""
+    results = []
+    for record, version, rates in items:
+        try:
+            with use_tariffs(_worker_sets[version]):
+                output, error = price_record(_worker_engine, 0, record, rates)
+        except Exception as e:  # noqa: BLE001 - parçadaki diğer teklifler etkilenmesin
+            results.append((None, f"İç hata: {type(e).__name__}: {e}", 500))
+            continue
+        results.append((output, None, 200) if error is None else (None, error, 422))
+    return results
+
+
+def quote_key(record: dict, version: str, rates: Rates) -> str:
+    """Kanonik teklif anahtarı: alan sırası ve boşluklardan bağımsız"""
+    return json.dumps([record, version, rates.usd_eur, rates.usd_tl, rates.snapshot_id], sort_keys=True, default=str)
+
+
+class QuoteService:
+    """Birleştirme, mikro toplama ve sınırlı eşzamanlılıkla teklif hesabı"""
+
+    def __init__(
+        self,
+        workers: int = API_WORKERS,
+        batch_max: int = API_BATCH_MAX,
+        batch_wait_ms: float = API_BATCH_WAIT_MS,
+        max_inflight: int = API_MAX_INFLIGHT,
+        max_pending: int = API_MAX_PENDING,
+        cache: Optional[ResultCache] = None,
+    ):
+        self.workers = workers
+        self.batch_max = max(1, batch_max)
+        self.batch_wait = batch_wait_ms / 1000
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_inflight or max(1, workers) * 2)
+        self._pending: dict[str, asyncio.Future] = {}
+        self._queue: list[tuple[str, tuple[dict, str, Rates]]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._executor: Optional[Executor] = None
+        self._digests: dict[str, str] = {}   # işçilerdeki setler: sürüm -> özet
+        self.cache = cache
+        # teklif anahtarı -> (sonuç cache anahtarı, sürüm, anahtardaki set özeti)
+        self._cache_keys: dict[str, tuple[str, str, str]] = {}
+
+    def _pool(self) -> Executor:
+        """İşçi havuzu; tarife setleri değişince (yeni YAML veya mevcut sürümün yerinde düzenlenmesi) yeniden kurulur"""
+        sets = registry().versions()
+        default = current_tariffs()
+        if all(s.version != default.version for s in sets):
+            sets.append(default)
+        digests = {s.version: s.digest for s in sets}
+        if self._executor is None or digests != self._digests:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(sets,))
+            else:
+                # API_WORKERS=0: süreç içinde tek thread (geliştirme / küçük kurulum)
+                _init_worker(sets)
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="quote")
+            self._digests = digests
+        return self._executor
+
+    def _prepare(self, record: dict, rates: Rates) -> tuple[str, tuple[dict, str, Rates]]:
+        """Anahtar ve işçi girdisi; id anahtara girmez (farklı id'li aynı teklifler birleşir)"""
+        if not isinstance(record, dict):
+            record = {"_error": "Teklif bir JSON nesnesi olmalı"}
+        body = {name: value for name, value in record.items() if name != "id"}
+        version = registry().active().version
+        return quote_key(body, version, rates), (body, version, rates)
+
+    def _from_cache(self, item: tuple[dict, str, Rates]) -> tuple[Optional[tuple[str, str, str]], Optional[Result]]:
+        """((sonuç cache anahtarı, sürüm, özet), cache'teki sonuç); hatalı kayıt cache'e bakılmadan işçiye gider (422 orada üretilir)"""
+        if self.cache is None:
+            return None, None
+        body, version, rates = item
+        try:
+            call = to_port_call(body, rates)
+            tariffs = registry().for_date(call.call_date) if call.call_date is not None else registry().get(version)
+        except Exception:  # noqa: BLE001 - hata mesajı ve durumu işçi yolunda üretilir
+            return None, None
+        cache_key = proforma_key(call, tariffs)
+        data = self.cache.get(cache_key)
+        if data is None:
+            return (cache_key, tariffs.version, tariffs.digest), None
+        return (cache_key, tariffs.version, tariffs.digest), (to_output("0", decode_proforma(call, data)), None, 200)
+
+    def _submit(self, key: str, item: tuple[dict, str, Rates]) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is not None:
+            COALESCED.inc()
+            return future
+        if len(self._pending) >= self.max_pending:
+            REJECTED.inc()
+            raise ServiceBusy("Teklif kuyruğu dolu, lütfen tekrar deneyin.")
+        loop = asyncio.get_running_loop()
+        future = self._pending[key] = loop.create_future()
+        self._queue.append((key, item))
+        if len(self._queue) >= self.batch_max:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            chunk, self._queue = self._queue[:self.batch_max], self._queue[self.batch_max:]
+            task = asyncio.get_running_loop().create_task(self._dispatch(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, chunk: list[tuple[str, tuple[dict, str, Rates]]]):
+        async with self._slots:
+            keys = [key for key, _ in chunk]
+            digests = {}
+            try:
+                pool = self._pool()
+                digests = self._digests
+                results = await asyncio.get_running_loop().run_in_executor(
+                    pool, _quote_chunk, [item for _, item in chunk],
+                )
+            except Exception as e:  # noqa: BLE001 - işçi çöktü vb.; bekleyenlere iletilir
+                results = [(None, f"İç hata: {type(e).__name__}: {e}", 500)] * len(chunk)
+            QUOTES.inc(len(chunk))
+            CHUNK_SIZE.observe(len(chunk))
+            for key, result in zip(keys, results):
+                entry = self._cache_keys.pop(key, None)
+                if entry is not None and result[0] is not None:
+                    cache_key, version, digest = entry
+                    # Anahtar alındıktan sonra tarife yeniden yüklendiyse sonuç başka setle hesaplanmıştır
+                    if digests.get(version) == digest:
+                        self.cache.put(cache_key, encode_output(result[0]))
+                future = self._pending.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(result)
+
+    def default_rates(self) -> Rates:
+        """Satırda kur yoksa kullanılan güncel kur snapshot'ı"""
+        return Rates.from_snapshot(get_rate_provider().get())
+
+    async def quote(self, record: dict) -> Result:
+        """Tek teklif"""
+        return (await self.quote_many([record]))[0]
+
+    async def quote_many(self, records: Sequence[dict]) -> list[Result]:
+        """Teklif listesi (girdi sırasıyla). Kuyruk doluysa hiçbiri kuyruğa alınmaz"""
+        if len(self._pending) + len(records) > self.max_pending:
+            REJECTED.inc(len(records))
+            raise ServiceBusy("Teklif kuyruğu dolu, lütfen tekrar deneyin.")
+        rates = self.default_rates()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for record in records:
+            key, item = self._prepare(record, rates)
+            entry, hit = self._from_cache(item)
+            if hit is not None:
+                future = loop.create_future()
+                future.set_result(hit)
+            else:
+                future = self._submit(key, item)
+                if entry is not None:
+                    self._cache_keys[key] = entry
+            futures.append(future)
+        # Birleştirilen future'lar paylaşılır; bir istemcinin iptali diğerini etkilemesin
+        results = await asyncio.gather(*(asyncio.shield(f) for f in futures))
+        out = []
+        for i, (record, (output, error, status)) in enumerate(zip(records, results), start=1):
+            record_id = str(record.get("id") or i) if isinstance(record, dict) else str(i)
+            out.append(({**output, "id": record_id} if output is not None else None, error, status))
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": len(self._pending),
+            "queued": len(self._queue),
+            "tariff_versions": sorted(self._digests),
+            "result_cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def close(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
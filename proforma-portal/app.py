@@ -5,6 +5,7 @@ Streamlit ile denizcilik acentesi proforma hesaplama portalı
 import streamlit as st
 from auth.session import init_session, is_logged_in, set_user, get_user, logout
 from auth.database import register_user, login_user
+from utils.resources import warm_up
 
 st.set_page_config(page_title="Proforma Portal", page_icon="⛵", layout="wide")
 init_session()
@@ -39,6 +40,8 @@ if not is_logged_in():
                 else:
                     st.error(msg)
 else:
+    # Motor, tarife setleri ve DB havuzları sayfalara geçmeden hazırlanır
+    warm_up()
     user = get_user()
     st.sidebar.title("Proforma Portal")
     st.sidebar.success(f"Hoş geldiniz, {user['full_name']}")
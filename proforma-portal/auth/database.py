@@ -1,37 +1,57 @@
 """
 SQLite tabanlı kullanıcı veritabanı - kayıt ve giriş
+Bağlantılar süreç başına havuzdan alınır (WAL, ayarlı pragmalar);
+şema ilk bağlantıda oluşturulur, import sırasında DB'ye dokunulmaz.
 """
 import sqlite3
-import os
-import bcrypt
+import threading
 from pathlib import Path
 
+from config.settings import DB_POOL_SIZE
+from utils.sqlite_pool import ConnectionPool
+from auth.hashing import hash_password, verify_password, needs_rehash, HashingBusy
+
 DB_PATH = Path(__file__).parent.parent / "data" / "users.db"
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    company_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Sabit SQL metinleri: havuzdaki bağlantıların statement cache'inde hazır kalır
+_INSERT_USER = "INSERT INTO users (email, password_hash, full_name, company_name) VALUES (?, ?, ?, ?)"
+_SELECT_USER_BY_EMAIL = "SELECT id, email, password_hash, full_name, company_name FROM users WHERE email = ?"
+_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Süreç başına bağlantı havuzu (ilk çağrıda oluşturulur)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH, max_size=DB_POOL_SIZE, init_script=_SCHEMA)
+    return _pool
+
 
 def get_connection():
-    """Veritabanı bağlantısı"""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(str(DB_PATH))
+    """Havuzdan veritabanı bağlantısı: with get_connection() as conn"""
+    return get_pool().connection()
 
 
 def init_db():
-    """users tablosunu oluştur"""
-    conn = get_connection()
-    try:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                company_name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-    finally:
-        conn.close()
+    """users tablosunu oluştur (ilk havuz bağlantısı şemayı kurar)"""
+    with get_connection():
+        pass
 
 
 def register_user(email: str, password: str, full_name: str, company_name: str = "") -> tuple[bool, str]:
@@ -44,22 +64,21 @@ def register_user(email: str, password: str, full_name: str, company_name: str =
     if len(password) < 6:
         return False, "Şifre en az 6 karakter olmalıdır."
 
-    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-
-    conn = get_connection()
     try:
-        conn.execute(
-            "INSERT INTO users (email, password_hash, full_name, company_name) VALUES (?, ?, ?, ?)",
-            (email.strip().lower(), password_hash, full_name.strip(), (company_name or "").strip()),
-        )
-        conn.commit()
+        password_hash = hash_password(password)
+        with get_connection() as conn:
+            with conn:
+                conn.execute(
+                    _INSERT_USER,
+                    (email.strip().lower(), password_hash, full_name.strip(), (company_name or "").strip()),
+                )
         return True, "Kayıt başarılı. Giriş yapabilirsiniz."
     except sqlite3.IntegrityError:
         return False, "Bu email adresi zaten kayıtlı."
+    except HashingBusy as e:
+        return False, str(e)
     except Exception as e:
         return False, f"Hata: {str(e)}"
-    finally:
-        conn.close()
 
 
 def login_user(email: str, password: str) -> tuple:
@@ -70,30 +89,38 @@ def login_user(email: str, password: str) -> tuple:
     if not email or not password:
         return False, None, "Email ve şifre girin."
 
-    conn = get_connection()
-    try:
-        row = conn.execute(
-            "SELECT id, email, password_hash, full_name, company_name FROM users WHERE email = ?",
-            (email.strip().lower(),),
-        ).fetchone()
+    with get_connection() as conn:
+        row = conn.execute(_SELECT_USER_BY_EMAIL, (email.strip().lower(),)).fetchone()
 
-        if not row:
-            return False, None, "Geçersiz email veya şifre."
+    if not row:
+        return False, None, "Geçersiz email veya şifre."
 
-        _id, db_email, password_hash, full_name, company_name = row
+    _id, db_email, password_hash, full_name, company_name = row
 
-        if not bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8")):
+    try:
+        if not verify_password(password, password_hash):
             return False, None, "Geçersiz email veya şifre."
+    except HashingBusy as e:
+        return False, None, str(e)
+
+    # Eski cost ile oluşturulmuş hash'i şeffaf olarak yükselt
+    if needs_rehash(password_hash):
+        _rehash(_id, password, password_hash)
 
-        return True, {
-            "id": _id,
-            "email": db_email,
-            "full_name": full_name,
-            "company_name": company_name or "",
-        }, "Giriş başarılı."
-    finally:
-        conn.close()
+    return True, {
+        "id": _id,
+        "email": db_email,
+        "full_name": full_name,
+        "company_name": company_name or "",
+    }, "Giriş başarılı."
 
 
-# Uygulama başlangıcında DB'yi hazırla
-init_db()
+def _rehash(user_id: int, password: str, old_hash: str):
+    """Şifreyi güncel cost ile yeniden hash'le. Hata girişi engellemez"""
+    try:
+        new_hash = hash_password(password)
+        with get_connection() as conn:
+            with conn:
+                conn.execute(_UPDATE_PASSWORD_HASH, (new_hash, user_id, old_hash))
+    except (HashingBusy, sqlite3.Error):
+        pass
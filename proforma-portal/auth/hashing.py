@@ -0,0 +1,95 @@
+"""
+bcrypt şifre hash'leme - sınırlı işçi havuzunda, ayarlanabilir cost ile
+bcrypt GIL'i bırakır; hash işleri script thread'i yerine sabit sayıda
+işçi thread'inde çalışır, eşzamanlı girişler CPU'yu aşırı doldurmaz.
+Doğrulama süreleri (kuyruk bekleme dahil) utils.metrics histogramlarında tutulur.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from config.settings import BCRYPT_ROUNDS, HASH_WORKERS
+from utils.metrics import LatencyStats, counter, histogram
+
+# Kuyrukta bekleyebilecek iş sayısı: işçi başına
+QUEUE_PER_WORKER = 8
+QUEUE_TIMEOUT_SEC = 10.0
+
+# Gecikme histogramı üst sınırları (saniye)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class HashingBusy(RuntimeError):
+    """Hash kuyruğu dolu - sistem yoğun"""
+
+
+HASH_LATENCY = histogram("hash_seconds", "bcrypt hash süresi (kuyruk dahil)", buckets=LATENCY_BUCKETS, op="hash")
+VERIFY_LATENCY = histogram("hash_seconds", buckets=LATENCY_BUCKETS, op="verify")
+BUSY = counter("hash_busy_total", "Kuyruk dolu diye reddedilen hash işleri")
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(HASH_WORKERS * QUEUE_PER_WORKER)
+                _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+
+def _run(fn, *args, stats: LatencyStats):
+    """fn'i işçi havuzunda çalıştır, bitene kadar bekle. Süre kuyruk beklemesi dahil ölçülür"""
+    executor = _get_executor()
+    start = time.perf_counter()
+    if not _slots.acquire(timeout=QUEUE_TIMEOUT_SEC):
+        BUSY.inc()
+        raise HashingBusy("Şifre doğrulama kuyruğu dolu, lütfen tekrar deneyin.")
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        _slots.release()
+        stats.observe(time.perf_counter() - start)
+
+
+def hash_password(password: str, rounds: int = None) -> str:
+    """Şifreyi ayarlı cost ile hash'le"""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    hashed = _run(bcrypt.hashpw, password.encode("utf-8"), salt, stats=HASH_LATENCY)
+    return hashed.decode("utf-8")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Şifreyi hash ile doğrula"""
+    return _run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"), stats=VERIFY_LATENCY)
+
+
+def hash_cost(password_hash: str) -> int:
+    """bcrypt hash'inden cost değeri ($2b$12$... -> 12). Okunamazsa 0"""
+    parts = password_hash.split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Hash ayarlı cost'tan düşükse True (girişte yükseltilir)"""
+    return hash_cost(password_hash) < BCRYPT_ROUNDS
+
+
+def hash_metrics() -> dict:
+    """Hash ve doğrulama gecikme metrikleri - havuz boyutlandırması için"""
+    return {
+        "workers": HASH_WORKERS,
+        "rounds": BCRYPT_ROUNDS,
+        "hash": HASH_LATENCY.snapshot(),
+        "verify": VERIFY_LATENCY.snapshot(),
+        "busy": BUSY.value,
+    }
@@ -3,6 +3,8 @@ Streamlit session state yönetimi - giriş durumu
 """
 import streamlit as st
 
+from config.settings import ADMIN_EMAILS
+
 
 def init_session():
     """session_state varsayılanlarını ayarla"""
@@ -27,6 +29,12 @@ def is_logged_in() -> bool:
     return st.session_state.get("user") is not None
 
 
+def is_admin() -> bool:
+    """Giriş yapan kullanıcı yönetici mi (ADMIN_EMAILS)"""
+    user = get_user()
+    return bool(user) and (user.get("email") or "").lower() in ADMIN_EMAILS
+
+
 def logout():
     """Çıkış yap"""
     st.session_state.user = None
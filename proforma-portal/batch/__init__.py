@@ -0,0 +1 @@
+# Proforma Portal Batch
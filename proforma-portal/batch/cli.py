@@ -0,0 +1,118 @@
+"""
+Toplu proforma fiyatlama komutu
+  python -m batch uğramalar.csv -o proformalar.jsonl
+  cat uğramalar.jsonl | python -m batch - --format jsonl --output-format csv > out.csv
+Girdi satır satır okunur, her uğrama fiyatlanıp hemen yazılır; hatalı satırlar
+stderr'e JSON olarak raporlanır ve atlanır. --workers N ile N süreçte
+paralel fiyatlanır (çıktı sırası aynı kalır). Tüm dosya tek tarife setiyle
+(call_date verilmemişse) ve tek kur snapshot'ıyla fiyatlanır.
+-o sonuc.xlsx ile Excel'e (write-only, akış halinde) yazılır.
+--metrics metrics.txt ile süre ölçümü açılır, sonunda Prometheus metni yazılır.
+--profile is.folded ile tüm iş profillenir (katlanmış yığınlar + en sıcak fonksiyonlar).
+"""
+import argparse
+import json
+import sys
+import time
+
+from config.settings import BATCH_WORKERS, BATCH_CHUNK_SIZE, PROFILE_MODE
+from calculators.engine import Rates
+from batch.io import FORMATS, OUTPUT_FORMATS, detect_format, open_text, iter_records, make_writer
+from batch.pipeline import price_records
+from batch.parallel import price_records_parallel
+from history.export import LAYOUTS, write_batch
+from utils import metrics
+from utils.profiling import MODES
+from utils.rates import get_rate_provider
+
+
+def _default_rates(args) -> Rates:
+    if args.usd_eur and args.usd_tl:
+        return Rates(usd_eur=args.usd_eur, usd_tl=args.usd_tl)
+    return Rates.from_snapshot(get_rate_provider().get())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m batch", description="CSV/JSONL uğrama dosyasından toplu proforma")
+    parser.add_argument("input", help="Girdi dosyası (.csv / .jsonl) veya stdin için -")
+    parser.add_argument("-o", "--output", default="-", help="Çıktı dosyası (varsayılan stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="Girdi formatı (uzantıdan belirlenemiyorsa)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, help="Çıktı formatı (varsayılan jsonl)")
+    parser.add_argument("--excel-layout", choices=LAYOUTS, default="summary",
+                        help="xlsx düzeni: tek özet sayfası veya gemi başına sayfa (girdi gemiye göre sıralı olmalı)")
+    parser.add_argument("--usd-eur", type=float, help="Varsayılan USD/EUR kuru (satırda yoksa)")
+    parser.add_argument("--usd-tl", type=float, help="Varsayılan USD/TL kuru (satırda yoksa)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="İşçi süreç sayısı (1: tek süreç)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="İşçiye gönderilen parça boyutu")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Süre ölçümünü aç ve Prometheus metnini dosyaya yaz (yalnız ana süreç, --workers 1 önerilir)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="İşi profille, katlanmış yığınları dosyaya yaz (varsayılan PROFILE_DIR altında)")
+    parser.add_argument("--profile-mode", choices=MODES, default=PROFILE_MODE or None,
+                        help="Profil modu (--profile verilince varsayılan cprofile; PROFILE_MODE ortam ayarı)")
+    parser.add_argument("--quiet", action="store_true", help="Özet satırını yazma")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.profile and not args.profile_mode:
+        args.profile_mode = "cprofile"
+    try:
+        in_format = detect_format(args.input, args.format)
+        out_format = args.output_format or (detect_format(args.output) if args.output != "-" else "jsonl")
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if in_format not in FORMATS:
+        print(f"Girdi formatı csv veya jsonl olmalı: {args.input}", file=sys.stderr)
+        return 2
+    if out_format == "xlsx" and args.output == "-":
+        print("xlsx çıktısı için -o dosya.xlsx verin", file=sys.stderr)
+        return 2
+
+    if args.metrics:
+        metrics.set_enabled(True)
+    rates = _default_rates(args)
+    errors = 0
+
+    def report(row_no: int, record: dict, message: str):
+        nonlocal errors
+        errors += 1
+        print(json.dumps({"row": row_no, "id": record.get("id"), "error": message}, ensure_ascii=False), file=sys.stderr)
+
+    def run() -> int:
+        count = 0
+        with open_text(args.input, "r") as src:
+            records = iter_records(src, in_format)
+            if args.workers > 1:
+                outputs = price_records_parallel(records, rates, report, args.workers, args.chunk_size)
+            else:
+                outputs = price_records(records, rates, report)
+            if out_format == "xlsx":
+                return write_batch(outputs, args.output, args.excel_layout)
+            with open_text(args.output, "w") as dst:
+                writer = make_writer(dst, out_format)
+                for output in outputs:
+                    writer.write(output)
+                    count += 1
+        return count
+
+    start = time.perf_counter()
+    if args.profile_mode:
+        from utils.profiling import profile_call
+        count, profile = profile_call(run, mode=args.profile_mode, label="batch")
+        path = profile.save(path=args.profile)
+        print(profile.top_text(), file=sys.stderr)
+        print(f"Profil: {path}", file=sys.stderr)
+    else:
+        count = run()
+
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(metrics.render_prometheus())
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed > 0 else 0
+        print(f"{count} proforma, {errors} hatalı satır, {elapsed:.1f} sn ({rate:.0f}/sn)", file=sys.stderr)
+    return 1 if errors else 0
@@ -0,0 +1,93 @@
+"""
+Toplu fiyatlama girdi/çıktı - CSV ve JSONL, satır satır (sabit bellek)
+Okuyucular (satır_no, kayıt) üretir; yazıcılar çıktı kaydını hemen yazar.
+"-" dosya adı stdin / stdout demektir.
+"""
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+FORMATS = ("csv", "jsonl")
+OUTPUT_FORMATS = FORMATS + ("xlsx",)
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".xlsx": "xlsx"}
+
+# CSV çıktı sütunları: kalem başına bir satır + proforma başına "total" satırı
+CSV_COLUMNS = ("id", "vessel_name", "port", "tariff_version", "seq", "code", "label", "usd", "eur")
+
+
+def detect_format(path: str, explicit: str = None) -> str:
+    """Dosya uzantısından format (stdin/stdout için explicit zorunlu)"""
+    if explicit:
+        return explicit
+    fmt = _EXTENSIONS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Format belirlenemedi: {path} (--format csv|jsonl)")
+    return fmt
+
+
+@contextmanager
+def open_text(path: str, mode: str):
+    """Dosya veya stdin/stdout ("-")"""
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+        return
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        yield f
+
+
+def iter_csv(f) -> Iterator[tuple[int, dict]]:
+    """CSV kayıtları - satır numarası başlık dahil dosya satırıdır"""
+    for row_no, record in enumerate(csv.DictReader(f), start=2):
+        yield row_no, record
+
+
+def iter_jsonl(f) -> Iterator[tuple[int, dict]]:
+    """JSONL kayıtları - boş satırlar atlanır, bozuk satır {"_error": ...} olarak döner"""
+    for row_no, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            record = {"_error": f"JSON okunamadı: {e.msg}"}
+        if not isinstance(record, dict):
+            record = {"_error": "JSON nesnesi bekleniyor"}
+        yield row_no, record
+
+
+def iter_records(f, fmt: str) -> Iterator[tuple[int, dict]]:
+    return iter_csv(f) if fmt == "csv" else iter_jsonl(f)
+
+
+class JsonlWriter:
+    """Proforma başına bir JSON satırı"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, output: dict):
+        self.f.write(json.dumps(output, ensure_ascii=False, separators=(",", ":")))
+        self.f.write("\n")
+
+
+class CsvWriter:
+    """Kalem başına bir CSV satırı, ardından proforma toplam satırı (code=total)"""
+
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(CSV_COLUMNS)
+
+    def write(self, output: dict):
+        head = (output["id"], output["vessel_name"], output["port"], output["tariff_version"])
+        for seq, line in enumerate(output["lines"]):
+            self.writer.writerow((*head, seq, line["code"], line["label"], line["usd"], line["eur"]))
+        self.writer.writerow((*head, len(output["lines"]), "total", "Total", output["total_usd"], output["total_eur"]))
+
+
+def make_writer(f, fmt: str):
+    return CsvWriter(f) if fmt == "csv" else JsonlWriter(f)
@@ -0,0 +1,107 @@
+"""
+Çok çekirdekli toplu fiyatlama - ProcessPoolExecutor ile parça parça
+Girdi sabit boyutlu parçalara bölünür; aynı anda en fazla işçi başına
+birkaç parça kuyrukta bekler (bellek sınırlı). Derlenmiş tarife setleri ve
+varsayılan kurlar işçilere başlangıçta bir kez gönderilir; görevler sadece
+ham kayıtları taşır. Sonuçlar sütunlu LineTable olarak döner (kuruş
+dizileri, açıklamalar parça başına bir kez): çıktı sözlüklerini pickle'lamaktan
+çok daha küçük. Sonuçlar girdi sırasıyla döner.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from config.settings import BATCH_CHUNK_SIZE
+from calculators.engine import ProformaEngine, Rates
+from calculators.tariff_sets import TariffSet, current_tariffs, registry, use_tariffs
+from calculators.lines import LineTable
+from batch.pipeline import compute_record, record_id
+
+# İşçi başına kuyrukta bekleyebilecek parça sayısı
+CHUNKS_PER_WORKER = 2
+
+# İşçi süreci durumu (_init_worker ile bir kez kurulur)
+_worker_engine: Optional[ProformaEngine] = None
+_worker_default: Optional[TariffSet] = None
+_worker_rates: Optional[Rates] = None
+
+
+def _init_worker(tariff_sets: Sequence[TariffSet], default: TariffSet, rates: Rates):
+    """
+    İşçi başlangıcı: setler derlenmiş halde gelir, dosya okunmaz. default,
+    ana süreçte sabitlenmiş setin kendisidir (aynı sürüm adlı taslak / düzenlenmiş
+    kopya kayıt defterindekiyle karışmaz)
+    """
+    global _worker_engine, _worker_default, _worker_rates
+    _worker_engine = ProformaEngine(tariff_sets=tuple(tariff_sets))
+    _worker_default = default
+    _worker_rates = rates
+
+
+def _price_chunk(chunk: list[tuple[int, dict]]) -> tuple[LineTable, list[tuple[int, int, dict, str]]]:
+    """Parçadaki kayıtları fiyatla: (başarılılar tablosu, (sıra, satır_no, kayıt, hata) listesi)"""
+    table = LineTable()
+    errors = []
+    with use_tariffs(_worker_default):
+        for row_no, record in chunk:
+            proforma, error = compute_record(_worker_engine, record, _worker_rates)
+            if error is not None:
+                # Sıra: hatadan önce tabloya giren başarılı kayıt sayısı
+                errors.append((len(table), row_no, record, error))
+            else:
+                table.append(record_id(row_no, record), proforma)
+    return table, errors
+
+
+def _chunks(records: Iterable[tuple[int, dict]], size: int) -> Iterator[list]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def price_records_parallel(
+    records: Iterable[tuple[int, dict]],
+    rates: Rates,
+    on_error: Callable[[int, dict, str], None],
+    workers: int,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> Iterator[dict]:
+    """
+    batch.pipeline.price_records'un çok süreçli karşılığı: aynı çıktılar,
+    aynı sıra. Tarihsiz uğramalar başlangıçtaki güncel (use_tariffs ile
+    sabitlenmişse o) setle, tarihliler seri yoldaki gibi kayıt defterinin
+    setleriyle fiyatlanır.
+    """
+    default = current_tariffs()
+    # Tarihli uğramalar için sadece kayıt defteri setleri: default tarih aramasına
+    # eklenirse seri yolun seçmeyeceği bir seti seçebilir
+    tariff_sets = registry().versions()
+
+    max_pending = workers * CHUNKS_PER_WORKER
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(tariff_sets, default, rates),
+    ) as executor:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(_price_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from _drain(pending.popleft(), on_error)
+        while pending:
+            yield from _drain(pending.popleft(), on_error)
+
+
+def _drain(future, on_error) -> Iterator[dict]:
+    table, errors = future.result()
+    errors = deque(errors)
+    for i in range(len(table)):
+        while errors and errors[0][0] == i:
+            on_error(*errors.popleft()[1:])
+        yield table.output(i)
+    for _, row_no, record, error in errors:
+        on_error(row_no, record, error)
@@ -0,0 +1,50 @@
+"""
+Toplu fiyatlama hattı - kayıt akışı -> çıktı kaydı akışı (generator)
+"""
+from typing import Callable, Iterable, Iterator, Optional
+
+from calculators.engine import ProformaEngine, Proforma, Rates
+from calculators.tariff_sets import use_tariffs
+from batch.records import RecordError, to_port_call, to_output
+
+
+def price_records(
+    records: Iterable[tuple[int, dict]],
+    rates: Rates,
+    on_error: Callable[[int, dict, str], None],
+) -> Iterator[dict]:
+    """
+    (satır_no, kayıt) akışını fiyatla, çıktı kayıtlarını sırayla üret.
+    Geçersiz satırlar on_error(satır_no, kayıt, mesaj) ile bildirilir.
+    """
+    engine = ProformaEngine()
+    with use_tariffs():
+        for row_no, record in records:
+            output, error = price_record(engine, row_no, record, rates)
+            if error is not None:
+                on_error(row_no, record, error)
+            else:
+                yield output
+
+
+def price_record(engine: ProformaEngine, row_no: int, record: dict, rates: Rates) -> tuple[Optional[dict], Optional[str]]:
+    """Tek kayıt: (çıktı, None) veya (None, hata mesajı)"""
+    proforma, error = compute_record(engine, record, rates)
+    if error is not None:
+        return None, error
+    return to_output(record_id(row_no, record), proforma), None
+
+
+def compute_record(engine: ProformaEngine, record: dict, rates: Rates) -> tuple[Optional[Proforma], Optional[str]]:
+    """Tek kayıt, çıktı kaydına çevirmeden: (proforma, None) veya (None, hata mesajı)"""
+    if "_error" in record:
+        return None, record["_error"]
+    try:
+        call = to_port_call(record, rates)
+        return engine.compute(call), None
+    except (RecordError, LookupError) as e:
+        return None, str(e)
+
+
+def record_id(row_no: int, record: dict) -> str:
+    return str(record.get("id") or row_no)
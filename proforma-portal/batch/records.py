@@ -0,0 +1,169 @@
+"""
+Toplu fiyatlama kayıtları - girdi satırı -> PortCall, Proforma -> çıktı kaydı
+Girdi sütunları (CSV başlığı / JSONL anahtarları):
+  id, vessel_name, port, nrt, grt, gt, vessel_type, is_turk_flag, purpose,
+  kind_of_cargo, cargo_mt, berth_days, anchorage_days, overtime, tanker,
+  four_tugs, usd_eur, usd_tl, call_date
+Opsiyonel hizmetler (engine.Services alan adları): protective_agency,
+  spare_parts_kg, bunker_operations, crew_change_persons, medical_patients,
+  captain_advance_eur, transit_visa_persons, waste_marpol1_slop_m3,
+  waste_marpol1_bilge_m3, waste_marpol4_m3, waste_marpol5_m3, auto_service,
+  stamp_duties
+Zorunlu: vessel_name, port, nrt, grt. gt verilmezse grt kullanılır; kur
+sütunları boşsa varsayılan kurlar geçerlidir.
+"""
+import math
+from dataclasses import fields
+from datetime import date
+from typing import Optional
+
+from config.settings import PORTS, VESSEL_TYPES
+from calculators.engine import Vessel, Rates, Options, Services, NO_SERVICES, PortCall, Proforma
+
+PURPOSES = ("Loading", "Discharging")
+
+_TRUE = {"1", "true", "yes", "evet", "e", "y", "x"}
+_FALSE = {"", "0", "false", "no", "hayir", "hayır", "h", "n"}
+
+
+class RecordError(ValueError):
+    """Girdi satırı geçersiz"""
+
+
+def _text(record: dict, key: str, default: str = "") -> str:
+    value = record.get(key)
+    if value is None:
+        return default
+    return str(value).strip() or default
+
+
+def _number(record: dict, key: str, default: Optional[float] = None) -> float:
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if default is None:
+            raise RecordError(f"{key} zorunlu")
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"{key} sayı değil: {value!r}")
+    if not math.isfinite(number):
+        raise RecordError(f"{key} sonlu bir sayı olmalı: {value!r}")
+    if number < 0:
+        raise RecordError(f"{key} negatif olamaz: {value!r}")
+    return number
+
+
+def _integer(record: dict, key: str, default: Optional[int] = None) -> int:
+    """Gün / kişi sayısı gibi tam sayı alanlar: 2.7 kesilmez, hata verir ("3.0" kabul)"""
+    number = _number(record, key, default)
+    if number != int(number):
+        raise RecordError(f"{key} tam sayı olmalı: {record.get(key)!r}")
+    return int(number)
+
+
+def _flag(record: dict, key: str) -> bool:
+    value = record.get(key)
+    if isinstance(value, bool):
+        return value
+    text = "" if value is None else str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise RecordError(f"{key} evet/hayır değil: {value!r}")
+
+
+_SERVICE_FIELDS = {f.name: f.type for f in fields(Services)}
+
+
+def _services(record: dict) -> Services:
+    """Opsiyonel hizmet sütunları (hiçbiri dolu değilse NO_SERVICES)"""
+    values = {}
+    for name, kind in _SERVICE_FIELDS.items():
+        value = record.get(name)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        if kind is bool:
+            values[name] = _flag(record, name)
+        elif kind is int:
+            values[name] = _integer(record, name)
+        else:
+            values[name] = _number(record, name)
+    return Services(**values) if values else NO_SERVICES
+
+
+def to_port_call(record: dict, rates: Rates) -> PortCall:
+    """
+    Girdi kaydından PortCall. usd_eur / usd_tl sütunları doluysa satırın
+    kendi kurları, değilse rates kullanılır. Geçersiz alanda RecordError.
+    """
+    name = _text(record, "vessel_name") or _text(record, "name")
+    if not name:
+        raise RecordError("vessel_name zorunlu")
+
+    port = _text(record, "port").upper()
+    if port not in PORTS:
+        raise RecordError(f"Bilinmeyen liman: {port or '-'} ({', '.join(PORTS)})")
+
+    vessel_type = _text(record, "vessel_type", "diger_yuk")
+    if vessel_type not in VESSEL_TYPES:
+        raise RecordError(f"Bilinmeyen gemi tipi: {vessel_type}")
+
+    purpose = _text(record, "purpose", "Loading")
+    if purpose not in PURPOSES:
+        raise RecordError(f"purpose Loading/Discharging olmalı: {purpose}")
+
+    grt = _number(record, "grt")
+    usd_eur = _number(record, "usd_eur", 0) or rates.usd_eur
+    usd_tl = _number(record, "usd_tl", 0) or rates.usd_tl
+    row_rates = rates if (usd_eur, usd_tl) == (rates.usd_eur, rates.usd_tl) else Rates(usd_eur=usd_eur, usd_tl=usd_tl)
+
+    call_date = _text(record, "call_date")
+    try:
+        call_date = date.fromisoformat(call_date) if call_date else None
+    except ValueError:
+        raise RecordError(f"call_date YYYY-AA-GG olmalı: {call_date}")
+
+    return PortCall(
+        vessel=Vessel(
+            name=name,
+            nrt=_number(record, "nrt"),
+            grt=grt,
+            gt=_number(record, "gt", grt),
+            vessel_type=vessel_type,
+            is_turk_flag=_flag(record, "is_turk_flag"),
+        ),
+        port=port,
+        purpose=purpose,
+        kind_of_cargo=_text(record, "kind_of_cargo"),
+        cargo_mt=_number(record, "cargo_mt", 0),
+        berth_days=_integer(record, "berth_days", 7),
+        anchorage_days=_integer(record, "anchorage_days", 0),
+        rates=row_rates,
+        options=Options(
+            overtime=_flag(record, "overtime"),
+            tanker=_flag(record, "tanker"),
+            four_tugs=_flag(record, "four_tugs"),
+        ),
+        services=_services(record),
+        call_date=call_date,
+    )
+
+
+def to_output(record_id: str, proforma: Proforma) -> dict:
+    """Çıktı kaydı: tutarlar kuruşa yuvarlanmış metin ("1234.50") olarak"""
+    call = proforma.call
+    return {
+        "id": record_id,
+        "vessel_name": call.vessel.name,
+        "port": call.port,
+        "tariff_version": proforma.tariff_version,
+        "rate_snapshot_id": call.rates.snapshot_id,
+        "lines": [
+            {"code": line.code, "label": line.label, "usd": str(line.usd.amount), "eur": str(line.eur.amount)}
+            for line in proforma.lines
+        ],
+        "total_usd": str(proforma.total_usd.amount),
+        "total_eur": str(proforma.total_eur.amount),
+    }
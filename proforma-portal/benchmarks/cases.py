@@ -0,0 +1,211 @@
+"""
+Ölçüm senaryoları - her senaryo bir kez kurulur, run() süreyi saniye döner
+Gruplar: calculators (her calc_* fonksiyonu), lookup (bracket tabloları),
+exchange (kur dönüşümü ve Money), proforma (tek uğrama), batch (1k / 100k /
+1M uğrama: satır satır hat ve NumPy filo fiyatlaması). Girdiler sentetik
+filodan gelir; kurulum ve girdi üretimi süreye dahil değildir.
+"""
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Iterable, Optional, Sequence
+
+from calculators import agency, anchorage, base, berthing, fleet, harbour, mooring, other, pilotage, tugboat, waste
+from calculators import vectorized
+from calculators.engine import ProformaEngine, Rates
+from calculators.tariff_sets import current_tariffs, use_tariffs
+from batch.pipeline import price_record
+from batch.records import to_port_call
+from benchmarks.synthetic import fleet_chunks, synthetic_fleet, to_records
+from utils import exchange
+from utils.money import EUR, USD, Money
+
+# run() başına çağrı: skaler fonksiyonlar / tek proforma
+SCALAR_INPUTS = 20000
+PROFORMA_INPUTS = 2000
+
+BATCH_SIZES = (1000, 100000, 1000000)
+
+# NumPy filo fiyatlamasında parti boyutu
+FLEET_CHUNK = 100000
+
+_RATES = Rates(usd_eur=1.1801, usd_tl=34.5)
+
+
+@dataclass(frozen=True)
+class Case:
+    """Ölçüm senaryosu: setup() bir kez çağrılır, dönen run() süreyi (sn) verir"""
+    name: str
+    group: str
+    ops: int
+    setup: Callable[[], Callable[[], float]]
+    repeat: Optional[int] = None    # None: komut satırındaki tekrar sayısı
+
+
+def _loop(fn: Callable, args: Sequence[tuple]) -> Callable[[], float]:
+    def run() -> float:
+        with use_tariffs():
+            start = perf_counter()
+            for a in args:
+                fn(*a)
+            return perf_counter() - start
+    return run
+
+
+def _scalar(name: str, group: str, fn: Callable, make_args: Callable[[dict], Iterable[tuple]]) -> Case:
+    def setup():
+        f = synthetic_fleet(SCALAR_INPUTS, seed=7)
+        columns = {k: v.tolist() for k, v in f.items()}
+        return _loop(fn, list(make_args(columns)))
+    return Case(name, group, SCALAR_INPUTS, setup)
+
+
+def _calculator_cases() -> list[Case]:
+    cases = {
+        "agency.calc_agency_fee": (agency.calc_agency_fee, lambda c: zip(c["nrt"], c["berth_days"])),
+        "agency.calc_protective_agency_fee": (agency.calc_protective_agency_fee, lambda c: zip(c["nrt"])),
+        "anchorage.calc_anchorage": (
+            anchorage.calc_anchorage, lambda c: zip(c["grt"], c["anchorage_days"], c["is_turk_flag"]),
+        ),
+        "berthing.calc_berthing": (
+            berthing.calc_berthing,
+            lambda c: zip(c["gt"], c["berth_days"], c["is_turk_flag"], [t == "kabotaj" for t in c["vessel_type"]]),
+        ),
+        "harbour.calc_lcb": (harbour.calc_lcb, lambda c: zip(c["nrt"], c["usd_tl"], c["overtime"])),
+        "harbour.calc_sahil_saglik": (harbour.calc_sahil_saglik, lambda c: zip(c["nrt"], c["usd_tl"])),
+        "harbour.calc_liman_hizmet": (
+            harbour.calc_liman_hizmet, lambda c: zip(c["gt"], c["is_turk_flag"], c["usd_tl"]),
+        ),
+        "harbour.calc_customs_overtime": (
+            harbour.calc_customs_overtime,
+            lambda c: zip(c["cargo_mt"], [p == "Discharging" for p in c["purpose"]], c["usd_tl"]),
+        ),
+        "harbour.calc_chamber_freight": (harbour.calc_chamber_freight, lambda c: zip(c["cargo_mt"], c["is_turk_flag"])),
+        "harbour.calc_auto_service": (harbour.calc_auto_service, lambda c: zip(c["grt"])),
+        "harbour.calc_stamp_duties": (harbour.calc_stamp_duties, lambda c: zip(c["usd_tl"])),
+        "harbour.calc_aliaga_guards": (harbour.calc_aliaga_guards, lambda c: zip(c["usd_tl"])),
+        "mooring.calc_mooring": (
+            mooring.calc_mooring, lambda c: zip(c["grt"], [t == "kabotaj" for t in c["vessel_type"]]),
+        ),
+        "pilotage.calc_pilotage_t11": (pilotage.calc_pilotage_t11, lambda c: zip(c["grt"], c["vessel_type"])),
+        "pilotage.calc_pilotage_t2": (pilotage.calc_pilotage_t2, lambda c: ((g, "izmir_demir") for g in c["grt"])),
+        "pilotage.calc_port_pilotage": (
+            pilotage.calc_port_pilotage, lambda c: zip(c["grt"], c["vessel_type"], c["port"]),
+        ),
+        "tugboat.calc_tugboat": (
+            tugboat.calc_tugboat, lambda c: zip(c["grt"], c["vessel_type"], c["four_tugs"]),
+        ),
+        "waste.calc_waste_fixed": (waste.calc_waste_fixed, lambda c: zip(c["grt"])),
+        "waste.calc_waste_extra": (
+            waste.calc_waste_extra, lambda c: ((2.0, 1.0, 3.0, 4.0, g) for g in c["grt"]),
+        ),
+        "other.calc_motorboat": (other.calc_motorboat, lambda c: zip(c["port"])),
+        "other.calc_supervision": (other.calc_supervision, lambda c: zip(c["cargo_mt"])),
+        "other.calc_spare_parts": (other.calc_spare_parts, lambda c: ((n / 10,) for n in c["nrt"])),
+        "other.calc_crew_change": (other.calc_crew_change, lambda c: ((int(d),) for d in c["berth_days"])),
+    }
+    return [_scalar(name, "calculators", fn, args) for name, (fn, args) in cases.items()]
+
+
+def _lookup_cases() -> list[Case]:
+    def vector_setup():
+        nrt = synthetic_fleet(FLEET_CHUNK, seed=7)["nrt"]
+        table = current_tariffs().tables.LCB
+
+        def run() -> float:
+            start = perf_counter()
+            vectorized.bracket_lookup(table, nrt)
+            return perf_counter() - start
+        return run
+
+    t = current_tariffs()
+    return [
+        _scalar("base.round_grt_up", "lookup", base.round_grt_up, lambda c: zip(c["grt"])),
+        _scalar("base.BracketTable.lookup", "lookup", t.tables.LCB.lookup, lambda c: zip(c["nrt"])),
+        _scalar(
+            "base.get_bracket_value", "lookup", base.get_bracket_value,
+            lambda c: ((n, t.AGENCY_BASE_FEES, "nrt_max", "fee_eur") for n in c["nrt"]),
+        ),
+        Case("vectorized.bracket_lookup", "lookup", FLEET_CHUNK, vector_setup),
+    ]
+
+
+def _exchange_cases() -> list[Case]:
+    def money_to(usd: float, rate: float):
+        return Money.of(usd, USD).to(EUR, rate).rounded()
+
+    return [
+        _scalar("exchange.usd_to_eur", "exchange", exchange.usd_to_eur, lambda c: zip(c["cargo_mt"], c["usd_eur"])),
+        _scalar("exchange.tl_to_usd", "exchange", exchange.tl_to_usd, lambda c: zip(c["cargo_mt"], c["usd_tl"])),
+        _scalar("money.Money.to", "exchange", money_to, lambda c: zip(c["cargo_mt"], c["usd_eur"])),
+    ]
+
+
+def _proforma_cases() -> list[Case]:
+    def calls():
+        return [to_port_call(record, _RATES) for _, record in to_records(synthetic_fleet(PROFORMA_INPUTS, seed=7))]
+
+    def warm_setup():
+        items = calls()
+        engine = ProformaEngine()
+        engine.compute_many(items)
+        return _loop(engine.compute, [(call,) for call in items])
+
+    def cold_setup():
+        items = calls()
+        return _loop(lambda call: ProformaEngine().compute(call), [(call,) for call in items])
+
+    return [
+        Case("engine.compute", "proforma", PROFORMA_INPUTS, warm_setup),
+        Case("engine.compute.cold", "proforma", PROFORMA_INPUTS, cold_setup),
+    ]
+
+
+def _pipeline_setup(n: int):
+    def run() -> float:
+        engine = ProformaEngine()
+        elapsed = 0.0
+        row = 1
+        with use_tariffs():
+            for chunk in fleet_chunks(n, seed=11):
+                records = to_records(chunk, row)
+                row += len(records)
+                start = perf_counter()
+                for row_no, record in records:
+                    price_record(engine, row_no, record, _RATES)
+                elapsed += perf_counter() - start
+        return elapsed
+    return run
+
+
+def _fleet_setup(n: int):
+    def run() -> float:
+        elapsed = 0.0
+        tariffs = current_tariffs()
+        for chunk in fleet_chunks(n, seed=11, chunk_size=FLEET_CHUNK):
+            start = perf_counter()
+            fleet.totals(fleet.price_lines(chunk, tariffs))
+            elapsed += perf_counter() - start
+        return elapsed
+    return run
+
+
+def _batch_cases(sizes: Sequence[int]) -> list[Case]:
+    cases = []
+    for n in sizes:
+        repeat = 1 if n >= 100000 else None
+        cases.append(Case(f"batch.pipeline.{n}", "batch", n, lambda n=n: _pipeline_setup(n), repeat))
+        cases.append(Case(f"batch.fleet.{n}", "batch", n, lambda n=n: _fleet_setup(n), repeat))
+    return cases
+
+
+def all_cases(sizes: Sequence[int] = BATCH_SIZES) -> list[Case]:
+    """Tüm senaryolar (batch boyutları sizes)"""
+    return _calculator_cases() + _lookup_cases() + _exchange_cases() + _proforma_cases() + _batch_cases(sizes)
+
+
+def select(cases: list[Case], patterns: Sequence[str]) -> list[Case]:
+    """Adında veya grubunda desenlerden biri geçen senaryolar (desen yoksa hepsi)"""
+    if not patterns:
+        return cases
+    return [case for case in cases if any(p in case.name or p == case.group for p in patterns)]
+
@@ -0,0 +1,150 @@
+"""
+Performans ölçüm komutu
+  python -m benchmarks                                  # tüm senaryolar
+  python -m benchmarks calculators lookup --sizes 1000  # grup / ad deseni
+  python -m benchmarks -o sonuc.json --baseline data/benchmarks/baseline.json
+Her senaryo bir ısınma turundan sonra --repeat kez çalıştırılır; en kısa
+süre (gürültü sadece ekler) çağrı başına ns olarak raporlanır. Sonuçlar JSON
+yazılabilir; --baseline verilirse aynı addaki senaryolar karşılaştırılır ve
+BENCH_REGRESSION_PCT'den fazla yavaşlama varsa çıkış kodu 1 olur.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from config.settings import BENCH_REGRESSION_PCT
+from benchmarks.cases import BATCH_SIZES, Case, all_cases, select
+
+
+def run_case(case: Case, repeat: int) -> dict:
+    """Senaryoyu ölç: ısınma + repeat tur (timeit gibi GC kapalı)"""
+    run = case.setup()
+    repeat = case.repeat or repeat
+    if case.repeat is None:
+        run()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        times = [run() for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+    best = min(times)
+    return {
+        "name": case.name,
+        "group": case.group,
+        "ops": case.ops,
+        "repeat": repeat,
+        "min_s": best,
+        "median_s": statistics.median(times),
+        "ns_per_op": best / case.ops * 1e9,
+        "ops_per_s": case.ops / best if best > 0 else 0.0,
+    }
+
+
+def environment() -> dict:
+    """Sonuçların yorumlanması için makine bilgisi"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: list[dict], baseline: dict, threshold_pct: float) -> list[dict]:
+    """Temel ölçümde de olan senaryolar için oran; threshold'dan yavaşlar regression=True"""
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    rows = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old is None or not old["ns_per_op"]:
+            continue
+        ratio = result["ns_per_op"] / old["ns_per_op"]
+        rows.append({
+            "name": result["name"],
+            "baseline_ns": old["ns_per_op"],
+            "ns": result["ns_per_op"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold_pct / 100,
+        })
+    return rows
+
+
+def _sizes(text: str) -> tuple[int, ...]:
+    return tuple(int(part.replace("_", "")) for part in text.split(",") if part.strip())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Hesaplayıcı ve proforma hattı ölçümleri")
+    parser.add_argument("patterns", nargs="*", help="Grup (calculators, lookup, exchange, proforma, batch) veya ad parçası")
+    parser.add_argument("--sizes", type=_sizes, default=BATCH_SIZES, help="Batch uğrama sayıları (virgülle, örn. 1000,100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Tekrar sayısı (100k ve üstü batch'te 1)")
+    parser.add_argument("-o", "--output", help="Sonuçları JSON dosyasına yaz")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    parser.add_argument("--threshold", type=float, default=BENCH_REGRESSION_PCT, help="Yavaşlama eşiği (%%)")
+    parser.add_argument("--list", action="store_true", help="Senaryoları listele, ölçme")
+    parser.add_argument("--json", action="store_true", help="Sonuçları stdout'a JSON olarak yaz")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    cases = select(all_cases(args.sizes), args.patterns)
+    if args.list:
+        for case in cases:
+            print(f"{case.group:<12} {case.name}")
+        return 0
+    if not cases:
+        print("Desene uyan senaryo yok", file=sys.stderr)
+        return 2
+
+    baseline: Optional[dict] = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Temel ölçüm okunamadı: {e}", file=sys.stderr)
+            return 2
+
+    results = []
+    for case in cases:
+        start = time.perf_counter()
+        result = run_case(case, args.repeat)
+        results.append(result)
+        if not args.json:
+            print(
+                f"{case.group:<12} {case.name:<36} {result['ns_per_op']:>12,.0f} ns/op "
+                f"{result['ops_per_s']:>14,.0f} op/s  ({time.perf_counter() - start:.1f} sn)",
+                file=sys.stderr,
+            )
+
+    report = {"environment": environment(), "results": results}
+    if baseline is not None:
+        report["comparison"] = compare(results, baseline, args.threshold)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+    regressions = [row for row in report.get("comparison", []) if row["regression"]]
+    if baseline is not None and not args.json:
+        print(f"Temel ölçüme göre ({args.threshold:g}% eşik): {len(report['comparison'])} senaryo, "
+              f"{len(regressions)} yavaşlama", file=sys.stderr)
+        for row in regressions:
+            print(f"  YAVAŞLAMA {row['name']}: {row['baseline_ns']:,.0f} -> {row['ns']:,.0f} ns/op "
+                  f"(x{row['ratio']:.2f})", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,84 @@
+"""
+Sentetik filo - ölçümler için tekrarlanabilir uğrama girdileri
+GRT gemi tipine göre log-normal dağılır (kabotaj birkaç bin, konteyner ve
+tanker onbinler); NRT ve GT GRT'ye oranla türetilir. Kurlar yıl boyu
+değişen günlük değerlerden seçilir (sabit kalemler cache'i gerçekçi çalışır).
+Aynı (n, seed) her zaman aynı filoyu üretir.
+"""
+from typing import Iterator
+
+import numpy as np
+
+from config.settings import PORTS
+
+# Gemi tipi: (pay, medyan GRT, log-normal sigma)
+VESSEL_MIX = {
+    "kabotaj": (0.15, 1500, 0.6),
+    "yolcu_feribot": (0.10, 15000, 0.7),
+    "konteyner": (0.20, 30000, 0.7),
+    "diger_yuk": (0.35, 8000, 0.8),
+    "diger_tum": (0.20, 25000, 0.9),
+}
+
+# Liman payları (PORTS sırasıyla)
+PORT_SHARES = (0.15, 0.30, 0.30, 0.25)
+
+# Farklı günlük kur sayısı
+RATE_DAYS = 250
+
+CHUNK_SIZE = 10000
+
+
+def synthetic_fleet(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """n uğramalık girdi sütunları (calculators.fleet.INPUT_COLUMNS + vessel_name)"""
+    rng = np.random.default_rng(seed)
+    types = np.array(list(VESSEL_MIX))
+    shares = np.array([share for share, _, _ in VESSEL_MIX.values()])
+    index = rng.choice(len(types), n, p=shares / shares.sum())
+    vessel_type = types[index]
+    median = np.array([VESSEL_MIX[t][1] for t in types], dtype=np.float64)
+    sigma = np.array([VESSEL_MIX[t][2] for t in types])
+    grt = np.clip(np.round(median[index] * np.exp(sigma[index] * rng.standard_normal(n))), 100, 230000)
+    nrt = np.maximum(np.round(grt * rng.uniform(0.28, 0.60, n)), 50)
+    gt = np.round(grt * rng.uniform(0.98, 1.05, n))
+
+    passenger = (vessel_type == "kabotaj") | (vessel_type == "yolcu_feribot")
+    cargo = np.where(passenger & (rng.random(n) < 0.8), 0.0, np.round(grt * 1.5 * rng.uniform(0.3, 1.0, n)))
+    anchorage = np.where(rng.random(n) < 0.55, 0.0, rng.geometric(0.3, n).astype(np.float64))
+
+    day = rng.integers(0, RATE_DAYS, n)
+    day_rng = np.random.default_rng(seed + 1)
+    usd_eur = np.round(1.17 + np.cumsum(day_rng.normal(0, 0.003, RATE_DAYS)), 4)[day]
+    usd_tl = np.round(32.0 + np.cumsum(np.abs(day_rng.normal(0.015, 0.02, RATE_DAYS))), 4)[day]
+
+    return {
+        "vessel_name": np.char.add("MV SYNTH ", (rng.integers(0, max(n // 8, 1), n)).astype(str)),
+        "port": np.array(PORTS)[rng.choice(len(PORTS), n, p=PORT_SHARES)],
+        "nrt": nrt,
+        "grt": grt,
+        "gt": gt,
+        "vessel_type": vessel_type,
+        "is_turk_flag": rng.random(n) < 0.3,
+        "purpose": np.where(rng.random(n) < 0.5, "Loading", "Discharging"),
+        "cargo_mt": cargo,
+        "berth_days": np.minimum(1 + rng.poisson(2.5, n), 30).astype(np.float64),
+        "anchorage_days": np.minimum(anchorage, 20),
+        "overtime": rng.random(n) < 0.25,
+        "tanker": (vessel_type == "diger_tum") & (rng.random(n) < 0.6),
+        "four_tugs": (grt >= 5000) & (rng.random(n) < 0.15),
+        "usd_eur": usd_eur,
+        "usd_tl": usd_tl,
+    }
+
+
+def fleet_chunks(n: int, seed: int = 0, chunk_size: int = CHUNK_SIZE) -> Iterator[dict[str, np.ndarray]]:
+    """n uğramayı chunk_size'lık sütun partileri halinde üret (sabit bellek)"""
+    for k, start in enumerate(range(0, n, chunk_size)):
+        yield synthetic_fleet(min(chunk_size, n - start), seed + 1000 * k)
+
+
+def to_records(fleet: dict[str, np.ndarray], first_row: int = 1) -> list[tuple[int, dict]]:
+    """Sütunlardan batch girdi kayıtları: (satır_no, kayıt) - python -m batch ile aynı biçim"""
+    names = list(fleet)
+    columns = [fleet[name].tolist() for name in names]
+    return [(first_row + i, dict(zip(names, values))) for i, values in enumerate(zip(*columns))]
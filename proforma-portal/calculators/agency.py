@@ -1,11 +1,8 @@
 """
-Tarife 1: Acentelik Hizmetleri - NRT bazlı Euro
+Tarife 1: Acentelik Hizmetleri, Tarife 2: Koruyucu Acentelik - NRT bazlı Euro
 """
-from config.tariffs import (
-    AGENCY_BASE_FEES,
-    AGENCY_EXTRA_OVER_10K,
-)
-from calculators.base import get_bracket_value
+from calculators.tariff_sets import current_tariffs
+from utils.money import money_round
 
 
 def calc_agency_fee(
@@ -23,12 +20,13 @@ def calc_agency_fee(
     - Yolcu indirimi: max %40
     - Konteyner düzenli hat: %50
     """
+    t = current_tariffs()
     # Baz ücret
-    base = get_bracket_value(nrt, AGENCY_BASE_FEES, "nrt_max", "fee_eur")
+    base = t.tables.AGENCY_BASE.lookup(nrt)
 
     # 10000 üstü ek ücret
     if nrt > 10000:
-        extra_bracket = get_bracket_value(nrt, AGENCY_EXTRA_OVER_10K, "nrt_max", "per_1000_eur")
+        extra_bracket = t.tables.AGENCY_EXTRA.lookup(nrt)
         from math import ceil
         extra_1000s = ceil((nrt - 10000) / 1000)
         base += extra_1000s * extra_bracket
@@ -47,4 +45,17 @@ def calc_agency_fee(
     discount = max(passenger_discount_pct, container_discount_pct)  # En yüksek tek uygulanır
     base *= (1 - discount / 100)
 
-    return round(base, 2)
+    return money_round(base)
+
+
+def calc_protective_agency_fee(nrt: float) -> float:
+    """
+    Koruyucu acentelik ücreti (Euro) - Tarife 2.
+    10000 NRT'ye kadar baz ücret, üstünde her 1000 NRT için ek ücret.
+    """
+    t = current_tariffs()
+    fee = t.tables.PROTECTIVE_BASE.lookup(nrt)
+    if nrt > 10000:
+        from math import ceil
+        fee += ceil((nrt - 10000) / 1000) * t.tables.PROTECTIVE_EXTRA.lookup(nrt)
+    return money_round(fee)
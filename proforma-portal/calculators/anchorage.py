@@ -1,7 +1,8 @@
 """
 Demirleme ücretleri - GRT * rate * gün (USD)
 """
-from config.tariffs import ANCHORAGE_TR_RATE, ANCHORAGE_FOREIGN_RATE
+from calculators.tariff_sets import current_tariffs
+from utils.money import money_round
 
 
 def calc_anchorage(grt: float, days: int, is_turk_flag: bool) -> float:
@@ -10,5 +11,6 @@ def calc_anchorage(grt: float, days: int, is_turk_flag: bool) -> float:
     Türk: GRT * 0.002 * gün
     Yabancı: GRT * 0.004 * gün
     """
-    rate = ANCHORAGE_TR_RATE if is_turk_flag else ANCHORAGE_FOREIGN_RATE
-    return round(grt * rate * days, 2)
+    t = current_tariffs()
+    rate = t.ANCHORAGE_TR_RATE if is_turk_flag else t.ANCHORAGE_FOREIGN_RATE
+    return money_round(grt * rate * days)
@@ -2,7 +2,9 @@
 Ortak hesaplama yardımcıları: GRT yuvarlama, bracket lookup
 """
 import math
-from typing import Any
+from array import array
+from bisect import bisect_left
+from typing import Any, Iterable
 
 
 def round_grt_up(grt: float) -> int:
@@ -20,15 +22,79 @@ def round_gt_up(gt: float) -> int:
     return round_grt_up(gt)
 
 
+class BracketTable:
+    """
+    Derlenmiş bracket tablosu: config'teki list-of-dict bir kez derlenir.
+    Üst sınırlar sıralı array('d') içinde, değer sütunları tuple olarak tutulur;
+    arama bisect ile O(log n). value <= üst sınır olan ilk satır seçilir,
+    tablo dışındaki değerler son satıra düşer.
+    Örn: BracketTable(AGENCY_BASE_FEES, "nrt_max", "fee_eur").lookup(2196)
+    """
+    __slots__ = ("key_max", "value_keys", "bounds", "columns")
+
+    def __init__(self, rows, key_max: str, *value_keys: str):
+        rows = sorted(rows, key=lambda row: row[key_max])
+        if not value_keys and rows:
+            value_keys = tuple(k for k in rows[0] if k != key_max)
+        self.key_max = key_max
+        self.value_keys = value_keys
+        self.bounds = array("d", (row[key_max] for row in rows))
+        self.columns = {key: tuple(row[key] for row in rows) for key in value_keys}
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def index(self, value: float) -> int:
+        """value için satır indeksi (tablo dışı -> son satır)"""
+        idx = bisect_left(self.bounds, value)
+        last = len(self.bounds) - 1
+        return idx if idx <= last else last
+
+    def lookup(self, value: float, key: str = None) -> Any:
+        """Tek değer için sütun değeri. key verilmezse ilk değer sütunu"""
+        if not self.bounds:
+            return 0
+        return self.columns[key or self.value_keys[0]][self.index(value)]
+
+    def lookup_many(self, values: Iterable[float], key: str = None) -> list:
+        """Toplu sorgu: her değer için sütun değeri (girdi sırasıyla)"""
+        if not self.bounds:
+            return [0 for _ in values]
+        column = self.columns[key or self.value_keys[0]]
+        bounds = self.bounds
+        last = len(bounds) - 1
+        return [column[min(bisect_left(bounds, v), last)] for v in values]
+
+    def row(self, value: float) -> dict:
+        """value için tüm değer sütunları (dict)"""
+        if not self.bounds:
+            return {}
+        idx = self.index(value)
+        return {key: col[idx] for key, col in self.columns.items()}
+
+
+# get_bracket_value için derlenmiş tablo cache'i: id(liste) -> (liste, key_max, tablo)
+_COMPILED: dict[int, tuple] = {}
+
+
+def compiled_table(brackets, key_max: str) -> BracketTable:
+    """list-of-dict bracket listesinin derlenmiş halini döndür (liste başına bir kez)"""
+    entry = _COMPILED.get(id(brackets))
+    if entry is None or entry[0] is not brackets or entry[1] != key_max:
+        entry = (brackets, key_max, BracketTable(brackets, key_max))
+        _COMPILED[id(brackets)] = entry
+    return entry[2]
+
+
 def get_bracket_value(value: float, brackets, key_max: str, key_value: str) -> Any:
     """
     Değeri bracket tablosunda bul (value <= nrt_max olan ilk satır).
     Örn: get_bracket_value(2196, AGENCY_BASE_FEES, "nrt_max", "fee_eur")
+    Hesaplayıcılar calculators.tables'taki derlenmiş tabloları doğrudan kullanır.
     """
-    for row in brackets:
-        if value <= row[key_max]:
-            return row[key_value]
-    return brackets[-1][key_value] if brackets else 0
+    if not brackets:
+        return 0
+    return compiled_table(brackets, key_max).lookup(value, key_value)
 
 
 def grt_bracket_0_1000(grt: float) -> tuple[float, float]:
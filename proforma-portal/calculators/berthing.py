@@ -2,7 +2,8 @@
 Günlük barınma / Wharfage / Quay dues (USD)
 """
 import math
-from config.tariffs import BERTHING_BASE_500, BERTHING_PER_1000_GT
+from calculators.tariff_sets import current_tariffs
+from utils.money import money_round
 
 
 def calc_berthing(
@@ -19,17 +20,18 @@ def calc_berthing(
     - Kabotaj: %50 indirim
     - Türk bayraklı uluslararası: %25 indirim
     """
+    t = current_tariffs()
     if gt <= 500:
-        daily = BERTHING_BASE_500
+        daily = t.BERTHING_BASE_500
     else:
         rounded = math.ceil(gt / 1000) * 1000
         if rounded <= 81000:
-            daily = (rounded / 1000) * BERTHING_PER_1000_GT
+            daily = (rounded / 1000) * t.BERTHING_PER_1000_GT
         else:
             # 81k hesabı + ek
-            base_81k = 81 * BERTHING_PER_1000_GT
+            base_81k = 81 * t.BERTHING_PER_1000_GT
             extra_1000s = (rounded - 81000) / 1000
-            daily = base_81k + extra_1000s * BERTHING_PER_1000_GT
+            daily = base_81k + extra_1000s * t.BERTHING_PER_1000_GT
 
     total = daily * days
 
@@ -38,4 +40,4 @@ def calc_berthing(
     elif is_turk_flag:
         total *= 0.75
 
-    return round(total, 2)
+    return money_round(total)
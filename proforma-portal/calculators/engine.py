@@ -0,0 +1,595 @@
+"""
+Proforma motoru - Streamlit'ten bağımsız proforma hesaplaması
+Girdi: gemi, liman, kurlar, seçenekler. Çıktı: kalemler + toplamlar.
+compute_many ile binlerce uğrama tek seferde fiyatlanır.
+Hesaplayıcılar exact_money() içinde yuvarlamasız çalışır; kalemler
+Money (Decimal) olarak bir kez yuvarlanır, toplamlar tam toplamdır.
+Her uğrama tek bir tarife setiyle hesaplanır (call_date'te geçerli set,
+yoksa hesap başındaki güncel set); hesap sırasında dosya değişse de
+set değişmez.
+"""
+import sys
+from dataclasses import dataclass, field, fields, replace
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from config.settings import (
+    PORT_IN_OUT_FEES,
+    PORT_SPECIFIC,
+    DEFAULT_USD_EUR_RATE,
+    DEFAULT_USD_TL_RATE,
+)
+from calculators import agency, berthing, harbour, waste, other, anchorage, memo
+from calculators.tariff_sets import TariffSet, current_tariffs, registry, tariff_for_date, use_tariffs
+from utils.money import Money, USD, EUR, exact_money
+
+
+@dataclass(frozen=True)
+class Vessel:
+    """Gemi bilgileri"""
+    name: str
+    nrt: float
+    grt: float
+    gt: float
+    vessel_type: str = "diger_yuk"
+    is_turk_flag: bool = False
+
+    @property
+    def is_kabotaj(self) -> bool:
+        return self.vessel_type == "kabotaj"
+
+
+@dataclass(frozen=True)
+class Rates:
+    """
+    Kurlar: usd_eur (USD/EUR bölen), usd_tl (1 USD = ? TL).
+    snapshot_id: kurların alındığı utils.rates snapshot'ı (elle girildiyse None)
+    """
+    usd_eur: float = DEFAULT_USD_EUR_RATE
+    usd_tl: float = DEFAULT_USD_TL_RATE
+    snapshot_id: Optional[str] = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "Rates":
+        """utils.rates.RateSnapshot'tan kurlar"""
+        return cls(usd_eur=snapshot.usd_eur, usd_tl=snapshot.usd_tl, snapshot_id=snapshot.snapshot_id)
+
+
+# Seçenek oranları (calculators.fleet de kullanır)
+OVERTIME_PCT = 50
+TANKER_PCT = 0.30
+# Mesaide kılavuzluk x1.5 (diğer kalemler OVERTIME_PCT)
+PILOTAGE_OVERTIME_FACTOR = 1.50
+
+
+@dataclass(frozen=True)
+class Options:
+    """Ek seçenekler: %50 mesai, tanker zammı, 4 römorkör"""
+    overtime: bool = False
+    tanker: bool = False
+    four_tugs: bool = False
+
+    @property
+    def overtime_pct(self) -> float:
+        return OVERTIME_PCT if self.overtime else 0
+
+    @property
+    def tanker_pct(self) -> float:
+        return TANKER_PCT if self.tanker else 0
+
+
+@dataclass(frozen=True)
+class Services:
+    """
+    Opsiyonel hizmet kalemleri (Tarife 2 ve 8, atık fazlası, harçlar).
+    Varsayılan değerlerde hiçbir kalem eklenmez.
+    """
+    protective_agency: bool = False
+    spare_parts_kg: float = 0
+    bunker_operations: int = 0
+    crew_change_persons: int = 0
+    medical_patients: int = 0
+    captain_advance_eur: float = 0
+    transit_visa_persons: int = 0
+    waste_marpol1_slop_m3: float = 0
+    waste_marpol1_bilge_m3: float = 0
+    waste_marpol4_m3: float = 0
+    waste_marpol5_m3: float = 0
+    auto_service: bool = False
+    stamp_duties: bool = False
+
+
+NO_SERVICES = Services()
+
+
+@dataclass(frozen=True)
+class PortCall:
+    """Bir liman uğraması - proforma girdisi"""
+    vessel: Vessel
+    port: str
+    purpose: str = "Loading"
+    kind_of_cargo: str = ""
+    cargo_mt: float = 0
+    berth_days: int = 7
+    anchorage_days: int = 0
+    rates: Rates = field(default_factory=Rates)
+    options: Options = field(default_factory=Options)
+    services: Services = NO_SERVICES
+    call_date: Optional[date] = None  # Tarife seçimi için uğrama tarihi (None: güncel set)
+
+    @property
+    def is_import(self) -> bool:
+        return self.purpose == "Discharging"
+
+
+@dataclass(frozen=True, slots=True)
+class LineItem:
+    """Proforma kalemi: kod, açıklama, USD ve EUR tutarı (kuruşa yuvarlanmış Money)"""
+    code: str
+    label: str
+    usd: Money
+    eur: Money
+
+
+@dataclass
+class Proforma:
+    """Hesaplanmış proforma"""
+    call: PortCall
+    lines: list[LineItem]
+    tariff_version: str = ""
+
+    @property
+    def total_usd(self) -> Money:
+        return sum((l.usd for l in self.lines), Money(Decimal(0), USD))
+
+    @property
+    def total_eur(self) -> Money:
+        return sum((l.eur for l in self.lines), Money(Decimal(0), EUR))
+
+    def as_rows(self) -> list[tuple[str, float, float]]:
+        """(Açıklama, USD, EUR) satırları - tablo gösterimi için"""
+        return [(l.label, float(l.usd), float(l.eur)) for l in self.lines]
+
+
+class ProformaEngine:
+    """
+    Proforma hesaplama motoru. calculators.* fonksiyonlarını sayfadaki
+    sırayla çağırır; gemiye bağlı pilotaj, römorkör, palamar ve LÇB
+    calculators.memo üzerinden cache'lenir. Sadece liman ve kura bağlı sabit kalemler
+    (tarife seti özeti, liman, usd_eur, usd_tl) anahtarıyla bir kez hesaplanıp tekrar kullanılır.
+    Kalemler LINE_NODES grafiğinden hesaplanır; her düğüm okuduğu girdileri
+    bildirir, compute_scenarios ve calculators.incremental sadece girdisi
+    değişen kalemleri yeniden hesaplar.
+    tariff_sets verilirse call_date'li uğramalar kayıt defteri yerine bu
+    setlerden seçilir (işçi süreçleri diske gitmez).
+    cache (calculators.result_cache.ResultCache) verilirse compute / iter_many
+    aynı girdi + tarife seti için hesaplanmış proformayı tekrar kullanır.
+    """
+
+    def __init__(self, tariff_sets: Optional[Sequence[TariffSet]] = None, cache=None):
+        self._fixed_cache: dict[tuple, dict[str, LineItem]] = {}
+        self.tariff_sets = tariff_sets
+        self.cache = cache
+
+    def compute(self, call: PortCall) -> Proforma:
+        """Tek bir uğrama için proforma hesapla"""
+        return self._cached_compute(call, self._tariffs_for(call, current_tariffs()))
+
+    def _cached_compute(self, call: PortCall, tariffs: TariffSet) -> Proforma:
+        if self.cache is not None:
+            proforma = self.cache.lookup(call, tariffs)
+            if proforma is not None:
+                return proforma
+        with exact_money(), use_tariffs(tariffs):
+            proforma = self._compute(call)
+        if self.cache is not None:
+            self.cache.store(proforma, tariffs)
+        return proforma
+
+    def _compute(self, call: PortCall) -> Proforma:
+        fixed = self._fixed_lines(call.port, call.rates)
+        # Opsiyonel hizmet yoksa hizmet düğümleri hiç çağrılmaz (toplu fiyatlamada sıcak yol)
+        services = call.services
+        nodes = CORE_NODES if services is NO_SERVICES or services == NO_SERVICES else LINE_NODES
+        lines = [item for node in nodes if (item := node.compute(call, fixed)) is not None]
+        return Proforma(call=call, lines=lines, tariff_version=memo.tariff_version())
+
+    def _items(self, call: PortCall) -> dict[str, Optional[LineItem]]:
+        """Tüm kalem sonuçları: code -> LineItem | None"""
+        fixed = self._fixed_lines(call.port, call.rates)
+        return {node.code: node.compute(call, fixed) for node in LINE_NODES}
+
+    def _proforma(self, call: PortCall, items: dict[str, Optional[LineItem]]) -> Proforma:
+        """Kalem sonuçlarını (code -> LineItem | None) sayfa sırasıyla proformaya diz"""
+        lines = [items[node.code] for node in LINE_NODES if items[node.code] is not None]
+        return Proforma(call=call, lines=lines, tariff_version=memo.tariff_version())
+
+    def _recompute(
+        self, call: PortCall, items: dict[str, Optional[LineItem]], changed: frozenset[str],
+    ) -> dict[str, Optional[LineItem]]:
+        """Sadece girdilerinden biri değişen kalemleri yeniden hesapla (aynı tarife seti içinde)"""
+        updated = dict(items)
+        fixed = self._fixed_lines(call.port, call.rates) if _FIXED_INPUTS & changed else None
+        for node in LINE_NODES:
+            if node.inputs & changed:
+                updated[node.code] = node.compute(call, fixed)
+        return updated
+
+    def compute_scenarios(self, call: PortCall, variants: Iterable[tuple[str, Options]]) -> list[Proforma]:
+        """
+        Aynı gemi için (liman, seçenekler) varyantları tek seferde fiyatla.
+        Liman ve seçeneklere bağlı olmayan kalemler bir kez hesaplanıp tüm
+        varyantlarda paylaşılır; hepsi aynı tarife setiyle hesaplanır.
+        """
+        with exact_money(), use_tariffs(self._tariffs_for(call, current_tariffs())):
+            base = self._items(call)
+            proformas = []
+            for port, options in variants:
+                variant = replace(call, port=port, options=options)
+                proformas.append(self._proforma(variant, self._recompute(variant, base, changed_inputs(call, variant))))
+            return proformas
+
+    def iter_many(self, calls: Iterable[PortCall]) -> Iterator[Proforma]:
+        """
+        Uğramaları sırayla fiyatla (generator - sabit bellek).
+        Tarihsiz uğramalar, ilk çağrıdaki güncel setle hesaplanır.
+        """
+        default = current_tariffs()
+        for call in calls:
+            yield self._cached_compute(call, self._tariffs_for(call, default))
+
+    def compute_many(self, calls: Iterable[PortCall]) -> list[Proforma]:
+        """Toplu fiyatlama: girdi sırasıyla proforma listesi döner"""
+        return list(self.iter_many(calls))
+
+    def _tariffs_for(self, call: PortCall, default: TariffSet) -> TariffSet:
+        """Uğramanın tarife seti: call_date'te geçerli set, tarih yoksa default"""
+        if call.call_date is None:
+            return default
+        if self.tariff_sets is not None:
+            return tariff_for_date(self.tariff_sets, call.call_date)
+        return registry().for_date(call.call_date)
+
+    def _fixed_lines(self, port: str, r: Rates) -> dict[str, LineItem]:
+        """Sadece liman ve kura bağlı kalemler (cache'li)"""
+        key = (memo.tariff_key(), port, r.usd_eur, r.usd_tl)
+        fixed = self._fixed_cache.get(key)
+        if fixed is None:
+            if len(self._fixed_cache) >= _FIXED_CACHE_MAX:
+                self._fixed_cache.clear()
+            fixed = _build_fixed_lines(port, r)
+            self._fixed_cache[key] = fixed
+        return fixed
+
+
+_FIXED_CACHE_MAX = 256
+
+# Chamber of shipping kalemlerinden sonra gelen sabit kalemlerin sırası
+_FIXED_AFTER_CHAMBER = (
+    "maritime_assoc",
+    "motorboat",
+    "izmir_yolluk",
+    "aliaga_muhafaza",
+    "aliaga_yolluk",
+    "facilities",
+    "transportation",
+    "fiscal_notary",
+    "communication",
+)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _label(template: str, *args) -> str:
+    """Değişkenli açıklama: aynı değerler tekrar biçimlenmez, tüm proformalar aynı (intern) metni paylaşır"""
+    return sys.intern(template.format(*args))
+
+
+def _line(code: str, label: str, usd: Money, eur: Money) -> LineItem:
+    """Tek yuvarlama aşaması: tam tutarlar kalemde kuruşa yuvarlanır"""
+    return LineItem(code, label, usd.rounded(), eur.rounded())
+
+
+def _usd_line(code: str, label: str, usd: float, r: Rates) -> LineItem:
+    """USD bazlı kalem: EUR karşılığı usd / usd_eur"""
+    usd = Money.of(usd, USD)
+    return _line(code, label, usd, usd.to(EUR, r.usd_eur))
+
+
+def _eur_line(code: str, label: str, eur: float, r: Rates) -> LineItem:
+    """EUR bazlı kalem: USD karşılığı eur / usd_eur"""
+    eur = Money.of(eur, EUR)
+    return _line(code, label, eur.to(USD, r.usd_eur), eur)
+
+
+def _build_fixed_lines(port: str, r: Rates) -> dict[str, LineItem]:
+    """Gemiden bağımsız kalemleri hesapla: code -> LineItem"""
+    fixed = {}
+
+    port_in_out = PORT_IN_OUT_FEES.get(port, 0)
+    if port_in_out > 0:
+        fixed["ceyport"] = _usd_line(
+            "ceyport", "CEYPORT port in Turkey in/out exp. (estimated)", port_in_out, r,
+        )
+
+    garb_eur = Money.of(waste.calc_garbage(use_fixed=True), EUR)
+    garb_usd = garb_eur.to(USD, r.usd_eur, multiply=True)  # EUR -> USD
+    fixed["garbage"] = _line("garbage", "Garbage (Compulsory charge)", garb_usd, garb_eur)
+
+    fixed["light_dues"] = _usd_line("light_dues", "Light dues", other.calc_light_dues(), r)
+    fixed["chamber_fee"] = _usd_line(
+        "chamber_fee", "Chamber of shipping fee", other.calc_chamber_shipping_fee(), r,
+    )
+
+    fixed["maritime_assoc"] = _eur_line(
+        "maritime_assoc", "Contr. to Maritime Association fee", other.calc_maritime_assoc(), r,
+    )
+
+    # Motorboat (port'a göre: İzmir 225 USD, diğer 500 USD)
+    fixed["motorboat"] = _usd_line("motorboat", "Motorboat exp.", other.calc_motorboat(port), r)
+
+    # Port bazlı ek kalemler
+    port_cfg = PORT_SPECIFIC.get(port.upper(), {})
+    if port_cfg.get("yolluk") and port.upper() == "IZMIR":
+        fixed["izmir_yolluk"] = _usd_line("izmir_yolluk", "İzmir Yolluk", harbour.calc_izmir_yolluk(r.usd_tl), r)
+    if port_cfg.get("muhafaza") and port.upper() == "ALIAGA":
+        muh_usd, yolluk_usd = harbour.calc_aliaga_guards(r.usd_tl)
+        fixed["aliaga_muhafaza"] = _usd_line("aliaga_muhafaza", "Aliaga Muhafaza Mesai", muh_usd, r)
+        fixed["aliaga_yolluk"] = _usd_line("aliaga_yolluk", "Aliaga Muhafaza Yolluk", yolluk_usd, r)
+
+    # Facilities, Transportation, Fiscal, Communication
+    for code, label, eur in (
+        ("facilities", "Facilities & Other exp.", other.calc_facilities()),
+        ("transportation", "Transportation exp.", other.calc_transportation()),
+        ("fiscal_notary", "Fiscal & Notary exp.", other.calc_fiscal_notary()),
+        ("communication", "Communication & Copy & Stamp exp.", other.calc_communication_stamp()),
+    ):
+        fixed[code] = _eur_line(code, label, eur, r)
+
+    return fixed
+
+
+def call_inputs(call: PortCall) -> dict:
+    """Uğramanın kalemlerin bağlı olabileceği düz girdileri (LineNode.inputs adları)"""
+    v, r, o = call.vessel, call.rates, call.options
+    return {
+        "nrt": v.nrt, "grt": v.grt, "gt": v.gt, "vessel_type": v.vessel_type, "is_turk_flag": v.is_turk_flag,
+        "port": call.port, "purpose": call.purpose, "cargo_mt": call.cargo_mt,
+        "berth_days": call.berth_days, "anchorage_days": call.anchorage_days,
+        "usd_eur": r.usd_eur, "usd_tl": r.usd_tl,
+        "overtime": o.overtime, "tanker": o.tanker, "four_tugs": o.four_tugs,
+        **{name: getattr(call.services, name) for name in _SERVICE_FIELDS},
+    }
+
+
+def changed_inputs(old: PortCall, new: PortCall) -> frozenset[str]:
+    """İki uğrama arasında değişen girdi adları"""
+    a, b = call_inputs(old), call_inputs(new)
+    return frozenset(name for name in a if a[name] != b[name])
+
+
+@dataclass(frozen=True)
+class LineNode:
+    """
+    Hesap grafiği düğümü: bir kalem, okuduğu girdiler (call_inputs adları)
+    ve hesap fonksiyonu (call, fixed) -> LineItem | None (kalem uygulanmıyorsa).
+    fixed: ProformaEngine._fixed_lines sonucu (sadece limana ve kura bağlı kalemler).
+    Girdilerinden hiçbiri değişmeyen kalem yeniden hesaplanmaz.
+    """
+    code: str
+    inputs: frozenset[str]
+    compute: Callable[[PortCall, dict], Optional[LineItem]]
+
+
+def _inputs(*names: str) -> frozenset[str]:
+    # Her kalem EUR/USD karşılığı için usd_eur'a bağlıdır
+    return frozenset(("usd_eur",) + names)
+
+
+_FIXED_INPUTS = _inputs("port", "usd_tl")
+
+
+def _fixed_node(code: str) -> LineNode:
+    """Sadece liman ve kura bağlı kalem (ProformaEngine._fixed_lines cache'inden)"""
+    return LineNode(code, _FIXED_INPUTS, lambda call, fixed: fixed.get(code))
+
+
+def _pilotage(call: PortCall, fixed: dict) -> LineItem:
+    v, o = call.vessel, call.options
+    pilot_usd = memo.port_pilotage(v.grt, v.vessel_type, call.port, o.tanker_pct)
+    if o.overtime_pct:
+        pilot_usd *= PILOTAGE_OVERTIME_FACTOR
+    return _usd_line("pilotage", "Pilotage", pilot_usd, call.rates)
+
+
+def _tugboats(call: PortCall, fixed: dict) -> LineItem:
+    v, o = call.vessel, call.options
+    tug_usd = memo.tugboat_fee(v.grt, v.vessel_type, o.four_tugs, o.overtime_pct)
+    return _usd_line("tugboats", "Tugboats", tug_usd, call.rates)
+
+
+def _wharfage(call: PortCall, fixed: dict) -> LineItem:
+    v = call.vessel
+    wharf_usd = berthing.calc_berthing(v.gt, call.berth_days, v.is_turk_flag, v.is_kabotaj)
+    return _usd_line("wharfage", _label("Wharfage / Quay dues (For {} days)", call.berth_days), wharf_usd, call.rates)
+
+
+def _mooring(call: PortCall, fixed: dict) -> LineItem:
+    v = call.vessel
+    moor_usd = memo.mooring_fee(v.grt, v.is_kabotaj, False, call.options.overtime_pct)
+    return _usd_line("mooring", "Mooring boat", moor_usd, call.rates)
+
+
+def _harbour_master(call: PortCall, fixed: dict) -> LineItem:
+    lcb_usd = memo.lcb_fee(call.vessel.nrt, call.rates.usd_tl, False)
+    return _usd_line("harbour_master", "Harbour Master dues", lcb_usd, call.rates)
+
+
+def _port_service(call: PortCall, fixed: dict) -> LineItem:
+    # Liman Hizmet Ücreti / Port Service Fee (2026 TL tarifesi)
+    v = call.vessel
+    liman_hizmet_usd = harbour.calc_liman_hizmet(v.gt, v.is_turk_flag, call.rates.usd_tl)
+    return _usd_line("port_service", "Port Service Fee", liman_hizmet_usd, call.rates)
+
+
+def _sanitary(call: PortCall, fixed: dict) -> LineItem:
+    san_usd = harbour.calc_sahil_saglik(call.vessel.nrt, call.rates.usd_tl)
+    return _usd_line("sanitary", "Sanitary dues", san_usd, call.rates)
+
+
+def _customs_overtime(call: PortCall, fixed: dict) -> LineItem:
+    customs_usd = harbour.calc_customs_overtime(call.cargo_mt or 0, call.is_import, call.rates.usd_tl)
+    return _usd_line("customs_overtime", "Customs Overtime", customs_usd, call.rates)
+
+
+def _anchorage(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    if call.anchorage_days <= 0:
+        return None
+    v = call.vessel
+    anch_usd = anchorage.calc_anchorage(v.grt, call.anchorage_days, v.is_turk_flag)
+    return _usd_line("anchorage", _label("Anchorage dues (For {} days)", call.anchorage_days), anch_usd, call.rates)
+
+
+def _chamber_share(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    chamber_share_usd = harbour.calc_chamber_freight(call.cargo_mt or 0, call.vessel.is_turk_flag)
+    if chamber_share_usd <= 0:
+        return None
+    return _usd_line("chamber_share", "Chamber of shipping share on freight", chamber_share_usd, call.rates)
+
+
+def _supervision(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    # USD cinsinden hesaplanır (proforma örneğine göre); dahili gemilerden alınmaz
+    v = call.vessel
+    is_domestic = v.is_turk_flag and v.is_kabotaj
+    superv_usd = other.calc_supervision(call.cargo_mt or 0, goproz_rate=None, is_domestic=is_domestic)
+    if superv_usd <= 0:
+        return None
+    return _usd_line("supervision", "Supervision fee (as per official tariff)", superv_usd, call.rates)
+
+
+def _agency_fee(call: PortCall, fixed: dict) -> LineItem:
+    agency_eur = agency.calc_agency_fee(call.vessel.nrt, call.berth_days)
+    return _eur_line("agency_fee", "Agency fee (as per official tariff)", agency_eur, call.rates)
+
+
+def _protective_agency(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    if not call.services.protective_agency:
+        return None
+    eur = agency.calc_protective_agency_fee(call.vessel.nrt)
+    return _eur_line("protective_agency", "Protective agency fee (as per official tariff)", eur, call.rates)
+
+
+def _spare_parts(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    kg = call.services.spare_parts_kg
+    if kg <= 0:
+        return None
+    return _eur_line("spare_parts", _label("Spare parts delivery ({:g} kg)", kg), other.calc_spare_parts(kg), call.rates)
+
+
+def _bunker_supervision(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    operations = call.services.bunker_operations
+    if operations <= 0:
+        return None
+    eur = other.calc_bunker_supervision(operations)
+    return _eur_line("bunker_supervision", _label("Bunker supervision ({} operation(s))", operations), eur, call.rates)
+
+
+def _crew_change(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    persons = call.services.crew_change_persons
+    if persons <= 0:
+        return None
+    eur = other.calc_crew_change(persons)
+    return _eur_line("crew_change", _label("Crew joining / leaving ({} person(s))", persons), eur, call.rates)
+
+
+def _medical(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    patients = call.services.medical_patients
+    if patients <= 0:
+        return None
+    eur = other.calc_medical(patients)
+    return _eur_line("medical", _label("Medical assistance ({} patient(s))", patients), eur, call.rates)
+
+
+def _captain_advance(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    amount = call.services.captain_advance_eur
+    if amount <= 0:
+        return None
+    eur = other.calc_captain_advance(amount)
+    return _eur_line("captain_advance", _label("Cash to master commission (EUR {:,.2f})", amount), eur, call.rates)
+
+
+def _transit_visa(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    persons = call.services.transit_visa_persons
+    if persons <= 0:
+        return None
+    usd = harbour.calc_transit_visa(call.rates.usd_tl) * persons
+    return _usd_line("transit_visa", _label("Transit visa fees ({} person(s))", persons), usd, call.rates)
+
+
+def _waste_extra(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    # Hafta sonu / mesai dışı birim fiyatları mesai seçeneğiyle uygulanır
+    sv = call.services
+    eur = waste.calc_waste_extra(
+        sv.waste_marpol1_slop_m3, sv.waste_marpol1_bilge_m3, sv.waste_marpol4_m3, sv.waste_marpol5_m3,
+        call.vessel.grt, call.options.overtime,
+    )
+    if eur <= 0:
+        return None
+    return _eur_line("waste_extra", "Waste in excess of included quantities", eur, call.rates)
+
+
+def _auto_service(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    if not call.services.auto_service:
+        return None
+    return _usd_line("auto_service", "Auto service", harbour.calc_auto_service(call.vessel.grt), call.rates)
+
+
+def _stamp_duties(call: PortCall, fixed: dict) -> Optional[LineItem]:
+    if not call.services.stamp_duties:
+        return None
+    usd = sum(harbour.calc_stamp_duties(call.rates.usd_tl).values())
+    return _usd_line("stamp_duties", "Stamp duties (summary declaration, ordino, port request)", usd, call.rates)
+
+
+_SERVICE_FIELDS = tuple(f.name for f in fields(Services))
+
+_WASTE_FIELDS = ("waste_marpol1_slop_m3", "waste_marpol1_bilge_m3", "waste_marpol4_m3", "waste_marpol5_m3")
+
+# Proforma kalemleri, sayfadaki sırasıyla (uygulanmayan kalemler None döner)
+CORE_NODES: tuple[LineNode, ...] = (
+    _fixed_node("ceyport"),  # CEYPORT port in/out (Tekirdağ)
+    LineNode("pilotage", _inputs("grt", "vessel_type", "port", "tanker", "overtime"), _pilotage),
+    LineNode("tugboats", _inputs("grt", "vessel_type", "four_tugs", "overtime"), _tugboats),
+    LineNode("wharfage", _inputs("gt", "berth_days", "is_turk_flag", "vessel_type"), _wharfage),
+    LineNode("mooring", _inputs("grt", "vessel_type", "overtime"), _mooring),
+    _fixed_node("garbage"),
+    LineNode("harbour_master", _inputs("nrt", "usd_tl"), _harbour_master),
+    LineNode("port_service", _inputs("gt", "is_turk_flag", "usd_tl"), _port_service),
+    LineNode("sanitary", _inputs("nrt", "usd_tl"), _sanitary),
+    _fixed_node("light_dues"),
+    LineNode("customs_overtime", _inputs("cargo_mt", "purpose", "usd_tl"), _customs_overtime),
+    LineNode("anchorage", _inputs("grt", "anchorage_days", "is_turk_flag"), _anchorage),
+    _fixed_node("chamber_fee"),
+    LineNode("chamber_share", _inputs("cargo_mt", "is_turk_flag"), _chamber_share),
+    # Maritime Association, Motorboat, port bazlı ek kalemler, sabit masraflar
+    *(_fixed_node(code) for code in _FIXED_AFTER_CHAMBER),
+    LineNode("supervision", _inputs("cargo_mt", "is_turk_flag", "vessel_type"), _supervision),
+    LineNode("agency_fee", _inputs("nrt", "berth_days"), _agency_fee),
+)
+
+# Opsiyonel hizmet kalemleri (Services): sabit kalemlerden sonra, proforma sonunda
+SERVICE_NODES: tuple[LineNode, ...] = (
+    LineNode("protective_agency", _inputs("protective_agency", "nrt"), _protective_agency),
+    LineNode("spare_parts", _inputs("spare_parts_kg"), _spare_parts),
+    LineNode("bunker_supervision", _inputs("bunker_operations"), _bunker_supervision),
+    LineNode("crew_change", _inputs("crew_change_persons"), _crew_change),
+    LineNode("medical", _inputs("medical_patients"), _medical),
+    LineNode("captain_advance", _inputs("captain_advance_eur"), _captain_advance),
+    LineNode("transit_visa", _inputs("transit_visa_persons", "usd_tl"), _transit_visa),
+    LineNode("waste_extra", _inputs(*_WASTE_FIELDS, "grt", "overtime"), _waste_extra),
+    LineNode("auto_service", _inputs("auto_service", "grt"), _auto_service),
+    LineNode("stamp_duties", _inputs("stamp_duties", "usd_tl"), _stamp_duties),
+)
+
+LINE_NODES: tuple[LineNode, ...] = CORE_NODES + SERVICE_NODES
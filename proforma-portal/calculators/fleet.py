@@ -0,0 +1,178 @@
+"""
+Filo fiyatlama - proforma kalemlerinin NumPy karşılığı (USD)
+Binlerce uğramanın kalemleri tek geçişte, ProformaEngine ile aynı kurallarla
+hesaplanır: tarife kalemleri calculators.vectorized ile exact=True (ara
+tutarlar yuvarlanmaz) hesaplanır, kalem kuruşa ROUND_HALF_UP yuvarlanır
+(yarım kuruşa çok yakın elemanlar Decimal ile düzeltilir). EUR bazlı
+kalemlerin USD karşılığı tutar / usd_eur'dur. Sadece liman ve kura bağlı
+sabit kalemler (liman, kur) çifti başına motorun kendi kodu ile hesaplanır.
+Opsiyonel hizmetler (Services) kapsam dışıdır.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+import numpy as np
+
+from config.settings import PORTS
+from calculators import vectorized
+from calculators.engine import OVERTIME_PCT, PILOTAGE_OVERTIME_FACTOR, TANKER_PCT, ProformaEngine, Rates
+from calculators.tariff_sets import TariffSet, current_tariffs, use_tariffs
+from calculators.vectorized import bracket_lookup, tl_to_usd
+from utils.money import CENT, exact_money, to_decimal
+
+# Girdi sütunları: dizi (veya skaler) - price_lines(inputs)
+INPUT_COLUMNS = (
+    "port", "nrt", "grt", "gt", "vessel_type", "is_turk_flag", "purpose", "cargo_mt",
+    "berth_days", "anchorage_days", "overtime", "tanker", "four_tugs", "usd_eur", "usd_tl",
+)
+
+# Yarım kuruşa bu kadar yakın tutarlar Decimal ile yuvarlanır
+_NEAR_HALF = 1e-6
+
+
+def _round_cents(values, divisor=None) -> np.ndarray:
+    """
+    Money.of(x).rounded() karşılığı; divisor verilirse Money.of(x).to(..., divisor).
+    float yuvarlaması sadece yarım kuruş sınırında Decimal'den ayrılabilir,
+    o elemanlar Decimal ile yeniden hesaplanır. NaN (kalem yok) korunur.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if divisor is None:
+        exact = values
+    else:
+        divisor = np.broadcast_to(np.asarray(divisor, dtype=np.float64), values.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exact = np.where(divisor > 0, values / divisor, 0.0)
+    scaled = np.abs(exact) * 100
+    result = np.sign(exact) * np.floor(scaled + 0.5) / 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < _NEAR_HALF
+    if near_half.any():
+        result = np.array(result, copy=True)
+        for i in np.flatnonzero(near_half):
+            amount = to_decimal(float(values.flat[i]))
+            if divisor is not None:
+                rate = to_decimal(float(divisor.flat[i]))
+                amount = amount / rate if rate > 0 else Decimal(0)
+            result.flat[i] = float(amount.quantize(CENT, rounding=ROUND_HALF_UP))
+    return np.where(np.isnan(values), np.nan, result)
+
+
+def _columns(inputs: dict) -> dict:
+    """Girdileri ortak boyda NumPy dizilerine çevir"""
+    n = max(np.size(inputs[name]) for name in INPUT_COLUMNS)
+    cols = {}
+    for name in INPUT_COLUMNS:
+        value = np.asarray(inputs[name])
+        if value.ndim == 0:
+            value = np.full(n, value.item(), dtype=value.dtype)
+        cols[name] = value
+    for name in ("is_turk_flag", "overtime", "tanker", "four_tugs"):
+        cols[name] = cols[name].astype(bool)
+    for name in ("nrt", "grt", "gt", "cargo_mt", "berth_days", "anchorage_days", "usd_eur", "usd_tl"):
+        cols[name] = cols[name].astype(np.float64)
+    return cols
+
+
+def _fixed_usd(cols: dict, t: TariffSet) -> dict[str, np.ndarray]:
+    """Sadece liman ve kura bağlı kalemler: (liman, kur) çifti başına motorun _fixed_lines'ı"""
+    n = len(cols["port"])
+    keys = np.rec.fromarrays([cols["port"].astype(str), cols["usd_eur"], cols["usd_tl"]])
+    unique, inverse = np.unique(keys, return_inverse=True)
+    engine = ProformaEngine()
+    out: dict[str, np.ndarray] = {}
+    with exact_money(), use_tariffs(t):
+        for k, (port, usd_eur, usd_tl) in enumerate(unique):
+            fixed = engine._fixed_lines(str(port), Rates(usd_eur=float(usd_eur), usd_tl=float(usd_tl)))
+            rows = inverse == k
+            for code, line in fixed.items():
+                column = out.setdefault(code, np.full(n, np.nan))
+                column[rows] = float(line.usd)
+    return out
+
+
+def price_lines(inputs: dict, tariffs: Optional[TariffSet] = None) -> dict[str, np.ndarray]:
+    """
+    Uğramaların kalem tutarları (USD, kuruşa yuvarlanmış): code -> dizi.
+    Kalemin uygulanmadığı uğramalarda değer NaN'dır. inputs: INPUT_COLUMNS
+    anahtarlı diziler (port / vessel_type / purpose metin, bayraklar bool).
+    """
+    t = tariffs or current_tariffs()
+    c = _columns(inputs)
+    grt, nrt, gt = c["grt"], c["nrt"], c["gt"]
+    usd_tl = c["usd_tl"]
+    cargo = c["cargo_mt"]
+    is_kabotaj = c["vessel_type"].astype(str) == "kabotaj"
+    turk = c["is_turk_flag"]
+    overtime = c["overtime"]
+    overtime_pct = np.where(overtime, OVERTIME_PCT, 0)
+    lines: dict[str, np.ndarray] = {}
+
+    # Pilotage: T.1.1 (+ İzmir'de T.2 izmir_demir), tanker zammı, mesai çarpanı
+    tanker_pct = np.where(c["tanker"], TANKER_PCT, 0)
+    pilot = vectorized.port_pilotage(grt, c["vessel_type"], c["port"], tanker_pct, t, exact=True)
+    lines["pilotage"] = _round_cents(np.where(overtime, pilot * PILOTAGE_OVERTIME_FACTOR, pilot))
+
+    tug = vectorized.tugboat(grt, c["vessel_type"], c["four_tugs"], overtime_pct, t, exact=True)
+    lines["tugboats"] = _round_cents(tug)
+    wharf = vectorized.berthing(gt, c["berth_days"], turk, is_kabotaj, t, exact=True)
+    lines["wharfage"] = _round_cents(wharf)
+    moor = vectorized.mooring(grt, is_kabotaj, False, overtime_pct, t, exact=True)
+    lines["mooring"] = _round_cents(moor)
+
+    # TL bazlı kalemler
+    tables = t.tables
+    lines["harbour_master"] = _round_cents(tl_to_usd(bracket_lookup(tables.LCB, nrt), usd_tl, exact=True))
+    liman = np.where(
+        turk, bracket_lookup(tables.LIMAN_HIZMET, gt, "turk_tl"), bracket_lookup(tables.LIMAN_HIZMET, gt, "yabanci_tl"),
+    )
+    lines["port_service"] = _round_cents(tl_to_usd(liman, usd_tl, exact=True))
+    lines["sanitary"] = _round_cents(tl_to_usd(nrt * t.SAHIL_SAGLIK_PER_NRT_TL, usd_tl, exact=True))
+    is_import = c["purpose"].astype(str) == "Discharging"
+    customs = np.where(is_import, bracket_lookup(tables.CUSTOMS_IMPORT, cargo), bracket_lookup(tables.CUSTOMS_EXPORT, cargo))
+    lines["customs_overtime"] = _round_cents(tl_to_usd(customs, usd_tl, exact=True))
+
+    # Anchorage (demirde kalış varsa)
+    anch = vectorized.anchorage(grt, c["anchorage_days"], turk, t, exact=True)
+    lines["anchorage"] = _round_cents(np.where(c["anchorage_days"] > 0, anch, np.nan))
+
+    # Chamber of shipping share on freight (Türk bayraklıda yok)
+    share = np.where(turk, 0.0, bracket_lookup(tables.CHAMBER_FREIGHT, cargo))
+    lines["chamber_share"] = _round_cents(np.where(share > 0, share, np.nan))
+
+    # Supervision (dahili gemilerden alınmaz)
+    superv = np.where(turk & is_kabotaj, 0.0, (cargo * t.SUPERVISION_CENTY_RATE) * t.SUPERVISION_GOPROZ_RATE)
+    lines["supervision"] = _round_cents(np.where(superv > 0, superv, np.nan))
+
+    # Agency fee (EUR -> USD)
+    agency = vectorized.agency_fee(nrt, c["berth_days"], t, exact=True)
+    lines["agency_fee"] = _round_cents(agency, divisor=c["usd_eur"])
+
+    lines.update(_fixed_usd(c, t))
+    return lines
+
+
+def totals(lines: dict[str, np.ndarray]) -> np.ndarray:
+    """Uğrama başına toplam USD (uygulanmayan kalemler hariç)"""
+    return np.nansum(np.vstack(list(lines.values())), axis=0) if lines else np.zeros(0)
+
+
+def example_inputs(n: int, seed: int = 0) -> dict:
+    """Rastgele filo girdileri (ölçüm ve karşılaştırma için)"""
+    rng = np.random.default_rng(seed)
+    return {
+        "port": rng.choice(PORTS, n),
+        "nrt": rng.integers(100, 60000, n).astype(np.float64),
+        "grt": rng.integers(300, 100000, n).astype(np.float64),
+        "gt": rng.integers(300, 100000, n).astype(np.float64),
+        "vessel_type": rng.choice(["kabotaj", "yolcu_feribot", "konteyner", "diger_yuk", "diger_tum"], n),
+        "is_turk_flag": rng.random(n) < 0.3,
+        "purpose": rng.choice(["Loading", "Discharging"], n),
+        "cargo_mt": rng.integers(0, 60000, n).astype(np.float64),
+        "berth_days": rng.integers(1, 30, n).astype(np.float64),
+        "anchorage_days": rng.integers(0, 15, n).astype(np.float64),
+        "overtime": rng.random(n) < 0.3,
+        "tanker": rng.random(n) < 0.2,
+        "four_tugs": rng.random(n) < 0.2,
+        "usd_eur": np.full(n, 1.1801),
+        "usd_tl": np.full(n, 34.5),
+    }
@@ -0,0 +1,75 @@
+"""
+Artımlı proforma hesabı - girdi değişince sadece etkilenen kalemler
+Her kalem engine.LINE_NODES içinde okuduğu girdileri bildirir. Form canlı
+önizlemesinde sadece berth_days değişirse yalnızca rıhtım ve acente ücreti
+yeniden hesaplanır; pilotaj, römorkör, LÇB vb. önceki sonuçtan gelir.
+Tarife seti değişirse (call_date veya dosya güncellemesi) tümü yeniden hesaplanır.
+"""
+from dataclasses import replace
+from typing import Iterable, Optional
+
+from calculators import memo
+from calculators.engine import (
+    LINE_NODES,
+    LineItem,
+    PortCall,
+    Proforma,
+    ProformaEngine,
+    changed_inputs,
+)
+from calculators.tariff_sets import current_tariffs, use_tariffs
+from utils.money import exact_money
+
+# Değişiklik taranabilen uğrama alanları (sweep)
+SWEEP_FIELDS = ("berth_days", "anchorage_days", "cargo_mt")
+
+
+class IncrementalProforma:
+    """
+    Son uğramanın kalem sonuçlarını tutar; update() yeni uğramada sadece
+    girdisi değişen kalemleri yeniden hesaplar. Oturum başına bir örnek
+    (thread-safe değildir). last_recomputed: son güncellemede hesaplanan kalem kodları.
+    """
+
+    def __init__(self, engine: Optional[ProformaEngine] = None):
+        self.engine = engine or ProformaEngine()
+        self._call: Optional[PortCall] = None
+        self._version: Optional[str] = None
+        self._items: dict[str, Optional[LineItem]] = {}
+        self.last_recomputed: tuple[str, ...] = ()
+
+    def update(self, call: PortCall) -> Proforma:
+        """Uğramanın proformasını döndür (değişmeyen kalemler tekrar kullanılır)"""
+        engine = self.engine
+        with exact_money(), use_tariffs(engine._tariffs_for(call, current_tariffs())):
+            version = memo.tariff_key()
+            if self._call is None or version != self._version:
+                self._items = engine._items(call)
+                self.last_recomputed = tuple(node.code for node in LINE_NODES)
+            else:
+                changed = changed_inputs(self._call, call)
+                self._items = engine._recompute(call, self._items, changed)
+                self.last_recomputed = tuple(node.code for node in LINE_NODES if node.inputs & changed)
+            self._call, self._version = call, version
+            return engine._proforma(call, self._items)
+
+    def reset(self):
+        self._call = None
+        self._items = {}
+
+
+def sweep(
+    call: PortCall,
+    field: str,
+    values: Iterable,
+    engine: Optional[ProformaEngine] = None,
+) -> list[Proforma]:
+    """
+    Duyarlılık taraması: uğramayı field'ın her değeriyle fiyatla
+    (örn. sweep(call, "berth_days", range(1, 31))). Her adımda sadece o
+    alana bağlı kalemler yeniden hesaplanır.
+    """
+    if field not in SWEEP_FIELDS:
+        raise ValueError(f"Taranamayan alan: {field} ({', '.join(SWEEP_FIELDS)})")
+    incremental = IncrementalProforma(engine)
+    return [incremental.update(replace(call, **{field: value})) for value in values]
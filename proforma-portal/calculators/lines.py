@@ -0,0 +1,117 @@
+"""
+Sütunlu proforma kalemleri - işçi süreçlerinden sonuç taşımak için
+LineTable çok proformanın kalemlerini kod no / açıklama no / USD / EUR
+(kuruş, int64) dizilerinde, proforma başına ofsetle tutar. Kod ve açıklama
+metinleri tabloda bir kez saklanır; pickle'ı aynı proformaların çıktı
+sözlüklerinden küçüktür. output(i) batch.records.to_output ile aynı kaydı
+üretir (kuruşa yuvarlanmış tutarlar kayıpsız döner).
+"""
+import sys
+from array import array
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from calculators.engine import LINE_NODES, Proforma
+
+# Kalem kodları sayfa sırasıyla; LineTable.codes başlangıçta bu tuple'ın indeksleri
+ITEM_CODES: tuple[str, ...] = tuple(node.code for node in LINE_NODES)
+
+
+def _amount_text(cents: int) -> str:
+    return str(Decimal(cents).scaleb(-2))
+
+
+class LineTable:
+    """
+    Çok proformanın sütunlu tablosu. append ile doldurulur; output(i) /
+    outputs() batch.records.to_output biçiminde kayıt üretir.
+    """
+
+    def __init__(self):
+        # Proforma başına
+        self.ids: list[str] = []
+        self.vessel_names: list[str] = []
+        self.ports: list[str] = []
+        self.tariff_versions: list[str] = []
+        self.snapshot_ids: list[Optional[str]] = []
+        self.offsets = array("L", [0])
+        # Kalem başına
+        self.codes = array("B")
+        self.labels = array("L")
+        self.usd = array("q")
+        self.eur = array("q")
+        # Tabloya özgü metin tabloları (süreçten bağımsız; pickle ile taşınır)
+        self.code_names: list[str] = list(ITEM_CODES)
+        self.label_names: list[str] = []
+        self._index()
+
+    def _index(self):
+        self._code_ids = {code: i for i, code in enumerate(self.code_names)}
+        self._label_ids = {label: i for i, label in enumerate(self.label_names)}
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        del state["_code_ids"], state["_label_ids"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._index()
+
+    def _code_id(self, code: str) -> int:
+        index = self._code_ids.get(code)
+        if index is None:
+            # Bilinmeyen kodlar tabloya eklenir
+            index = self._code_ids[code] = len(self.code_names)
+            self.code_names.append(code)
+        return index
+
+    def _label_id(self, label: str) -> int:
+        index = self._label_ids.get(label)
+        if index is None:
+            index = self._label_ids[label] = len(self.label_names)
+            self.label_names.append(sys.intern(label))
+        return index
+
+    def append(self, record_id: str, proforma: Proforma):
+        call = proforma.call
+        self.ids.append(record_id)
+        self.vessel_names.append(sys.intern(call.vessel.name))
+        self.ports.append(sys.intern(call.port))
+        self.tariff_versions.append(sys.intern(proforma.tariff_version))
+        self.snapshot_ids.append(call.rates.snapshot_id)
+        for line in proforma.lines:
+            self.codes.append(self._code_id(line.code))
+            self.labels.append(self._label_id(line.label))
+            self.usd.append(line.usd.minor)
+            self.eur.append(line.eur.minor)
+        self.offsets.append(len(self.codes))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def output(self, i: int) -> dict:
+        """i. proformanın çıktı kaydı (batch.records.to_output ile aynı)"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {
+            "id": self.ids[i],
+            "vessel_name": self.vessel_names[i],
+            "port": self.ports[i],
+            "tariff_version": self.tariff_versions[i],
+            "rate_snapshot_id": self.snapshot_ids[i],
+            "lines": [
+                {
+                    "code": self.code_names[self.codes[j]],
+                    "label": self.label_names[self.labels[j]],
+                    "usd": _amount_text(self.usd[j]),
+                    "eur": _amount_text(self.eur[j]),
+                }
+                for j in range(start, end)
+            ],
+            "total_usd": _amount_text(sum(self.usd[start:end])),
+            "total_eur": _amount_text(sum(self.eur[start:end])),
+        }
+
+    def outputs(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self.output(i)
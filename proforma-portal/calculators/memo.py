@@ -0,0 +1,107 @@
+"""
+Gemi bazlı tarife sonuçları için LRU memoization
+Aynı gemi (GRT/NRT/tip/bayrak) farklı liman ve tarihler için tekrar
+tekrar fiyatlanır; saf hesaplar (tarife sürümü, normalize girdiler)
+anahtarıyla cache'lenir. Tarife seti değiştiğinde cache boşaltılır.
+"""
+import inspect
+import threading
+from collections import OrderedDict
+
+from config.settings import TARIFF_MEMO_SIZE
+from calculators import pilotage, tugboat, mooring, harbour
+from calculators.tariff_sets import current_tariffs, registry, add_reload_listener
+from utils.money import is_exact
+
+
+def tariff_version() -> str:
+    """Geçerli (veya use_tariffs ile sabitlenmiş) tarife sürümü"""
+    return current_tariffs().version
+
+
+def tariff_key() -> str:
+    """Cache anahtarlarında kullanılan set kimliği: sürüm adı değil özet (yerinde düzenleme yeni anahtar verir)"""
+    return current_tariffs().digest
+
+
+class TariffMemo:
+    """
+    Modül fonksiyonunu saran, sınırlı boyutlu LRU cache.
+    Fonksiyon her miss'te modülden okunur (modül yeniden yüklenirse güncel
+    fonksiyon kullanılır). Anahtar: (tarife seti özeti, exact mod, bağlanmış argümanlar).
+    """
+
+    def __init__(self, module, name: str, maxsize: int = TARIFF_MEMO_SIZE):
+        self.module = module
+        self.name = name
+        self.maxsize = maxsize
+        self._signature = inspect.signature(getattr(module, name))
+        self._arity = len(self._signature.parameters)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, args, kwargs) -> tuple:
+        if not kwargs and len(args) == self._arity:
+            # Tüm argümanlar konumsal: bind gerekmez (toplu fiyatlamada sıcak yol)
+            return (tariff_key(), is_exact(), args)
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (tariff_key(), is_exact(), tuple(bound.arguments.values()))
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        value = getattr(self.module, self.name)(*args, **kwargs)
+
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return value
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.maxsize}
+
+
+port_pilotage = TariffMemo(pilotage, "calc_port_pilotage")
+pilotage_t11 = TariffMemo(pilotage, "calc_pilotage_t11")
+tugboat_fee = TariffMemo(tugboat, "calc_tugboat")
+mooring_fee = TariffMemo(mooring, "calc_mooring")
+lcb_fee = TariffMemo(harbour, "calc_lcb")
+
+MEMOIZED = (port_pilotage, pilotage_t11, tugboat_fee, mooring_fee, lcb_fee)
+
+
+def invalidate_all():
+    """Tüm tarife cache'lerini boşalt"""
+    for memo in MEMOIZED:
+        memo.cache_clear()
+
+
+def memo_stats() -> dict:
+    """Fonksiyon adı -> hit/miss/boyut"""
+    return {memo.name: memo.stats() for memo in MEMOIZED}
+
+
+def reload_tariffs() -> bool:
+    """
+    Tarife dosyalarını hemen yeniden oku (kontrol aralığını beklemeden).
+    Yeni set devreye girerse kayıt defteri dinleyicisi cache'leri boşaltır.
+    """
+    return registry().reload(force=True)
+
+
+add_reload_listener(lambda _active: invalidate_all())
@@ -1,8 +1,9 @@
 """
 T.1.3 Palamar Hizmetleri (USD)
 """
-from config.tariffs import MOORING_T13
+from calculators.tariff_sets import current_tariffs
 from calculators.base import round_grt_up
+from utils.money import money_round
 
 
 def calc_mooring(
@@ -15,8 +16,9 @@ def calc_mooring(
     Palamar (mooring boat) ücreti (USD).
     Kabotaj gemileri vs diğer tüm gemiler.
     """
+    t = current_tariffs()
     vessel_key = "kabotaj" if is_kabotaj else "diger_tum"
-    rates = MOORING_T13[vessel_key]
+    rates = t.MOORING_T13[vessel_key]
     rounded = round_grt_up(grt)
 
     if rounded <= 1000:
@@ -30,4 +32,4 @@ def calc_mooring(
     if overtime_pct > 0:
         fee *= (1 + overtime_pct / 100)
 
-    return round(fee, 2)
+    return money_round(fee)
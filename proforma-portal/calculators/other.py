@@ -1,28 +1,16 @@
 """
 Tarife 8 + Diğer sabit/masraflar: Motorboat, Supervision, Facilities, vb.
 """
-from config.tariffs import (
-    MOTORBOAT_USD,
-    MOTORBOAT_IZMIR_USD,
-    CHAMBER_SHIPPING_FEE_USD,
-    MARITIME_ASSOC_EUR,
-    FACILITIES_EUR,
-    TRANSPORTATION_EUR,
-    FISCAL_NOTARY_EUR,
-    COMMUNICATION_STAMP_EUR,
-    LIGHT_DUES_USD,
-    SUPERVISION_CENTY_RATE,
-    SUPERVISION_GOPROZ_RATE,
-    VOA_UNDER_5000_EUR,
-    VOA_OVER_5000_EUR,
-)
+from calculators.tariff_sets import current_tariffs
+from utils.money import money_round
 
 
 def calc_motorboat(port: str) -> float:
     """Motorboat exp. - İzmir 225 USD, diğer 500 USD"""
+    t = current_tariffs()
     if port.upper() == "IZMIR":
-        return MOTORBOAT_IZMIR_USD
-    return MOTORBOAT_USD
+        return t.MOTORBOAT_IZMIR_USD
+    return t.MOTORBOAT_USD
 
 
 def calc_supervision(
@@ -34,47 +22,93 @@ def calc_supervision(
     Supervision fee: (cargo_mt * 0.15) * goproz_kur (USD cinsinden).
     Dahili gemilerden alınmıyor. goproz_rate None ise varsayılan kullanılır.
     """
+    t = current_tariffs()
     if is_domestic:
         return 0.0
-    rate = goproz_rate if goproz_rate is not None else SUPERVISION_GOPROZ_RATE
-    return round((cargo_mt * SUPERVISION_CENTY_RATE) * rate, 2)
+    rate = goproz_rate if goproz_rate is not None else t.SUPERVISION_GOPROZ_RATE
+    return money_round((cargo_mt * t.SUPERVISION_CENTY_RATE) * rate)
 
 
 def calc_chamber_shipping_fee() -> float:
     """Chamber of shipping fee"""
-    return CHAMBER_SHIPPING_FEE_USD
+    t = current_tariffs()
+    return t.CHAMBER_SHIPPING_FEE_USD
 
 
 def calc_maritime_assoc() -> float:
     """Maritime Association contribution"""
-    return MARITIME_ASSOC_EUR
+    t = current_tariffs()
+    return t.MARITIME_ASSOC_EUR
 
 
 def calc_facilities() -> float:
     """Facilities & Other exp."""
-    return FACILITIES_EUR
+    t = current_tariffs()
+    return t.FACILITIES_EUR
 
 
 def calc_transportation() -> float:
     """Transportation exp."""
-    return TRANSPORTATION_EUR
+    t = current_tariffs()
+    return t.TRANSPORTATION_EUR
 
 
 def calc_fiscal_notary() -> float:
     """Fiscal & Notary exp."""
-    return FISCAL_NOTARY_EUR
+    t = current_tariffs()
+    return t.FISCAL_NOTARY_EUR
 
 
 def calc_communication_stamp() -> float:
     """Communication & Copy & Stamp exp."""
-    return COMMUNICATION_STAMP_EUR
+    t = current_tariffs()
+    return t.COMMUNICATION_STAMP_EUR
 
 
 def calc_light_dues() -> float:
     """Light dues"""
-    return LIGHT_DUES_USD
+    t = current_tariffs()
+    return t.LIGHT_DUES_USD
 
 
 def calc_voa(value_or_qty: float) -> float:
     """VOA: <=5000 ise 20 EUR, >5000 ise 40 EUR"""
-    return VOA_UNDER_5000_EUR if value_or_qty <= 5000 else VOA_OVER_5000_EUR
+    t = current_tariffs()
+    return t.VOA_UNDER_5000_EUR if value_or_qty <= 5000 else t.VOA_OVER_5000_EUR
+
+
+def calc_spare_parts(weight_kg: float) -> float:
+    """Yedek parça teslimi (Euro): kg başına ücret, alt ve üst sınırlı"""
+    t = current_tariffs()
+    if weight_kg <= 0:
+        return 0.0
+    fee = max(weight_kg * t.SPARE_PARTS_PER_KG_EUR, t.SPARE_PARTS_MIN_EUR)
+    return money_round(min(fee, t.SPARE_PARTS_MAX_EUR))
+
+
+def calc_bunker_supervision(operations: int = 1) -> float:
+    """Bunker ikmal gözetimi (Euro) - operasyon başına"""
+    t = current_tariffs()
+    return money_round(max(0, operations) * t.BUNKER_SUPERVISION_EUR)
+
+
+def calc_crew_change(persons: int) -> float:
+    """Mürettebat katılma / ayrılma (Euro): 1-2 kişi sabit, sonraki her kişi ek ücret"""
+    t = current_tariffs()
+    if persons <= 0:
+        return 0.0
+    return money_round(t.PERSON_JOIN_LEAVE_1_2_EUR + max(0, persons - 2) * t.PERSON_JOIN_LEAVE_EXTRA_EUR)
+
+
+def calc_medical(patients: int) -> float:
+    """Doktor / hastane refakati (Euro) - hasta başına"""
+    t = current_tariffs()
+    return money_round(max(0, patients) * t.MEDICAL_PER_PATIENT_EUR)
+
+
+def calc_captain_advance(amount_eur: float) -> float:
+    """Kaptana nakit avans komisyonu (Euro): avansın %1.5'i, en az 150"""
+    t = current_tariffs()
+    if amount_eur <= 0:
+        return 0.0
+    return money_round(max(amount_eur * t.CAPTAIN_ADVANCE_PCT, t.CAPTAIN_ADVANCE_MIN_EUR))
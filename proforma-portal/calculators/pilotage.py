@@ -1,8 +1,9 @@
 """
 T.1.1 Liman içi kılavuzluk + T.2 Liman dışı kılavuzluk (USD)
 """
-from config.tariffs import PILOTAGE_T11, PILOTAGE_T2_SERVICES
+from calculators.tariff_sets import current_tariffs
 from calculators.base import round_grt_up, grt_bracket_0_1000
+from utils.money import money_round
 
 
 def calc_pilotage_t11(
@@ -14,10 +15,11 @@ def calc_pilotage_t11(
     T.1.1 Liman içi kılavuzluk (USD).
     vessel_type: kabotaj, yolcu_feribot, konteyner, diger_yuk
     """
-    if vessel_type not in PILOTAGE_T11:
+    t = current_tariffs()
+    if vessel_type not in t.PILOTAGE_T11:
         vessel_type = "diger_yuk"
 
-    rates = PILOTAGE_T11[vessel_type]
+    rates = t.PILOTAGE_T11[vessel_type]
     rounded = round_grt_up(grt)
 
     if rounded <= 1000:
@@ -28,7 +30,7 @@ def calc_pilotage_t11(
     if tanker_surcharge_pct > 0:
         fee *= (1 + tanker_surcharge_pct / 100)
 
-    return round(fee, 2)
+    return money_round(fee)
 
 
 def calc_pilotage_t2(
@@ -40,10 +42,11 @@ def calc_pilotage_t2(
     T.2 Liman dışı kılavuzluk (USD).
     service_key: halic, istanbul_canakkale_gecis, izmir_demir vb.
     """
-    if service_key not in PILOTAGE_T2_SERVICES:
+    t = current_tariffs()
+    if service_key not in t.PILOTAGE_T2_SERVICES:
         return 0.0
 
-    rates = PILOTAGE_T2_SERVICES[service_key]
+    rates = t.PILOTAGE_T2_SERVICES[service_key]
     _, extra_1000s = grt_bracket_0_1000(grt)
 
     fee = rates["base"] + extra_1000s * rates["per_1000"]
@@ -51,7 +54,7 @@ def calc_pilotage_t2(
     if tanker_surcharge_pct > 0:
         fee *= (1 + tanker_surcharge_pct / 100)
 
-    return round(fee, 2)
+    return money_round(fee)
 
 
 def calc_port_pilotage(
@@ -70,4 +73,4 @@ def calc_port_pilotage(
     if port.upper() == "IZMIR":
         fee += calc_pilotage_t2(grt, "izmir_demir", tanker_surcharge_pct)
 
-    return round(fee, 2)
+    return money_round(fee)
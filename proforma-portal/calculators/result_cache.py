@@ -0,0 +1,199 @@
+"""
+Hesaplanmış proformaların içerik adresli cache'i
+Anahtar: uğrama girdilerinin kanonik JSON'unun SHA-256'sı + tarife setinin
+özeti (TariffSet.digest: sürüm ve değerler; aynı sürüm adıyla düzenlenen
+dosya yeni anahtar verir) + kurlar (snapshot'ın değerleri). Gemi adı ve snapshot kimliği kalemleri
+etkilemediği için anahtara girmez; sonuç her zaman istekteki uğramayla
+(adı, snapshot'ı) birleştirilerek döner. Değer: kalemlerin kod, açıklama
+ve kuruşa yuvarlanmış USD / EUR tutarları (sıkıştırılmış JSON).
+İki katman: süreç içi LRU (toplam bayt sınırıyla) ve isteğe bağlı SQLite
+dosyası (aynı makinedeki süreçler / API işçileri arasında paylaşılır).
+Cache'ten dönen proforma için hiçbir hesaplayıcı çağrılmaz.
+"""
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from config.settings import DB_POOL_SIZE, RESULT_CACHE_MB, RESULT_CACHE_DB, RESULT_CACHE_DB_ROWS
+from calculators.engine import LineItem, PortCall, Proforma
+from calculators.tariff_sets import TariffSet, add_reload_listener
+from utils import metrics
+from utils.money import EUR, USD, Money
+from utils.sqlite_pool import ConnectionPool
+
+# SQLite katmanında kaç yazmada bir satır sınırı uygulanır
+PRUNE_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_cache_created ON result_cache(created_at);
+"""
+
+HITS = {tier: metrics.counter("result_cache_hits_total", "Proforma sonuç cache isabetleri", tier=tier)
+        for tier in ("memory", "sqlite")}
+MISSES = metrics.counter("result_cache_misses_total", "Proforma sonuç cache kaçırmaları")
+
+
+def _canonical(value):
+    """Sayılar float'a (2196 == 2196.0), tarihler ISO metne"""
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def proforma_key(call: PortCall, tariffs: TariffSet) -> str:
+    """Uğrama + tarife seti için içerik adresli anahtar"""
+    inputs = asdict(call)
+    inputs["vessel"].pop("name")
+    inputs["rates"].pop("snapshot_id")
+    text = json.dumps([_canonical(inputs), tariffs.digest], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode(tariff_version: str, rows) -> bytes:
+    return zlib.compress(json.dumps({"v": tariff_version, "l": rows}, separators=(",", ":")).encode("utf-8"))
+
+
+def encode_proforma(proforma: Proforma) -> bytes:
+    rows = [[l.code, l.label, str(l.usd.amount), str(l.eur.amount)] for l in proforma.lines]
+    return _encode(proforma.tariff_version, rows)
+
+
+def encode_output(output: dict) -> bytes:
+    """batch.records.to_output kaydından aynı değer (API ana süreci işçi sonucunu böyle saklar)"""
+    rows = [[l["code"], l["label"], l["usd"], l["eur"]] for l in output["lines"]]
+    return _encode(output["tariff_version"], rows)
+
+
+def decode_proforma(call: PortCall, data: bytes) -> Proforma:
+    value = json.loads(zlib.decompress(data))
+    lines = [
+        LineItem(code, label, Money(Decimal(usd), USD), Money(Decimal(eur), EUR))
+        for code, label, usd, eur in value["l"]
+    ]
+    return Proforma(call=call, lines=lines, tariff_version=value["v"])
+
+
+class ResultCache:
+    """Bellek (LRU, bayt sınırlı) + isteğe bağlı SQLite katmanı"""
+
+    def __init__(self, max_bytes: int, db_path=None, db_rows: int = RESULT_CACHE_DB_ROWS):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pool = ConnectionPool(db_path, max_size=DB_POOL_SIZE, init_script=_SCHEMA) if db_path else None
+        self.db_rows = db_rows
+        self._writes = 0
+
+    def _remember(self, key: str, data: bytes):
+        size = len(key) + len(data)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(key) + len(old)
+            self._entries[key] = data
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_data = self._entries.popitem(last=False)
+                self._bytes -= len(old_key) + len(old_data)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is not None:
+            HITS["memory"].inc()
+            return data
+        if self._pool is not None:
+            with self._pool.connection() as conn:
+                row = conn.execute("SELECT value FROM result_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                HITS["sqlite"].inc()
+                self._remember(key, row[0])
+                return row[0]
+        MISSES.inc()
+        return None
+
+    def put(self, key: str, data: bytes):
+        self._remember(key, data)
+        if self._pool is None:
+            return
+        with self._pool.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, data, time.time()),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                # En eskiler silinir: satır sayısı db_rows'a iner
+                conn.execute(
+                    "DELETE FROM result_cache WHERE key IN ("
+                    " SELECT key FROM result_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.db_rows,),
+                )
+            conn.commit()
+
+    def lookup(self, call: PortCall, tariffs: TariffSet) -> Optional[Proforma]:
+        """Cache'teki proforma (istekteki uğramayla) veya None"""
+        data = self.get(proforma_key(call, tariffs))
+        return decode_proforma(call, data) if data is not None else None
+
+    def store(self, proforma: Proforma, tariffs: TariffSet):
+        """tariffs: proformanın hesaplandığı set"""
+        self.put(proforma_key(proforma.call, tariffs), encode_proforma(proforma))
+
+    def clear_memory(self):
+        """Bellek katmanını boşalt (tarife yeniden yüklenince; eski özetli anahtarlar bir daha sorulmaz)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def clear(self):
+        self.clear_memory()
+        if self._pool is not None:
+            with self._pool.connection() as conn:
+                conn.execute("DELETE FROM result_cache")
+                conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "sqlite": str(self._pool.path) if self._pool is not None else None}
+
+
+_default: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> Optional[ResultCache]:
+    """Ayarlardan süreç başına cache (RESULT_CACHE_MB=0 ise None)"""
+    global _default
+    if RESULT_CACHE_MB <= 0:
+        return None
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = ResultCache(int(RESULT_CACHE_MB * 1024 * 1024), RESULT_CACHE_DB or None)
+                add_reload_listener(lambda _active: _default.clear_memory())
+    return _default
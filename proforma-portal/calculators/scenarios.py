@@ -0,0 +1,109 @@
+"""
+Senaryo karşılaştırması - tek gemi, tüm limanlar ve seçenekler
+PORTS x mesai x 4 römorkör x tanker çapraz çarpımı tek çağrıda fiyatlanır;
+gemiye bağlı ortak kalemler (LÇB, sağlık, acente ücreti vb.) bir kez
+hesaplanır. Sonuç, temel senaryoya göre farkları gösteren bir matristir.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import product
+from typing import Optional, Sequence
+
+from config.settings import PORTS
+from calculators.engine import Options, PortCall, Proforma, ProformaEngine
+from utils.money import Money
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Karşılaştırılan varyant: liman + seçenekler"""
+    port: str
+    options: Options
+
+    @property
+    def label(self) -> str:
+        flags = [
+            name for name, on in (
+                ("Mesai", self.options.overtime),
+                ("4 Röm.", self.options.four_tugs),
+                ("Tanker", self.options.tanker),
+            ) if on
+        ]
+        return f"{self.port} " + ("+ " + ", ".join(flags) if flags else "(standart)")
+
+
+def scenario_grid(ports: Optional[Sequence[str]] = None) -> list[Scenario]:
+    """Liman x mesai x 4 römorkör x tanker çapraz çarpımı (liman sırası korunur)"""
+    return [
+        Scenario(port, Options(overtime=overtime, four_tugs=four_tugs, tanker=tanker))
+        for port, overtime, four_tugs, tanker in product(ports or PORTS, (False, True), (False, True), (False, True))
+    ]
+
+
+@dataclass
+class ScenarioRow:
+    """Matris satırı: bir kalemin senaryolardaki USD tutarı (kalem yoksa None)"""
+    code: str
+    label: str
+    usd: list[Optional[Money]]
+
+    @property
+    def varies(self) -> bool:
+        """Senaryolar arasında tutar (veya kalemin varlığı) değişiyor mu"""
+        return len(set(self.usd)) > 1
+
+
+@dataclass
+class ScenarioMatrix:
+    """Senaryo sonuçları: scenarios[i] <-> proformas[i]; baseline temel senaryonun indeksi"""
+    scenarios: list[Scenario]
+    proformas: list[Proforma]
+    baseline: int = 0
+
+    def rows(self, only_varying: bool = False) -> list[ScenarioRow]:
+        """Kalem satırları (tüm senaryolardaki kalemlerin birleşimi, ilk görülme sırasıyla)"""
+        labels: dict[str, str] = {}
+        amounts = []
+        for proforma in self.proformas:
+            by_code = {}
+            for line in proforma.lines:
+                labels.setdefault(line.code, line.label)
+                by_code[line.code] = line.usd
+            amounts.append(by_code)
+        rows = [ScenarioRow(code, label, [a.get(code) for a in amounts]) for code, label in labels.items()]
+        return [row for row in rows if row.varies] if only_varying else rows
+
+    @property
+    def totals_usd(self) -> list[Money]:
+        return [p.total_usd for p in self.proformas]
+
+    @property
+    def totals_eur(self) -> list[Money]:
+        return [p.total_eur for p in self.proformas]
+
+    def deltas_usd(self) -> list[Decimal]:
+        """Senaryo toplamlarının temel senaryodan farkı (USD)"""
+        base = self.totals_usd[self.baseline].amount
+        return [total.amount - base for total in self.totals_usd]
+
+    def cheapest(self) -> Scenario:
+        totals = self.totals_usd
+        return self.scenarios[min(range(len(totals)), key=totals.__getitem__)]
+
+
+def compare_scenarios(
+    call: PortCall,
+    ports: Optional[Sequence[str]] = None,
+    engine: Optional[ProformaEngine] = None,
+) -> ScenarioMatrix:
+    """
+    Uğramayı tüm senaryolarla fiyatla. Uğramanın kendi liman ve seçenekleri
+    temel senaryodur (ızgarada yoksa başa eklenir).
+    """
+    scenarios = scenario_grid(ports)
+    own = Scenario(call.port, call.options)
+    if own not in scenarios:
+        scenarios.insert(0, own)
+    engine = engine or ProformaEngine()
+    proformas = engine.compute_scenarios(call, [(s.port, s.options) for s in scenarios])
+    return ScenarioMatrix(scenarios=scenarios, proformas=proformas, baseline=scenarios.index(own))
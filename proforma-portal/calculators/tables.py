@@ -0,0 +1,30 @@
+"""
+Derlenmiş tarife tabloları - tarife seti yüklenirken bir kez oluşturulur
+Tüm hesaplayıcılar bracket aramalarını bu tablolar üzerinden yapar
+(current_tariffs().tables.AGENCY_BASE ...).
+"""
+from types import SimpleNamespace
+
+from calculators.base import BracketTable
+
+
+def compile_tables(values) -> SimpleNamespace:
+    """Tarife sabitlerinden (ad -> değer) bracket tablolarını derle"""
+    return SimpleNamespace(
+        # Acentelik (Euro) - NRT
+        AGENCY_BASE=BracketTable(values["AGENCY_BASE_FEES"], "nrt_max", "fee_eur"),
+        AGENCY_EXTRA=BracketTable(values["AGENCY_EXTRA_OVER_10K"], "nrt_max", "per_1000_eur"),
+        PROTECTIVE_BASE=BracketTable(values["PROTECTIVE_AGENCY_BASE"], "nrt_max", "fee_eur"),
+        PROTECTIVE_EXTRA=BracketTable(values["PROTECTIVE_AGENCY_EXTRA_OVER_10K"], "nrt_max", "per_1000_eur"),
+        # LÇB (TL) - NRT
+        LCB=BracketTable(values["LCB_NRT_TL"], "nrt_max", "tl"),
+        LCB_OVERTIME=BracketTable(values["LCB_OVERTIME_TL"], "nrt_max", "tl"),
+        # Liman hizmet ücreti (TL) - GT, Türk / yabancı sütunları
+        LIMAN_HIZMET=BracketTable(values["LIMAN_HIZMET_GT_TL"], "gt_max", "turk_tl", "yabanci_tl"),
+        # Gümrük mesai (TL) ve navlun oda payı (USD) - kargo MT
+        CUSTOMS_IMPORT=BracketTable(values["CUSTOMS_IMPORT_TL"], "mt_max", "tl"),
+        CUSTOMS_EXPORT=BracketTable(values["CUSTOMS_EXPORT_TL"], "mt_max", "tl"),
+        CHAMBER_FREIGHT=BracketTable(values["CHAMBER_FREIGHT_USD"], "mt_max", "usd"),
+        # Atık (Euro) - GRT, sabit ücret + dahil m³
+        WASTE_FIXED=BracketTable(values["WASTE_FIXED_EUR"], "grt_max", "fee", "marpol1", "marpol4", "marpol5"),
+    )
@@ -0,0 +1,267 @@
+"""
+Sürümlü tarife setleri - YAML'dan yükleme, derleme ve çalışırken değiştirme
+Her set yüklenirken bir kez derlenir (bracket tabloları) ve değişmez.
+Kayıt defteri dosya değişikliklerini kısa aralıklarla kontrol eder; yeni
+durum tek atamayla devreye girer. Hesap başında use_tariffs() ile sabitlenen
+set, hesap bitene kadar dosya değişse de aynı kalır.
+"""
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Optional
+
+from config.settings import TARIFF_DIR, TARIFF_RELOAD_SEC
+from config.tariff_files import tariff_files, load_tariff_file, TariffFileError
+from calculators.tables import compile_tables
+
+
+def _freeze(value):
+    """YAML değerini salt okunur yap: dict -> MappingProxy, list -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """_freeze'in tersi (pickle için: MappingProxy serileştirilemez)"""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _digest(version: str, values) -> str:
+    """Sürüm + tarife değerlerinin SHA-256'sı (aynı sürüm adıyla düzenlenen dosyada değişir)"""
+    text = json.dumps([version, _thaw(values)], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _restore(version, effective_from, effective_to, values, source, tables, digest) -> "TariffSet":
+    """Pickle'dan set: tablolar derlenmiş halde gelir, yeniden derlenmez"""
+    tariff_set = TariffSet.__new__(TariffSet)
+    tariff_set.__dict__.update(
+        version=version, effective_from=effective_from, effective_to=effective_to,
+        source=source, values=_freeze(values), tables=tables, digest=digest,
+    )
+    return tariff_set
+
+
+class TariffSet:
+    """
+    Tek tarife sürümü. Sabitlere öznitelik olarak erişilir
+    (ts.PILOTAGE_T11), derlenmiş tablolar ts.tables altındadır.
+    digest: sürüm ve değerlerin özeti; cache anahtarlarında sürüm adı yerine
+    kullanılır (dosya aynı sürüm adıyla düzenlenip yeniden yüklenebilir).
+    """
+
+    def __init__(self, version: str, effective_from: date, effective_to: Optional[date], values, source: str = ""):
+        self.version = version
+        self.effective_from = effective_from
+        self.effective_to = effective_to
+        self.source = source
+        self.values = _freeze(dict(values))
+        self.tables = compile_tables(self.values)
+        self.digest = _digest(version, self.values)
+
+    @classmethod
+    def from_file(cls, path) -> "TariffSet":
+        data = load_tariff_file(path)
+        return cls(data["version"], data["effective_from"], data["effective_to"], data["tariffs"], data["source"])
+
+    def __reduce__(self):
+        # İşçi süreçlerine derlenmiş tablolarla birlikte gönderilir
+        return _restore, (
+            self.version, self.effective_from, self.effective_to,
+            _thaw(self.values), self.source, self.tables, self.digest,
+        )
+
+    def covers(self, on: date) -> bool:
+        """Tarih bu setin geçerlilik aralığında mı"""
+        return self.effective_from <= on and (self.effective_to is None or on <= self.effective_to)
+
+    def __getattr__(self, name: str):
+        try:
+            return self.__dict__["values"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f"TariffSet({self.version!r}, {self.effective_from}..{self.effective_to or ''})"
+
+
+class _State:
+    """Kayıt defterinin değişmez anlık durumu (atomik olarak değiştirilir)"""
+    __slots__ = ("signature", "sets", "active", "active_day")
+
+    def __init__(self, signature: tuple, sets: tuple, active: TariffSet, active_day: date):
+        self.signature = signature
+        self.sets = sets
+        self.active = active
+        self.active_day = active_day
+
+
+def _select(sets, on: date) -> Optional[TariffSet]:
+    """Tarihi kapsayan setlerden en geç başlayanı"""
+    return max((s for s in sets if s.covers(on)), key=lambda s: s.effective_from, default=None)
+
+
+def tariff_for_date(sets, on: date) -> TariffSet:
+    """Setler içinden tarihte geçerli olan. Kapsayan set yoksa LookupError"""
+    found = _select(sets, on)
+    if found is None:
+        raise LookupError(f"{on} tarihinde geçerli tarife yok")
+    return found
+
+
+class TariffRegistry:
+    """
+    Dizindeki tarife dosyaları. active() bugün geçerli seti döner; en fazla
+    check_interval saniyede bir dosyaların mtime/boyut imzasına bakar ve
+    değişiklik varsa tüm setleri yeniden yükler. Hatalı dosyada önceki durum
+    korunur (last_error'da saklanır).
+    """
+
+    def __init__(self, directory=TARIFF_DIR, check_interval: float = TARIFF_RELOAD_SEC):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[TariffSet], None]] = []
+        self._checked_at = 0.0
+        self._state: Optional[_State] = None
+        self.reload(force=True)
+
+    def _signature(self) -> tuple:
+        signature = []
+        for path in tariff_files(self.directory):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def reload(self, force: bool = False) -> bool:
+        """Dosyalar değiştiyse (veya force) yeniden yükle. Yeni durum devreye girdiyse True"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._signature()
+            state = self._state
+            if state is not None and not force and signature == state.signature:
+                self.last_error = None
+                return False
+            try:
+                sets = tuple(TariffSet.from_file(self.directory / name) for name, _, _ in signature)
+            except TariffFileError as e:
+                if state is None:
+                    raise
+                self.last_error = str(e)
+                return False
+            if not sets:
+                if state is None:
+                    raise TariffFileError(f"{self.directory}: tarife dosyası yok")
+                self.last_error = f"{self.directory}: tarife dosyası yok"
+                return False
+            versions = [s.version for s in sets]
+            if len(set(versions)) != len(versions):
+                message = f"{self.directory}: aynı sürüm birden fazla dosyada"
+                if state is None:
+                    raise TariffFileError(message)
+                self.last_error = message
+                return False
+
+            today = date.today()
+            active = _select(sets, today) or max(sets, key=lambda s: s.effective_from)
+            self._state = _State(signature, sets, active, today)
+            self.last_error = None
+            listeners = list(self._listeners) + _RELOAD_LISTENERS
+
+        for listener in listeners:
+            listener(active)
+        return True
+
+    def _current_state(self) -> _State:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        state = self._state
+        today = date.today()
+        if state.active_day != today:
+            # Gün değişti: dosyalar aynı, geçerli set değişmiş olabilir
+            active = _select(state.sets, today) or state.active
+            state = _State(state.signature, state.sets, active, today)
+            self._state = state
+        return state
+
+    def active(self) -> TariffSet:
+        """Bugün geçerli tarife seti (kapsayan yoksa en son başlayan)"""
+        return self._current_state().active
+
+    def for_date(self, on: date) -> TariffSet:
+        """Tarihte geçerli set. Kapsayan set yoksa LookupError"""
+        return tariff_for_date(self._current_state().sets, on)
+
+    def get(self, version: str) -> TariffSet:
+        """Sürüm adıyla set. Yoksa LookupError"""
+        for tariff_set in self._current_state().sets:
+            if tariff_set.version == version:
+                return tariff_set
+        raise LookupError(f"Tarife sürümü bulunamadı: {version}")
+
+    def versions(self) -> list[TariffSet]:
+        """Yüklü setler (başlangıç tarihine göre)"""
+        return sorted(self._current_state().sets, key=lambda s: s.effective_from)
+
+    def add_listener(self, listener: Callable[[TariffSet], None]):
+        """Yeni durum devreye girdiğinde listener(aktif_set) çağrılır"""
+        with self._lock:
+            self._listeners.append(listener)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+_PINNED = ContextVar("pinned_tariffs", default=None)
+
+# Tüm kayıt defterlerinde yeni durum devreye girdiğinde çağrılır
+_RELOAD_LISTENERS: list[Callable[[TariffSet], None]] = []
+
+
+def add_reload_listener(listener: Callable[[TariffSet], None]):
+    """Kayıt defteri oluşturmadan dinleyici ekle (import sırasında dosya okunmaz)"""
+    _RELOAD_LISTENERS.append(listener)
+
+
+def registry() -> TariffRegistry:
+    """Süreç başına tarife kayıt defteri (TARIFF_DIR)"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = TariffRegistry()
+    return _registry
+
+
+def current_tariffs() -> TariffSet:
+    """use_tariffs() bloğunda sabitlenen set, yoksa bugün geçerli set"""
+    pinned = _PINNED.get()
+    return pinned if pinned is not None else registry().active()
+
+
+@contextmanager
+def use_tariffs(tariff_set: Optional[TariffSet] = None):
+    """Blok boyunca tek tarife seti kullan (varsayılan: şu an geçerli set)"""
+    tariff_set = tariff_set or current_tariffs()
+    token = _PINNED.set(tariff_set)
+    try:
+        yield tariff_set
+    finally:
+        _PINNED.reset(token)
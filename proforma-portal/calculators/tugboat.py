@@ -1,8 +1,9 @@
 """
 T.1.2 Römorkör Hizmetleri (USD)
 """
-from config.tariffs import TUGBOAT_T12
+from calculators.tariff_sets import current_tariffs
 from calculators.base import round_grt_up
+from utils.money import money_round
 
 
 def calc_tugboat(
@@ -17,10 +18,11 @@ def calc_tugboat(
     5000+ GRT ve 4 römorkör: +%30
     Hafta sonu/özel gün: +%50 (overtime_pct=50)
     """
-    if vessel_type not in TUGBOAT_T12:
+    t = current_tariffs()
+    if vessel_type not in t.TUGBOAT_T12:
         vessel_type = "diger_yuk"
 
-    rates = TUGBOAT_T12[vessel_type]
+    rates = t.TUGBOAT_T12[vessel_type]
     rounded = round_grt_up(grt)
 
     if rounded <= 1000:
@@ -34,4 +36,4 @@ def calc_tugboat(
     if overtime_pct > 0:
         fee *= (1 + overtime_pct / 100)
 
-    return round(fee, 2)
+    return money_round(fee)
@@ -0,0 +1,260 @@
+"""
+NumPy ile vektörel tarife hesapları - tüm filo tek geçişte
+Skaler calc_* fonksiyonlarıyla birebir aynı sonucu verir (aynı işlem sırası
+ve aynı round(..., 2) davranışı). Parametreler skaler veya dizi olabilir,
+NumPy broadcast kurallarıyla birleştirilir. tariffs verilmezse
+current_tariffs() kullanılır. exact=True verilirse tutar yuvarlanmaz
+(exact_money() içindeki calc_* karşılığı; calculators.fleet kullanır).
+"""
+import numpy as np
+
+from calculators.tariff_sets import current_tariffs
+
+
+def round2(values) -> np.ndarray:
+    """
+    Python round(x, 2) ile aynı sonuç.
+    np.round x*100 üzerinden yuvarlar; sadece yarım kuruşa çok yakın
+    değerlerde farklı sonuç verebilir, o elemanlar Python round ile düzeltilir.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        result = np.array(result, copy=True)
+        result[near_half] = [round(float(v), 2) for v in values[near_half]]
+    return result
+
+
+def round_grt_up(grt) -> np.ndarray:
+    """GRT'yi 1000'e yukarı yuvarla (<=0 ise 0) - base.round_grt_up karşılığı"""
+    grt = np.asarray(grt, dtype=np.float64)
+    return np.where(grt <= 0, 0.0, np.ceil(grt / 1000) * 1000)
+
+
+def _rates_by_type(table: dict, vessel_type, default: str = "diger_yuk") -> tuple[np.ndarray, np.ndarray]:
+    """Gemi tipi dizisinden (base_0_1000, per_1000) dizileri. Bilinmeyen tip -> default"""
+    types = np.asarray(vessel_type)
+    unique, inverse = np.unique(types, return_inverse=True)
+    rows = [table.get(str(t), table[default]) for t in unique]
+    base = np.array([r["base_0_1000"] for r in rows], dtype=np.float64)[inverse]
+    per_1000 = np.array([r["per_1000"] for r in rows], dtype=np.float64)[inverse]
+    return base.reshape(types.shape), per_1000.reshape(types.shape)
+
+
+def _grt_fee(grt, base, per_1000) -> tuple[np.ndarray, np.ndarray]:
+    """0-1000 GRT base + ilave beher 1000 GRT. (fee, rounded_grt) döner"""
+    rounded = round_grt_up(grt)
+    fee = np.where(rounded <= 1000, base, base + (rounded - 1000) / 1000 * per_1000)
+    return fee, rounded
+
+
+def _surcharge(fee, pct) -> np.ndarray:
+    """pct > 0 olan elemanlara (1 + pct/100) çarpanı"""
+    pct = np.asarray(pct, dtype=np.float64)
+    return np.where(pct > 0, fee * (1 + pct / 100), fee)
+
+
+def _result(values, exact: bool) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64) if exact else round2(values)
+
+
+def pilotage_t11(grt, vessel_type, tanker_surcharge_pct=0, tariffs=None, exact=False) -> np.ndarray:
+    """T.1.1 Liman içi kılavuzluk (USD) - calc_pilotage_t11 karşılığı"""
+    t = tariffs or current_tariffs()
+    base, per_1000 = _rates_by_type(t.PILOTAGE_T11, vessel_type)
+    fee, _ = _grt_fee(grt, base, per_1000)
+    return _result(_surcharge(fee, tanker_surcharge_pct), exact)
+
+
+def pilotage_t2(grt, service_key: str, tanker_surcharge_pct=0, tariffs=None, exact=False) -> np.ndarray:
+    """T.2 Liman dışı kılavuzluk (USD) - calc_pilotage_t2 karşılığı (bilinmeyen hizmet -> 0)"""
+    t = tariffs or current_tariffs()
+    rates = t.PILOTAGE_T2_SERVICES.get(service_key)
+    rounded = round_grt_up(grt)
+    if rates is None:
+        return np.zeros(rounded.shape)
+    extra_1000s = np.where(rounded <= 1000, 0.0, (rounded - 1000) / 1000)
+    fee = rates["base"] + extra_1000s * rates["per_1000"]
+    return _result(_surcharge(fee, tanker_surcharge_pct), exact)
+
+
+def port_pilotage(grt, vessel_type, port, tanker_surcharge_pct=0, tariffs=None, exact=False) -> np.ndarray:
+    """Porta göre kılavuzluk (USD): T.1.1 + İzmir'de T.2 izmir_demir - calc_port_pilotage karşılığı"""
+    fee = pilotage_t11(grt, vessel_type, tanker_surcharge_pct, tariffs, exact)
+    is_izmir = np.char.upper(np.asarray(port).astype(str)) == "IZMIR"
+    if is_izmir.any():
+        demir = pilotage_t2(grt, "izmir_demir", tanker_surcharge_pct, tariffs, exact)
+        fee = np.where(is_izmir, fee + demir, fee)
+    return _result(fee, exact)
+
+
+def tugboat(grt, vessel_type, four_tugs_surcharge=False, overtime_pct=0, tariffs=None, exact=False) -> np.ndarray:
+    """T.1.2 Römorkör (USD) - calc_tugboat karşılığı"""
+    t = tariffs or current_tariffs()
+    base, per_1000 = _rates_by_type(t.TUGBOAT_T12, vessel_type)
+    fee, rounded = _grt_fee(grt, base, per_1000)
+    four_tugs = np.asarray(four_tugs_surcharge, dtype=bool)
+    fee = np.where(four_tugs & (rounded >= 5000), fee * 1.30, fee)
+    return _result(_surcharge(fee, overtime_pct), exact)
+
+
+def mooring(grt, is_kabotaj, palamar_x2=False, overtime_pct=0, tariffs=None, exact=False) -> np.ndarray:
+    """T.1.3 Palamar (USD) - calc_mooring karşılığı"""
+    t = tariffs or current_tariffs()
+    is_kabotaj = np.asarray(is_kabotaj, dtype=bool)
+    kab, other = t.MOORING_T13["kabotaj"], t.MOORING_T13["diger_tum"]
+    base = np.where(is_kabotaj, kab["base_0_1000"], other["base_0_1000"])
+    per_1000 = np.where(is_kabotaj, kab["per_1000"], other["per_1000"])
+    fee, _ = _grt_fee(grt, base, per_1000)
+    fee = np.where(np.asarray(palamar_x2, dtype=bool), fee * 2, fee)
+    return _result(_surcharge(fee, overtime_pct), exact)
+
+
+def berthing(gt, days, is_turk_flag=False, is_cabotage=False, tariffs=None, exact=False) -> np.ndarray:
+    """Günlük barınma (USD) - calc_berthing karşılığı"""
+    t = tariffs or current_tariffs()
+    gt = np.asarray(gt, dtype=np.float64)
+    rounded = np.ceil(gt / 1000) * 1000
+    daily = np.where(
+        rounded <= 81000,
+        (rounded / 1000) * t.BERTHING_PER_1000_GT,
+        81 * t.BERTHING_PER_1000_GT + (rounded - 81000) / 1000 * t.BERTHING_PER_1000_GT,
+    )
+    daily = np.where(gt <= 500, t.BERTHING_BASE_500, daily)
+    total = daily * np.asarray(days, dtype=np.float64)
+
+    is_cabotage = np.asarray(is_cabotage, dtype=bool)
+    is_turk_flag = np.asarray(is_turk_flag, dtype=bool)
+    total = np.where(is_cabotage, total * 0.50, np.where(is_turk_flag, total * 0.75, total))
+    return _result(total, exact)
+
+
+def anchorage(grt, days, is_turk_flag, tariffs=None, exact=False) -> np.ndarray:
+    """Demirleme (USD) - calc_anchorage karşılığı"""
+    t = tariffs or current_tariffs()
+    rate = np.where(np.asarray(is_turk_flag, dtype=bool), t.ANCHORAGE_TR_RATE, t.ANCHORAGE_FOREIGN_RATE)
+    return _result(np.asarray(grt, dtype=np.float64) * rate * np.asarray(days, dtype=np.float64), exact)
+
+
+def bracket_lookup(table, values, key: str = None) -> np.ndarray:
+    """
+    BracketTable.lookup'ın dizi karşılığı - skaler hesaplayıcılarla aynı
+    derlenmiş tabloyu kullanır (bisect_left == searchsorted side="left").
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(table):
+        return np.zeros(values.shape)
+    bounds = np.frombuffer(table.bounds, dtype=np.float64)
+    idx = np.minimum(np.searchsorted(bounds, values, side="left"), len(bounds) - 1)
+    return np.asarray(table.columns[key or table.value_keys[0]], dtype=np.float64)[idx]
+
+
+def tl_to_usd(tl, usd_tl_rate, exact=False) -> np.ndarray:
+    """utils.exchange.tl_to_usd karşılığı (kur <= 0 ise 0)"""
+    rate = np.asarray(usd_tl_rate, dtype=np.float64)
+    safe = np.where(rate > 0, rate, 1.0)
+    return np.where(rate > 0, _result(np.asarray(tl, dtype=np.float64) / safe, exact), 0.0)
+
+
+def agency_fee(nrt, berth_days=7, tariffs=None, exact=False) -> np.ndarray:
+    """Acentelik ücreti (Euro) - calc_agency_fee karşılığı (özel hizmet / indirim yok)"""
+    t = tariffs or current_tariffs()
+    nrt = np.asarray(nrt, dtype=np.float64)
+    days = np.asarray(berth_days, dtype=np.float64)
+    fee = bracket_lookup(t.tables.AGENCY_BASE, nrt)
+    extra = np.ceil((nrt - 10000) / 1000) * bracket_lookup(t.tables.AGENCY_EXTRA, nrt)
+    fee = np.where(nrt > 10000, fee + extra, fee)
+    # 7 günden fazla: her 5 gün +%20
+    periods = np.ceil((days - 7) / 5)
+    fee = np.where(days > 7, fee + fee * 0.20 * periods, fee)
+    return _result(fee, exact)
+
+
+def protective_agency(nrt, tariffs=None) -> np.ndarray:
+    """Tarife 2 koruyucu acentelik (Euro) - calc_protective_agency_fee karşılığı"""
+    t = tariffs or current_tariffs()
+    nrt = np.asarray(nrt, dtype=np.float64)
+    fee = bracket_lookup(t.tables.PROTECTIVE_BASE, nrt)
+    extra = np.ceil((nrt - 10000) / 1000) * bracket_lookup(t.tables.PROTECTIVE_EXTRA, nrt)
+    return round2(np.where(nrt > 10000, fee + extra, fee))
+
+
+def spare_parts(weight_kg, tariffs=None) -> np.ndarray:
+    """Yedek parça teslimi (Euro) - calc_spare_parts karşılığı"""
+    t = tariffs or current_tariffs()
+    kg = np.asarray(weight_kg, dtype=np.float64)
+    fee = np.minimum(np.maximum(kg * t.SPARE_PARTS_PER_KG_EUR, t.SPARE_PARTS_MIN_EUR), t.SPARE_PARTS_MAX_EUR)
+    return np.where(kg > 0, round2(fee), 0.0)
+
+
+def bunker_supervision(operations, tariffs=None) -> np.ndarray:
+    """Bunker gözetimi (Euro) - calc_bunker_supervision karşılığı"""
+    t = tariffs or current_tariffs()
+    return round2(np.maximum(np.asarray(operations, dtype=np.float64), 0) * t.BUNKER_SUPERVISION_EUR)
+
+
+def crew_change(persons, tariffs=None) -> np.ndarray:
+    """Mürettebat katılma / ayrılma (Euro) - calc_crew_change karşılığı"""
+    t = tariffs or current_tariffs()
+    persons = np.asarray(persons, dtype=np.float64)
+    fee = t.PERSON_JOIN_LEAVE_1_2_EUR + np.maximum(persons - 2, 0) * t.PERSON_JOIN_LEAVE_EXTRA_EUR
+    return np.where(persons > 0, round2(fee), 0.0)
+
+
+def medical(patients, tariffs=None) -> np.ndarray:
+    """Doktor / hastane refakati (Euro) - calc_medical karşılığı"""
+    t = tariffs or current_tariffs()
+    return round2(np.maximum(np.asarray(patients, dtype=np.float64), 0) * t.MEDICAL_PER_PATIENT_EUR)
+
+
+def captain_advance(amount_eur, tariffs=None) -> np.ndarray:
+    """Kaptana avans komisyonu (Euro) - calc_captain_advance karşılığı"""
+    t = tariffs or current_tariffs()
+    amount = np.asarray(amount_eur, dtype=np.float64)
+    fee = np.maximum(amount * t.CAPTAIN_ADVANCE_PCT, t.CAPTAIN_ADVANCE_MIN_EUR)
+    return np.where(amount > 0, round2(fee), 0.0)
+
+
+def transit_visa(persons, usd_tl_rate, tariffs=None) -> np.ndarray:
+    """Transit vize harcı (USD), kişi sayısıyla - calc_transit_visa x kişi karşılığı"""
+    t = tariffs or current_tariffs()
+    return tl_to_usd(t.TRANSIT_VISA_TL, usd_tl_rate) * np.asarray(persons, dtype=np.float64)
+
+
+def waste_extra(marpol1_slop_m3, marpol1_bilge_m3, marpol4_m3, marpol5_m3, grt, is_weekend=False,
+                tariffs=None) -> np.ndarray:
+    """Dahil m³'ü aşan atık (Euro) - calc_waste_extra karşılığı"""
+    t = tariffs or current_tariffs()
+    weekend = np.asarray(is_weekend, dtype=bool)
+
+    def rate(name):
+        return np.where(weekend, t.WASTE_EXTRA_EUR_M3_WEEKEND[name], t.WASTE_EXTRA_EUR_M3_WEEKDAY[name])
+
+    table = t.tables.WASTE_FIXED
+    extra = np.maximum(np.asarray(marpol1_slop_m3, dtype=np.float64), 0) * rate("marpol1_slop")
+    for m3, key, name in (
+        (marpol1_bilge_m3, "marpol1", "marpol1_bilge"),
+        (marpol4_m3, "marpol4", "marpol4"),
+        (marpol5_m3, "marpol5", "marpol5"),
+    ):
+        included = bracket_lookup(table, grt, key)
+        extra = extra + np.maximum(np.asarray(m3, dtype=np.float64) - included, 0) * rate(name)
+    return round2(extra)
+
+
+def auto_service(grt, tariffs=None) -> np.ndarray:
+    """Oto servis (USD) - calc_auto_service karşılığı"""
+    t = tariffs or current_tariffs()
+    return round2(np.asarray(grt, dtype=np.float64) * t.AUTO_SERVICE_PER_GRT_USD)
+
+
+def stamp_duties(usd_tl_rate, tariffs=None) -> np.ndarray:
+    """Damga pulu kalemlerinin toplamı (USD) - calc_stamp_duties değerlerinin toplamı"""
+    t = tariffs or current_tariffs()
+    return (
+        tl_to_usd(t.STAMP_SUMMARY_TL, usd_tl_rate)
+        + tl_to_usd(t.STAMP_ORDINO_TL, usd_tl_rate)
+        + tl_to_usd(t.STAMP_PORT_REQUEST_TL, usd_tl_rate)
+    )
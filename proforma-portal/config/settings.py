@@ -2,6 +2,7 @@
 Proforma Portal - Port ve genel ayarlar
 Port bazlı farklar: İzmir, Tekirdağ, Aliaga, Mersin
 """
+import os
 
 PORTS = ["TEKIRDAG", "IZMIR", "ALIAGA", "MERSIN"]
 
@@ -38,3 +39,71 @@ PORT_SPECIFIC = {
     },
     "MERSIN": {},
 }
+
+# Varsayılan kurlar (form ve toplu fiyatlama için)
+DEFAULT_USD_EUR_RATE = 1.1801
+DEFAULT_USD_TL_RATE = 34.50
+
+# SQLite bağlantı havuzu boyutu (süreç başına, veritabanı başına)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+
+# bcrypt iş faktörü (cost) ve hash işçi sayısı
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Kur kaynağı: date,usd_eur,usd_tl başlıklı CSV (yoksa varsayılan kurlar) ve cache süresi
+RATES_CSV_PATH = os.getenv("RATES_CSV", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "rates.csv"))
+RATES_TTL_SEC = float(os.getenv("RATES_TTL_SEC", "300"))
+
+# Gemi bazlı tarife sonuçları için LRU cache boyutu (fonksiyon başına kayıt)
+TARIFF_MEMO_SIZE = int(os.getenv("TARIFF_MEMO_SIZE", "4096"))
+
+# Sürümlü tarife YAML dizini ve değişiklik kontrol aralığı (saniye)
+TARIFF_DIR = os.getenv("TARIFF_DIR", os.path.join(os.path.dirname(__file__), "tariff_sets"))
+TARIFF_RELOAD_SEC = float(os.getenv("TARIFF_RELOAD_SEC", "2"))
+
+# Toplu fiyatlama (python -m batch): işçi süreç sayısı ve parça boyutu
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "1"))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "500"))
+
+# Sayfa süre bütçeleri (python -m utils.startup_budget): soğuk açılış, sıcak tekrar, kayıt turu (ms)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1000"))
+RERUN_BUDGET_MS = float(os.getenv("RERUN_BUDGET_MS", "100"))
+SUBMIT_BUDGET_MS = float(os.getenv("SUBMIT_BUDGET_MS", "1500"))
+
+# Performans ölçümleri (python -m benchmarks): temel ölçüme göre izin verilen yavaşlama (%)
+BENCH_REGRESSION_PCT = float(os.getenv("BENCH_REGRESSION_PCT", "15"))
+
+# Süreç içi metrikler: hesaplayıcı / kur / DB / kalem süre ölçümü açık mı (1/0)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+
+# Yönetici e-postaları (virgülle ayrılmış): Sistem Metrikleri sayfasına erişim
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+# Profil çıkarma: "cprofile" / "sampling" ise her toplu iş profillenir ve sayfadaki profil isteğinin
+# varsayılan modu olur (boş: toplu işte kapalı). PROFILE_KEEP: PROFILE_DIR'de tutulan son profil sayısı
+PROFILE_MODE = os.getenv("PROFILE_MODE", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+
+# Teklif API'si (python -m api): adres, işçi süreç sayısı (0: süreç içi tek thread)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8600"))
+API_WORKERS = int(os.getenv("API_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Mikro toplama: parça başına en fazla teklif ve bekleme penceresi (ms)
+API_BATCH_MAX = int(os.getenv("API_BATCH_MAX", "64"))
+API_BATCH_WAIT_MS = float(os.getenv("API_BATCH_WAIT_MS", "2"))
+# Sınırlar: aynı anda hesaplanan parça (0: işçi x 2), bekleyen teklif, istek başına teklif, gövde boyutu
+API_MAX_INFLIGHT = int(os.getenv("API_MAX_INFLIGHT", "0"))
+API_MAX_PENDING = int(os.getenv("API_MAX_PENDING", "20000"))
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "5000"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(8 * 1024 * 1024)))
+API_IDLE_TIMEOUT_SEC = float(os.getenv("API_IDLE_TIMEOUT_SEC", "30"))
+
+# Proforma sonuç cache'i (aynı girdi + tarife + kur): bellek sınırı MB (0: kapalı),
+# süreçler arası paylaşılan SQLite dosyası (boş: yok) ve dosyadaki en fazla satır
+RESULT_CACHE_MB = float(os.getenv("RESULT_CACHE_MB", "32"))
+RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB", "")
+RESULT_CACHE_DB_ROWS = int(os.getenv("RESULT_CACHE_DB_ROWS", "200000"))
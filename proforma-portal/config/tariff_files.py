@@ -0,0 +1,104 @@
+"""
+Sürümlü tarife dosyaları (YAML) - okuma ve doğrulama
+Her dosya bir tarife setidir: version, effective_from, effective_to (null =
+açık uçlu) ve tariffs altında config.tariffs'taki sabit adları.
+"""
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+from config.settings import TARIFF_DIR
+
+# Her tarife setinde bulunması zorunlu sabitler
+REQUIRED_KEYS = (
+    "AGENCY_BASE_FEES", "AGENCY_EXTRA_OVER_10K",
+    "PROTECTIVE_AGENCY_BASE", "PROTECTIVE_AGENCY_EXTRA_OVER_10K",
+    "PILOTAGE_T11", "TUGBOAT_T12", "MOORING_T13", "PILOTAGE_T2_SERVICES",
+    "BERTHING_BASE_500", "BERTHING_PER_1000_GT", "BERTHING_CAP_AT_81K",
+    "LCB_NRT_TL", "LCB_OVERTIME_TL", "SAHIL_SAGLIK_PER_NRT_TL", "LIMAN_HIZMET_GT_TL",
+    "CUSTOMS_IMPORT_TL", "CUSTOMS_EXPORT_TL", "CHAMBER_FREIGHT_USD",
+    "STAMP_SUMMARY_TL", "STAMP_ORDINO_TL", "STAMP_PORT_REQUEST_TL",
+    "IZMIR_YOLLUK_TL", "IZMIR_MOTOR_USD", "ALIAGA_MUHAFAZA_TL", "ALIAGA_MUHAFAZA_X2",
+    "ALIAGA_YOLLUK_TL", "TRANSIT_VISA_TL", "AUTO_SERVICE_PER_GRT_USD",
+    "WASTE_FIXED_EUR", "WASTE_EXTRA_EUR_M3_WEEKDAY", "WASTE_EXTRA_EUR_M3_WEEKEND",
+    "GARBAGE_FIXED_EUR", "ANCHORAGE_TR_RATE", "ANCHORAGE_FOREIGN_RATE",
+    "SPARE_PARTS_PER_KG_EUR", "SPARE_PARTS_MIN_EUR", "SPARE_PARTS_MAX_EUR",
+    "BUNKER_SUPERVISION_EUR", "PERSON_JOIN_LEAVE_1_2_EUR", "PERSON_JOIN_LEAVE_EXTRA_EUR",
+    "MEDICAL_PER_PATIENT_EUR", "CAPTAIN_ADVANCE_PCT", "CAPTAIN_ADVANCE_MIN_EUR",
+    "MOTORBOAT_USD", "MOTORBOAT_IZMIR_USD", "VOA_UNDER_5000_EUR", "VOA_OVER_5000_EUR",
+    "SUPERVISION_CENTY_RATE", "SUPERVISION_GOPROZ_RATE", "CHAMBER_SHIPPING_FEE_USD",
+    "MARITIME_ASSOC_EUR", "FACILITIES_EUR", "TRANSPORTATION_EUR", "FISCAL_NOTARY_EUR",
+    "COMMUNICATION_STAMP_EUR", "LIGHT_DUES_USD",
+)
+
+
+class TariffFileError(ValueError):
+    """Tarife dosyası okunamadı veya eksik/hatalı"""
+
+
+def tariff_files(directory=None) -> list[Path]:
+    """Dizindeki tarife dosyaları (ada göre sıralı)"""
+    directory = Path(directory or TARIFF_DIR)
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.iterdir() if p.suffix in (".yaml", ".yml"))
+
+
+def _as_date(value, field: str, path: Path) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise TariffFileError(f"{path.name}: {field} tarih değil: {value!r}")
+
+
+def load_tariff_file(path) -> dict:
+    """
+    YAML tarife dosyasını oku ve doğrula.
+    {"version", "effective_from", "effective_to", "source", "tariffs"} döner.
+    """
+    path = Path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise TariffFileError(f"{path.name}: okunamadı ({e})")
+
+    if not isinstance(data, dict) or not isinstance(data.get("tariffs"), dict):
+        raise TariffFileError(f"{path.name}: 'tariffs' bölümü yok")
+    version = data.get("version")
+    if not version:
+        raise TariffFileError(f"{path.name}: 'version' zorunlu")
+
+    effective_from = _as_date(data.get("effective_from"), "effective_from", path)
+    effective_to = _as_date(data.get("effective_to"), "effective_to", path)
+    if effective_from is None:
+        raise TariffFileError(f"{path.name}: 'effective_from' zorunlu")
+    if effective_to is not None and effective_to < effective_from:
+        raise TariffFileError(f"{path.name}: effective_to, effective_from'dan önce")
+
+    missing = [key for key in REQUIRED_KEYS if key not in data["tariffs"]]
+    if missing:
+        raise TariffFileError(f"{path.name}: eksik tarifeler: {', '.join(missing)}")
+
+    return {
+        "version": str(version),
+        "effective_from": effective_from,
+        "effective_to": effective_to,
+        "source": str(path),
+        "tariffs": data["tariffs"],
+    }
+
+
+def effective_on(sets: list[dict], on: date) -> Optional[dict]:
+    """Tarihte geçerli set: aralığı kapsayanlar içinde en geç başlayan. Yoksa None"""
+    covering = [
+        s for s in sets
+        if s["effective_from"] <= on and (s["effective_to"] is None or on <= s["effective_to"])
+    ]
+    return max(covering, key=lambda s: s["effective_from"], default=None)
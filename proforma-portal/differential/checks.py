@@ -0,0 +1,324 @@
+"""
+Karşılaştırılan uygulamalar - her kontrol bir referans ve adaylardan oluşur
+Referans bugünkü skaler calc_* fonksiyonu (veya ProformaEngine.compute);
+adaylar aynı sonucu vermesi gereken hızlı yollardır: calculators.vectorized,
+calculators.memo cache'i, calculators.fleet, artımlı hesap, senaryo matrisi.
+Sonuçlar kuruşa (ROUND_HALF_UP) çevrilip anahtar anahtar karşılaştırılır.
+Adayı olmayan kontroller sadece golden corpus'a karşı doğrulanır.
+"""
+from dataclasses import dataclass, replace
+from decimal import ROUND_HALF_UP
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from config.settings import PORTS
+from calculators import agency, anchorage, berthing, fleet, harbour, memo, mooring, other, pilotage, tugboat, vectorized
+from calculators import waste
+from calculators.engine import SERVICE_NODES, Options, Proforma, ProformaEngine, Rates
+from calculators.incremental import IncrementalProforma
+from calculators.result_cache import ResultCache
+from calculators.tariff_sets import current_tariffs
+from batch.records import to_port_call
+from differential.inputs import SERVICE_FIELDS
+from utils.money import CENT, Money, to_decimal
+
+_RATES = Rates(usd_eur=1.1801, usd_tl=34.5)
+
+_SERVICE_CODES = frozenset(node.code for node in SERVICE_NODES)
+
+CALL_FIELDS = (
+    "port", "nrt", "grt", "gt", "vessel_type", "is_turk_flag", "purpose", "cargo_mt", "berth_days",
+    "anchorage_days", "overtime", "tanker", "four_tugs", "usd_eur", "usd_tl",
+) + SERVICE_FIELDS
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """Aday uygulama: run(durumlar) -> sonuçlar; project referansın karşılaştırılan kısmı"""
+    name: str
+    run: Callable[[list[dict]], list]
+    project: Optional[Callable[[dict], dict]] = None
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    fields: tuple[str, ...]
+    reference: Callable[[dict], Any]
+    candidates: tuple[Candidate, ...] = ()
+    exact: bool = False     # exact_money() içinde (ara yuvarlama yok)
+
+
+def cents(value) -> dict[str, Optional[int]]:
+    """Sonucu karşılaştırılabilir biçime çevir: anahtar -> kuruş (kalem yoksa None)"""
+    if isinstance(value, dict):
+        return {str(k): _cent(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return {str(i): _cent(v) for i, v in enumerate(value)}
+    return {"": _cent(value)}
+
+
+def _cent(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, Money):
+        return value.minor
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return int(to_decimal(value).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def _scalar(fn: Callable[[dict], Any]) -> Callable[[list[dict]], list]:
+    return lambda cases: [fn(c) for c in cases]
+
+
+def _vector(fn: Callable[[dict], np.ndarray], fields: Sequence[str]) -> Callable[[list[dict]], list]:
+    def run(cases: list[dict]) -> list:
+        columns = {name: np.array([c[name] for c in cases]) for name in fields}
+        return np.broadcast_to(fn(columns), (len(cases),)).tolist()
+    return run
+
+
+def _function_check(name, fields, reference, vector=None, memoized=None, exact=False) -> Check:
+    candidates = []
+    if vector is not None:
+        candidates.append(Candidate("vectorized", _vector(vector, fields)))
+    if memoized is not None:
+        candidates.append(Candidate("memo", _scalar(memoized)))
+    return Check(name, tuple(fields), reference, tuple(candidates), exact)
+
+
+def _function_checks() -> list[Check]:
+    v = vectorized
+    checks = [
+        _function_check(
+            "pilotage_t11", ("grt", "vessel_type", "tanker_pct"),
+            lambda c: pilotage.calc_pilotage_t11(c["grt"], c["vessel_type"], c["tanker_pct"]),
+            vector=lambda c: v.pilotage_t11(c["grt"], c["vessel_type"], c["tanker_pct"]),
+            memoized=lambda c: memo.pilotage_t11(c["grt"], c["vessel_type"], c["tanker_pct"]),
+        ),
+        _function_check(
+            "pilotage_t2", ("grt", "service_key", "tanker_pct"),
+            lambda c: pilotage.calc_pilotage_t2(c["grt"], c["service_key"], c["tanker_pct"]),
+        ),
+        _function_check(
+            "port_pilotage", ("grt", "vessel_type", "port", "tanker_pct"),
+            lambda c: pilotage.calc_port_pilotage(c["grt"], c["vessel_type"], c["port"], c["tanker_pct"]),
+            vector=lambda c: v.port_pilotage(c["grt"], c["vessel_type"], c["port"], c["tanker_pct"]),
+            memoized=lambda c: memo.port_pilotage(c["grt"], c["vessel_type"], c["port"], c["tanker_pct"]),
+        ),
+        _function_check(
+            "tugboat", ("grt", "vessel_type", "four_tugs", "overtime_pct"),
+            lambda c: tugboat.calc_tugboat(c["grt"], c["vessel_type"], c["four_tugs"], c["overtime_pct"]),
+            vector=lambda c: v.tugboat(c["grt"], c["vessel_type"], c["four_tugs"], c["overtime_pct"]),
+            memoized=lambda c: memo.tugboat_fee(c["grt"], c["vessel_type"], c["four_tugs"], c["overtime_pct"]),
+        ),
+        _function_check(
+            "mooring", ("grt", "is_kabotaj", "palamar_x2", "overtime_pct"),
+            lambda c: mooring.calc_mooring(c["grt"], c["is_kabotaj"], c["palamar_x2"], c["overtime_pct"]),
+            vector=lambda c: v.mooring(c["grt"], c["is_kabotaj"], c["palamar_x2"], c["overtime_pct"]),
+            memoized=lambda c: memo.mooring_fee(c["grt"], c["is_kabotaj"], c["palamar_x2"], c["overtime_pct"]),
+        ),
+        _function_check(
+            "berthing", ("gt", "berth_days", "is_turk_flag", "is_kabotaj"),
+            lambda c: berthing.calc_berthing(c["gt"], c["berth_days"], c["is_turk_flag"], c["is_kabotaj"]),
+            vector=lambda c: v.berthing(c["gt"], c["berth_days"], c["is_turk_flag"], c["is_kabotaj"]),
+        ),
+        _function_check(
+            "anchorage", ("grt", "anchorage_days", "is_turk_flag"),
+            lambda c: anchorage.calc_anchorage(c["grt"], c["anchorage_days"], c["is_turk_flag"]),
+            vector=lambda c: v.anchorage(c["grt"], c["anchorage_days"], c["is_turk_flag"]),
+        ),
+        _function_check(
+            "agency_fee", ("nrt", "berth_days"),
+            lambda c: agency.calc_agency_fee(c["nrt"], c["berth_days"]),
+            vector=lambda c: v.agency_fee(c["nrt"], c["berth_days"]),
+        ),
+        _function_check(
+            "protective_agency", ("nrt",),
+            lambda c: agency.calc_protective_agency_fee(c["nrt"]),
+            vector=lambda c: v.protective_agency(c["nrt"]),
+        ),
+        _function_check(
+            "lcb", ("nrt", "usd_tl", "overtime"),
+            lambda c: harbour.calc_lcb(c["nrt"], c["usd_tl"], c["overtime"]),
+            memoized=lambda c: memo.lcb_fee(c["nrt"], c["usd_tl"], c["overtime"]),
+        ),
+        _function_check(
+            "sahil_saglik", ("nrt", "usd_tl"), lambda c: harbour.calc_sahil_saglik(c["nrt"], c["usd_tl"]),
+        ),
+        _function_check(
+            "liman_hizmet", ("gt", "is_turk_flag", "usd_tl"),
+            lambda c: harbour.calc_liman_hizmet(c["gt"], c["is_turk_flag"], c["usd_tl"]),
+        ),
+        _function_check(
+            "customs_overtime", ("cargo_mt", "is_import", "usd_tl"),
+            lambda c: harbour.calc_customs_overtime(c["cargo_mt"], c["is_import"], c["usd_tl"]),
+        ),
+        _function_check(
+            "chamber_freight", ("cargo_mt", "is_turk_flag"),
+            lambda c: harbour.calc_chamber_freight(c["cargo_mt"], c["is_turk_flag"]),
+        ),
+        _function_check(
+            "supervision", ("cargo_mt", "is_kabotaj"),
+            lambda c: other.calc_supervision(c["cargo_mt"], is_domestic=c["is_kabotaj"]),
+        ),
+        _function_check("waste_fixed", ("grt",), lambda c: waste.calc_waste_fixed(c["grt"])),
+        _function_check(
+            "waste_extra",
+            ("waste_marpol1_slop_m3", "waste_marpol1_bilge_m3", "waste_marpol4_m3", "waste_marpol5_m3", "grt", "is_weekend"),
+            lambda c: waste.calc_waste_extra(
+                c["waste_marpol1_slop_m3"], c["waste_marpol1_bilge_m3"], c["waste_marpol4_m3"], c["waste_marpol5_m3"],
+                c["grt"], c["is_weekend"],
+            ),
+            vector=lambda c: v.waste_extra(
+                c["waste_marpol1_slop_m3"], c["waste_marpol1_bilge_m3"], c["waste_marpol4_m3"], c["waste_marpol5_m3"],
+                c["grt"], c["is_weekend"],
+            ),
+        ),
+        _function_check(
+            "spare_parts", ("spare_parts_kg",), lambda c: other.calc_spare_parts(c["spare_parts_kg"]),
+            vector=lambda c: v.spare_parts(c["spare_parts_kg"]),
+        ),
+        _function_check(
+            "bunker_supervision", ("bunker_operations",),
+            lambda c: other.calc_bunker_supervision(c["bunker_operations"]),
+            vector=lambda c: v.bunker_supervision(c["bunker_operations"]),
+        ),
+        _function_check(
+            "crew_change", ("crew_change_persons",), lambda c: other.calc_crew_change(c["crew_change_persons"]),
+            vector=lambda c: v.crew_change(c["crew_change_persons"]),
+        ),
+        _function_check(
+            "medical", ("medical_patients",), lambda c: other.calc_medical(c["medical_patients"]),
+            vector=lambda c: v.medical(c["medical_patients"]),
+        ),
+        _function_check(
+            "captain_advance", ("captain_advance_eur",),
+            lambda c: other.calc_captain_advance(c["captain_advance_eur"]),
+            vector=lambda c: v.captain_advance(c["captain_advance_eur"]),
+        ),
+        _function_check(
+            "transit_visa", ("transit_visa_persons", "usd_tl"),
+            lambda c: harbour.calc_transit_visa(c["usd_tl"]) * c["transit_visa_persons"],
+            vector=lambda c: v.transit_visa(c["transit_visa_persons"], c["usd_tl"]),
+        ),
+        _function_check(
+            "auto_service", ("grt",), lambda c: harbour.calc_auto_service(c["grt"]),
+            vector=lambda c: v.auto_service(c["grt"]),
+        ),
+        _function_check(
+            "stamp_duties", ("usd_tl",), lambda c: sum(harbour.calc_stamp_duties(c["usd_tl"]).values()),
+            vector=lambda c: v.stamp_duties(c["usd_tl"]),
+        ),
+        _function_check("aliaga_guards", ("usd_tl",), lambda c: harbour.calc_aliaga_guards(c["usd_tl"])),
+        _function_check("izmir_yolluk", ("usd_tl",), lambda c: harbour.calc_izmir_yolluk(c["usd_tl"])),
+        _function_check("motorboat", ("port",), lambda c: other.calc_motorboat(c["port"])),
+    ]
+    # calculators.fleet'in kullandığı yuvarlamasız vektörel yollar (exact=True)
+    exact_vectors = {
+        "port_pilotage": lambda c: v.port_pilotage(c["grt"], c["vessel_type"], c["port"], c["tanker_pct"], exact=True),
+        "tugboat": lambda c: v.tugboat(c["grt"], c["vessel_type"], c["four_tugs"], c["overtime_pct"], exact=True),
+        "mooring": lambda c: v.mooring(c["grt"], c["is_kabotaj"], c["palamar_x2"], c["overtime_pct"], exact=True),
+        "berthing": lambda c: v.berthing(c["gt"], c["berth_days"], c["is_turk_flag"], c["is_kabotaj"], exact=True),
+        "anchorage": lambda c: v.anchorage(c["grt"], c["anchorage_days"], c["is_turk_flag"], exact=True),
+        "agency_fee": lambda c: v.agency_fee(c["nrt"], c["berth_days"], exact=True),
+    }
+    # Motorun kullandığı memo'lu fonksiyonlar exact modda da (anahtar moda göre ayrılır)
+    for check in list(checks):
+        candidates = tuple(candidate for candidate in check.candidates if candidate.name == "memo")
+        if check.name in exact_vectors:
+            candidates += (Candidate("vectorized", _vector(exact_vectors[check.name], check.fields)),)
+        if candidates:
+            checks.append(replace(check, name=check.name + ".exact", candidates=candidates, exact=True))
+    return checks
+
+
+def _bracket_check() -> Check:
+    """Her derlenmiş tablonun her sütunu: BracketTable.lookup <-> vectorized.bracket_lookup"""
+    def tables():
+        tb = current_tariffs().tables
+        return [(name, table, key) for name, table in vars(tb).items() for key in table.value_keys]
+
+    def reference(c: dict) -> dict:
+        return {f"{name}.{key}": table.lookup(c["bracket_value"], key) for name, table, key in tables()}
+
+    def vector(cases: list[dict]) -> list:
+        values = np.array([c["bracket_value"] for c in cases], dtype=np.float64)
+        columns = {f"{name}.{key}": vectorized.bracket_lookup(table, values, key) for name, table, key in tables()}
+        return [{k: column[i] for k, column in columns.items()} for i in range(len(cases))]
+
+    return Check("bracket_lookup", ("bracket_value",), reference, (Candidate("vectorized", vector),))
+
+
+def _call(case: dict):
+    return to_port_call({"vessel_name": "MV DIFF", **case}, _RATES)
+
+
+def _lines(proforma: Proforma) -> dict:
+    out = {}
+    for line in proforma.lines:
+        out[line.code + ".usd"] = line.usd
+        out[line.code + ".eur"] = line.eur
+    return out
+
+
+def _fleet(cases: list[dict]) -> list:
+    inputs = {name: np.array([c[name] for c in cases]) for name in fleet.INPUT_COLUMNS}
+    lines = fleet.price_lines(inputs)
+    return [{code + ".usd": column[i] for code, column in lines.items()} for i in range(len(cases))]
+
+
+def _fleet_project(reference: dict) -> dict:
+    """fleet sadece USD ve opsiyonel hizmetler hariç kalemleri verir"""
+    return {k: v for k, v in reference.items() if k.endswith(".usd") and k[:-4] not in _SERVICE_CODES}
+
+
+def _incremental(cases: list[dict]) -> list:
+    # Durumlar rastgele yürüyüş: her adım öncekinden birkaç alan farklı
+    incremental = IncrementalProforma(ProformaEngine())
+    return [_lines(incremental.update(_call(c))) for c in cases]
+
+
+def _scenarios(cases: list[dict]) -> list:
+    # Her uğrama farklı liman / seçeneklerle başlayan bir senaryo matrisinin varyantı olarak
+    engine = ProformaEngine()
+    results = []
+    for i, c in enumerate(cases):
+        call = _call(c)
+        start = replace(call, port=PORTS[(PORTS.index(call.port) + 1 + i) % len(PORTS)],
+                        options=Options(overtime=not call.options.overtime, tanker=i % 2 == 0))
+        results.append(_lines(engine.compute_scenarios(start, [(call.port, call.options)])[0]))
+    return results
+
+
+def _result_cache(cases: list[dict]) -> list:
+    # İkinci tur tamamen cache'ten: kayıt / geri okuma kuruş kaybetmemeli
+    engine = ProformaEngine(cache=ResultCache(256 << 20))
+    calls = [_call(c) for c in cases]
+    for call in calls:
+        engine.compute(call)
+    return [_lines(engine.compute(call)) for call in calls]
+
+
+def _proforma_check() -> Check:
+    engine = ProformaEngine()
+    return Check(
+        "proforma",
+        CALL_FIELDS,
+        lambda c: _lines(engine.compute(_call(c))),
+        (
+            Candidate("fleet", _fleet, _fleet_project),
+            Candidate("incremental", _incremental),
+            Candidate("scenarios", _scenarios),
+            Candidate("cold_engine", _scalar(lambda c: _lines(ProformaEngine().compute(_call(c))))),
+            Candidate("result_cache", _result_cache),
+        ),
+        exact=True,
+    )
+
+
+def all_checks() -> list[Check]:
+    return _function_checks() + [_bracket_check(), _proforma_check()]
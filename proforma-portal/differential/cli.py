@@ -0,0 +1,123 @@
+"""
+Fark testi komutu - hızlı yollar bugünkü hesaplayıcılarla kuruşu kuruşuna aynı mı
+  python -m differential                         # tüm kontroller + golden corpus
+  python -m differential proforma berthing --cases 20000 --seed 3
+  python -m differential --record                # golden corpus'u yeniden kaydet
+Her kontrol için sınır odaklı durumlar üretilir, referans ve tüm adaylar
+çalıştırılır; tek kuruşluk fark bile hatadır (çıkış kodu 1). Golden corpus
+varsa referans kayıttaki tarife sürümüyle tekrar çalıştırılıp kayıtla
+karşılaştırılır (hesaplayıcıdaki istenmeyen değişiklikleri yakalar).
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
+
+from calculators.tariff_sets import current_tariffs, registry, use_tariffs
+from differential.checks import Check, all_checks, cents
+from differential.corpus import GOLDEN_DIR, read_corpus, write_corpus
+from differential.inputs import generate
+from utils.money import exact_money
+
+
+def _reference(check: Check, cases: list[dict]) -> list[dict]:
+    with exact_money() if check.exact else nullcontext():
+        return [cents(check.reference(c)) for c in cases]
+
+
+def _diverging(cases: list[dict], expected: list[dict], actual: list[dict], project=None) -> list[dict]:
+    """Kuruş farkı olan durumlar: girdi, anahtar, beklenen, bulunan"""
+    found = []
+    for case, want, got in zip(cases, expected, actual):
+        want = project(want) if project else want
+        for key in want.keys() | got.keys():
+            if want.get(key) != got.get(key):
+                found.append({"in": case, "key": key, "expected": want.get(key), "actual": got.get(key)})
+    return found
+
+
+def run_check(check: Check, n: int, seed: int, corpus_dir: Path, record: bool) -> dict:
+    """Kontrolü çalıştır: aday başına ve golden için fark listesi"""
+    result = {"check": check.name, "divergences": {}}
+    with use_tariffs():
+        cases = generate(check.fields, n, seed)
+        expected = _reference(check, cases)
+        result["cases"] = len(cases)
+        for candidate in check.candidates:
+            with exact_money() if check.exact else nullcontext():
+                actual = [cents(value) for value in candidate.run(cases)]
+            result["divergences"][candidate.name] = _diverging(cases, expected, actual, candidate.project)
+        if record:
+            write_corpus(corpus_dir, check.name, current_tariffs().version, check.fields, cases, expected)
+            result["recorded"] = len(cases)
+            return result
+
+    stored = read_corpus(corpus_dir, check.name)
+    if stored is None:
+        return result
+    header, golden_cases, golden_outputs = stored
+    try:
+        tariffs = registry().get(header["tariff_version"])
+    except LookupError as e:
+        result["divergences"]["golden"] = [{"error": str(e)}]
+        return result
+    with use_tariffs(tariffs):
+        replay = _reference(check, golden_cases)
+    result["golden_cases"] = len(golden_cases)
+    result["divergences"]["golden"] = _diverging(golden_cases, golden_outputs, replay)
+    return result
+
+
+def select(checks: list[Check], patterns) -> list[Check]:
+    if not patterns:
+        return checks
+    return [check for check in checks if any(p in check.name for p in patterns)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m differential", description="Hesaplayıcı fark testi (kuruş hassasiyeti)")
+    parser.add_argument("patterns", nargs="*", help="Kontrol adı parçası (örn. pilotage, proforma)")
+    parser.add_argument("--cases", type=int, default=2000, help="Kenar taramasına ek rastgele durum sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele tohum")
+    parser.add_argument("--corpus", type=Path, default=GOLDEN_DIR, help="Golden corpus dizini")
+    parser.add_argument("--record", action="store_true", help="Referans sonuçları golden corpus olarak kaydet")
+    parser.add_argument("--show", type=int, default=3, help="Kontrol başına gösterilecek örnek fark")
+    parser.add_argument("--list", action="store_true", help="Kontrolleri listele")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    checks = select(all_checks(), args.patterns)
+    if args.list:
+        for check in checks:
+            names = ", ".join(c.name for c in check.candidates) or "-"
+            print(f"{check.name:<24} {names}")
+        return 0
+    if not checks:
+        print("Desene uyan kontrol yok", file=sys.stderr)
+        return 2
+
+    results = []
+    failed = False
+    for check in checks:
+        start = time.perf_counter()
+        result = run_check(check, args.cases, args.seed, args.corpus, args.record)
+        results.append(result)
+        bad = {name: found for name, found in result["divergences"].items() if found}
+        failed = failed or bool(bad)
+        if args.json:
+            continue
+        parts = [f"{name} {'FARK ' + str(len(found)) if found else 'OK'}" for name, found in result["divergences"].items()]
+        if "recorded" in result:
+            parts.append(f"{result['recorded']} durum kaydedildi")
+        print(f"{check.name:<24} {result['cases']:>6} durum  {', '.join(parts) or 'sadece referans'}"
+              f"  ({time.perf_counter() - start:.1f} sn)")
+        for name, found in bad.items():
+            for example in found[:args.show]:
+                print(f"    {name}: {json.dumps(example, ensure_ascii=False)}")
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2, default=str))
+    return 1 if failed else 0
@@ -0,0 +1,44 @@
+"""
+Golden corpus - referans sonuçların diskteki kaydı
+Kontrol başına bir gzip'li JSONL dosyası (<dizin>/<kontrol>.jsonl.gz): ilk
+satır başlık (kontrol, tarife sürümü, alanlar), sonraki her satır bir durum:
+{"in": girdiler, "out": anahtar -> kuruş}. Doğrulama kayıttaki tarife
+sürümüyle yapılır; böylece yeni tarife yüklendiğinde eski corpus geçerli kalır.
+"""
+import gzip
+import json
+from pathlib import Path
+from typing import Optional
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+
+def corpus_path(directory: Path, check: str) -> Path:
+    return Path(directory) / f"{check}.jsonl.gz"
+
+
+def write_corpus(directory: Path, check: str, tariff_version: str, fields, cases: list[dict], outputs: list[dict]):
+    """Kontrolün corpus'unu (yeniden) yaz"""
+    path = corpus_path(directory, check)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mtime=0: aynı içerik her kayıtta aynı dosyayı üretir
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+        header = {"check": check, "tariff_version": tariff_version, "fields": list(fields), "cases": len(cases)}
+        gz.write((json.dumps(header) + "\n").encode("utf-8"))
+        for case, output in zip(cases, outputs):
+            gz.write((json.dumps({"in": case, "out": output}, separators=(",", ":")) + "\n").encode("utf-8"))
+
+
+def read_corpus(directory: Path, check: str) -> Optional[tuple[dict, list[dict], list[dict]]]:
+    """(başlık, durumlar, sonuçlar) veya corpus yoksa None"""
+    path = corpus_path(directory, check)
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        cases, outputs = [], []
+        for line in f:
+            entry = json.loads(line)
+            cases.append(entry["in"])
+            outputs.append(entry["out"])
+    return header, cases, outputs
@@ -0,0 +1,143 @@
+"""
+Sınır odaklı girdi üretimi - tarife kırılım noktaları etrafında
+Her alanın kenar değerleri (sınır - 1, sınır, sınır + 0.5, sınır + 1) geçerli
+tarife setinin tablolarından türetilir: NRT 500/501, GRT 1000'in katları,
+GT 81000/81001 vb. Durumlar iki kısımdır: önce her alan kendi kenarlarında
+tek tek taranır (diğerleri tipik değerde), sonra rastgele yürüyüş: her adım
+bir öncekinden 1-3 alanı değiştirir, değerler çoğunlukla kenarlardan seçilir.
+Aynı tohum ve tarife seti aynı durumları üretir.
+"""
+import random
+from typing import Sequence
+
+from config.settings import PORTS, VESSEL_TYPES
+from calculators.engine import Services
+from calculators.tariff_sets import current_tariffs
+
+# Rastgele durumda değerin kenarlardan seçilme olasılığı
+EDGE_PROBABILITY = 0.7
+
+SERVICE_FIELDS = tuple(Services.__dataclass_fields__)
+
+# Kenar listesi dışındaki rastgele değer aralıkları: (alt, üst, tam sayı mı)
+RANGES = {
+    "nrt": (1, 120000, True),
+    "grt": (1, 250000, True),
+    "gt": (1, 250000, True),
+    "cargo_mt": (0, 150000, True),
+    "berth_days": (1, 40, True),
+    "anchorage_days": (0, 30, True),
+    "bracket_value": (0, 300000, True),
+    "usd_eur": (0.85, 1.35, False),
+    "usd_tl": (25.0, 45.0, False),
+    "spare_parts_kg": (0, 5000, False),
+    "bunker_operations": (0, 6, True),
+    "crew_change_persons": (0, 30, True),
+    "medical_patients": (0, 6, True),
+    "captain_advance_eur": (0, 50000, False),
+    "transit_visa_persons": (0, 30, True),
+    "waste_marpol1_slop_m3": (0, 60, False),
+    "waste_marpol1_bilge_m3": (0, 60, False),
+    "waste_marpol4_m3": (0, 60, False),
+    "waste_marpol5_m3": (0, 60, False),
+}
+
+CHOICES = {
+    "port": list(PORTS),
+    "vessel_type": list(VESSEL_TYPES),
+    "purpose": ["Loading", "Discharging"],
+    "service_key": ["izmir_demir"],
+    "tanker_pct": [0, 0.30],
+    "overtime_pct": [0, 50],
+}
+
+BOOL_FIELDS = (
+    "is_turk_flag", "overtime", "tanker", "four_tugs", "is_kabotaj", "is_import", "palamar_x2",
+    "is_weekend", "protective_agency", "auto_service", "stamp_duties",
+)
+
+TYPICAL = {
+    "bracket_value": 1000, "nrt": 2196, "grt": 5197, "gt": 5197, "cargo_mt": 5520, "berth_days": 7, "anchorage_days": 2,
+    "usd_eur": 1.1801, "usd_tl": 34.5, "port": "TEKIRDAG", "vessel_type": "diger_yuk", "purpose": "Loading",
+    "service_key": "izmir_demir", "tanker_pct": 0, "overtime_pct": 0,
+    **{name: False for name in BOOL_FIELDS},
+    **{name: 0 for name in SERVICE_FIELDS if name not in BOOL_FIELDS},
+}
+
+
+def _around(bounds, integer: bool = True) -> list:
+    values = set()
+    for b in bounds:
+        if b is None or b < 0 or b > 1e7:
+            continue
+        for v in (b - 1, b, b + 1) + (() if integer else (b - 0.5, b + 0.5)):
+            if v >= 0:
+                values.add(int(v) if integer else float(v))
+        if integer:
+            values.add(b + 0.5)
+    return sorted(values)
+
+
+def _bounds(*tables) -> list[float]:
+    return [b for table in tables for b in table.bounds]
+
+
+def edge_values() -> dict[str, list]:
+    """Alan -> kenar değerleri (geçerli tarife setinden)"""
+    t = current_tariffs()
+    tb = t.tables
+    thousands = range(0, 101000, 1000)
+    waste_included = [v for key in ("marpol1", "marpol4", "marpol5") for v in tb.WASTE_FIXED.columns[key]]
+    edges = {
+        "nrt": _around(
+            _bounds(tb.AGENCY_BASE, tb.AGENCY_EXTRA, tb.PROTECTIVE_BASE, tb.PROTECTIVE_EXTRA, tb.LCB, tb.LCB_OVERTIME)
+            + [0, 10000, 15000, 20000, 30000, 50000]
+        ),
+        "grt": _around(list(thousands) + [150000, 200000, 5000] + _bounds(tb.WASTE_FIXED)),
+        "gt": _around(list(thousands) + [500, 81000] + _bounds(tb.LIMAN_HIZMET)),
+        "cargo_mt": _around(_bounds(tb.CUSTOMS_IMPORT, tb.CUSTOMS_EXPORT, tb.CHAMBER_FREIGHT) + [0]),
+        "bracket_value": _around(_bounds(*vars(tb).values())),
+        "berth_days": list(range(0, 41)),
+        "anchorage_days": list(range(0, 16)),
+        "usd_eur": [1.1801, 1.0, 1.08, 0.9999, 1.0001, 1.2345, 1.17685],
+        "usd_tl": [34.5, 1.0, 32.0419, 35.77, 34.505, 38.123456, 30.0],
+        "spare_parts_kg": _around(
+            [t.SPARE_PARTS_MIN_EUR / t.SPARE_PARTS_PER_KG_EUR, t.SPARE_PARTS_MAX_EUR / t.SPARE_PARTS_PER_KG_EUR, 0],
+            integer=False,
+        ),
+        "captain_advance_eur": _around([t.CAPTAIN_ADVANCE_MIN_EUR / t.CAPTAIN_ADVANCE_PCT, 0], integer=False),
+        **{name: _around(waste_included + [0], integer=False) for name in SERVICE_FIELDS if name.startswith("waste_")},
+        **{name: [0, 1, 2, 3, 10] for name in (
+            "bunker_operations", "crew_change_persons", "medical_patients", "transit_visa_persons",
+        )},
+    }
+    for name in BOOL_FIELDS:
+        edges[name] = [False, True]
+    edges.update(CHOICES)
+    return edges
+
+
+def _random_value(rng: random.Random, name: str, edges: dict) -> object:
+    if name in RANGES and rng.random() >= EDGE_PROBABILITY:
+        low, high, integer = RANGES[name]
+        return rng.randint(low, high) if integer else round(rng.uniform(low, high), rng.choice((2, 4, 6)))
+    return rng.choice(edges[name])
+
+
+def generate(fields: Sequence[str], n: int, seed: int = 0) -> list[dict]:
+    """Kenar taraması + n adımlık rastgele yürüyüş (fields alanlarıyla durum listesi)"""
+    edges = edge_values()
+    base = {name: TYPICAL[name] for name in fields}
+    cases = []
+    for name in fields:
+        for value in edges[name]:
+            cases.append({**base, name: value})
+
+    rng = random.Random(seed)
+    current = dict(base)
+    for _ in range(n):
+        current = dict(current)
+        for name in rng.sample(list(fields), min(len(fields), rng.randint(1, 3))):
+            current[name] = _random_value(rng, name, edges)
+        cases.append(current)
+    return cases
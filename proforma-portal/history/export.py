@@ -0,0 +1,201 @@
+"""
+Excel dışa aktarma - kayıtlı proforma kalemlerinden (hesap tekrar çalışmaz)
+openpyxl write-only modunda satırlar doğrudan dosyaya akar; on binlerce
+proforma sabit bellekle aktarılır. Tutarlar Decimal olarak yazılır.
+Kayıt biçimi: history.store.get_proforma / iter_proformas çıktısı
+(batch JSONL çıktısı da aynı anahtarları taşır).
+"""
+from decimal import Decimal
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+LAYOUTS = ("summary", "per_vessel")
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+DISCLAIMER = "E. & O.E. - All items are subject to final verification against official tariffs."
+
+_MONEY_FORMAT = "#,##0.00"
+_BOLD = Font(bold=True)
+_TITLE = Font(bold=True, size=14)
+_HEADER_FILL = PatternFill("solid", fgColor="1F4E78")
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_TOTAL_FILL = PatternFill("solid", fgColor="DDEBF7")
+
+# Excel sayfa adında kullanılamayan karakterler
+_SHEET_NAME_INVALID = str.maketrans({c: " " for c in "[]:*?/\\"})
+
+
+def _amount(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _cell(ws, value, font=None, fill=None, number_format=None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    if font:
+        cell.font = font
+    if fill:
+        cell.fill = fill
+    if number_format:
+        cell.number_format = number_format
+    return cell
+
+
+def _header(ws, titles) -> list:
+    return [_cell(ws, t, font=_HEADER_FONT, fill=_HEADER_FILL) for t in titles]
+
+
+def _money(ws, value, **style) -> WriteOnlyCell:
+    return _cell(ws, _amount(value), number_format=_MONEY_FORMAT, **style)
+
+
+def _widths(ws, widths):
+    # write-only modda sütun genişlikleri satır yazılmadan önce verilmeli
+    for letter, width in zip("ABCDEFGHIJ", widths):
+        ws.column_dimensions[letter].width = width
+
+
+def _write_proforma_sheet(ws, record: dict):
+    """Principal'a gönderilen düzen: başlık bilgileri, kalem tablosu, toplam"""
+    _widths(ws, (6, 58, 16, 16))
+    ws.append([_cell(ws, "PROFORMA DISBURSEMENT ACCOUNT", font=_TITLE)])
+    ws.append([])
+
+    info = [
+        ("Vessel", record.get("vessel_name")),
+        ("Port", record.get("port")),
+        ("Purpose of call", record.get("purpose")),
+    ]
+    if record.get("nrt") is not None:
+        info.append(("NRT / GRT / GT", f"{record['nrt']:g} / {record['grt']:g} / {record['gt']:g}"))
+    if record.get("cargo_mt"):
+        info.append(("Cargo", f"{record.get('kind_of_cargo') or ''} {record['cargo_mt']:g} MT".strip()))
+    if record.get("usd_eur_rate"):
+        info.append(("Exchange rates", f"1 USD = {record['usd_eur_rate']:.4f} EUR / {record['usd_tl_rate']:.2f} TL"))
+    info.append(("Proforma No", record.get("id")))
+    if record.get("created_at"):
+        info.append(("Date (UTC)", record["created_at"]))
+    if record.get("tariff_version"):
+        info.append(("Tariff", record["tariff_version"]))
+    for label, value in info:
+        ws.append([None, _cell(ws, label, font=_BOLD), value])
+    ws.append([])
+
+    ws.append(_header(ws, ("No", "Description", "USD", "EUR")))
+    for seq, line in enumerate(record["lines"], start=1):
+        ws.append([seq, line["label"], _money(ws, line["usd"]), _money(ws, line["eur"])])
+    ws.append([
+        _cell(ws, None, fill=_TOTAL_FILL),
+        _cell(ws, "TOTAL PORT EXPENSES", font=_BOLD, fill=_TOTAL_FILL),
+        _money(ws, record["total_usd"], font=_BOLD, fill=_TOTAL_FILL),
+        _money(ws, record["total_eur"], font=_BOLD, fill=_TOTAL_FILL),
+    ])
+    ws.append([])
+    ws.append([None, _cell(ws, DISCLAIMER, font=Font(italic=True, size=9))])
+
+
+def write_proforma(record: dict, out):
+    """Tek proforma çalışma kitabı. out: dosya yolu veya yazılabilir dosya nesnesi"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(_sheet_name(f"Proforma {record.get('id', '')}", set()))
+    _write_proforma_sheet(ws, record)
+    wb.save(out)
+
+
+def proforma_xlsx(record: dict) -> bytes:
+    """Tek proforma .xlsx içeriği (indirme butonu için)"""
+    buffer = BytesIO()
+    write_proforma(record, buffer)
+    return buffer.getvalue()
+
+
+def _sheet_name(name: str, used: set) -> str:
+    """Geçerli ve tekil sayfa adı (en fazla 31 karakter)"""
+    base = (str(name).translate(_SHEET_NAME_INVALID).strip() or "Sheet")[:31]
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _write_summary(wb, records) -> int:
+    """Tek özet sayfası: proforma başına bir satır + genel toplam"""
+    ws = wb.create_sheet("Summary")
+    _widths(ws, (10, 20, 30, 12, 14, 10, 16, 16))
+    ws.append(_header(ws, ("No", "Date (UTC)", "Vessel", "Port", "Purpose", "Tariff", "Total USD", "Total EUR")))
+    count = 0
+    total_usd = total_eur = Decimal(0)
+    for record in records:
+        usd, eur = _amount(record["total_usd"]), _amount(record["total_eur"])
+        ws.append([
+            record.get("id"), record.get("created_at"), record.get("vessel_name"), record.get("port"),
+            record.get("purpose"), record.get("tariff_version"), _money(ws, usd), _money(ws, eur),
+        ])
+        total_usd += usd
+        total_eur += eur
+        count += 1
+    ws.append([
+        _cell(ws, "TOTAL", font=_BOLD, fill=_TOTAL_FILL), *[_cell(ws, None, fill=_TOTAL_FILL) for _ in range(5)],
+        _money(ws, total_usd, font=_BOLD, fill=_TOTAL_FILL), _money(ws, total_eur, font=_BOLD, fill=_TOTAL_FILL),
+    ])
+    return count
+
+
+def _write_per_vessel(wb, records) -> int:
+    """
+    Gemi başına bir sayfa: her proformanın kalemleri ve ara toplamı.
+    Kayıtlar gemi adına göre gruplu gelmeli (iter_proformas(by_vessel=True));
+    gemi değişince önceki sayfa kapatılır, aynı anda tek sayfa açıktır.
+    """
+    used = set()
+    ws = None
+    current = None
+    count = 0
+    for record in records:
+        vessel = record.get("vessel_name") or "-"
+        if vessel != current:
+            if ws is not None:
+                ws.close()
+            ws = wb.create_sheet(_sheet_name(vessel, used))
+            _widths(ws, (10, 20, 12, 58, 16, 16))
+            ws.append(_header(ws, ("No", "Date (UTC)", "Port", "Description", "USD", "EUR")))
+            current = vessel
+        head = (record.get("id"), record.get("created_at"), record.get("port"))
+        for line in record["lines"]:
+            ws.append([*head, line["label"], _money(ws, line["usd"]), _money(ws, line["eur"])])
+        ws.append([
+            *[_cell(ws, value, font=_BOLD, fill=_TOTAL_FILL) for value in head],
+            _cell(ws, "TOTAL", font=_BOLD, fill=_TOTAL_FILL),
+            _money(ws, record["total_usd"], font=_BOLD, fill=_TOTAL_FILL),
+            _money(ws, record["total_eur"], font=_BOLD, fill=_TOTAL_FILL),
+        ])
+        count += 1
+    if ws is None:
+        wb.create_sheet("Summary").append(["Kayıt yok"])
+    return count
+
+
+def write_batch(records, out, layout: str = "summary") -> int:
+    """
+    Çok proformalı çalışma kitabı. records: kayıt akışı (generator olabilir).
+    layout: "summary" (tek özet sayfası) veya "per_vessel". Yazılan proforma sayısı döner.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Bilinmeyen düzen: {layout} ({', '.join(LAYOUTS)})")
+    wb = Workbook(write_only=True)
+    count = _write_summary(wb, records) if layout == "summary" else _write_per_vessel(wb, records)
+    wb.save(out)
+    return count
+
+
+def batch_xlsx(records, layout: str = "summary") -> bytes:
+    """Çok proformalı .xlsx içeriği (indirme butonu için)"""
+    buffer = BytesIO()
+    write_batch(records, buffer, layout)
+    return buffer.getvalue()
@@ -0,0 +1,398 @@
+"""
+SQLite tabanlı proforma geçmişi - kayıt, listeleme ve arama
+Her proforma başlık + girdiler + kurlar ve kalemleriyle saklanır.
+Listeleme keyset (created_at, id) sayfalamalı; OFFSET kullanılmaz.
+Tutarlar kuruşa yuvarlanmış haliyle REAL saklanır (2 haneli değerler
+float'ta kayıpsız döner), get_proforma bunları Decimal olarak verir.
+Opsiyonel hizmetler (Services) varsayılandan farklı alanlarıyla JSON
+olarak saklanır; hizmetsiz uğramada sütun NULL'dur.
+"""
+import json
+import threading
+from dataclasses import asdict, fields
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from calculators.engine import Proforma, Services, NO_SERVICES
+from utils.money import to_decimal, CENT
+from config.settings import DB_POOL_SIZE
+from utils.sqlite_pool import ConnectionPool
+
+DB_PATH = Path(__file__).parent.parent / "data" / "proformas.db"
+
+DEFAULT_PAGE_SIZE = 25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vessels (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS proformas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    vessel_id INTEGER NOT NULL REFERENCES vessels(id),
+    port TEXT NOT NULL,
+    purpose TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    nrt REAL NOT NULL,
+    grt REAL NOT NULL,
+    gt REAL NOT NULL,
+    vessel_type TEXT NOT NULL,
+    is_turk_flag INTEGER NOT NULL,
+    kind_of_cargo TEXT,
+    cargo_mt REAL NOT NULL,
+    berth_days INTEGER NOT NULL,
+    anchorage_days INTEGER NOT NULL,
+    overtime INTEGER NOT NULL,
+    tanker INTEGER NOT NULL,
+    four_tugs INTEGER NOT NULL,
+    usd_eur_rate REAL NOT NULL,
+    usd_tl_rate REAL NOT NULL,
+    rate_snapshot_id TEXT,
+    tariff_version TEXT,
+    services TEXT,
+    total_usd REAL NOT NULL,
+    total_eur REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS proforma_lines (
+    proforma_id INTEGER NOT NULL REFERENCES proformas(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    label TEXT NOT NULL,
+    usd REAL NOT NULL,
+    eur REAL NOT NULL,
+    PRIMARY KEY (proforma_id, seq)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_proformas_user ON proformas (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_proformas_vessel ON proformas (vessel_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_proformas_port ON proformas (port, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_proformas_created ON proformas (created_at, id);
+"""
+
+# Listeleme sütunları (kalemler hariç)
+_SUMMARY_COLUMNS = (
+    "p.id", "p.user_id", "v.name", "p.port", "p.purpose", "p.created_at",
+    "p.total_usd", "p.total_eur",
+)
+_SUMMARY_KEYS = (
+    "id", "user_id", "vessel_name", "port", "purpose", "created_at",
+    "total_usd", "total_eur",
+)
+
+_INPUT_KEYS = (
+    "nrt", "grt", "gt", "vessel_type", "is_turk_flag", "kind_of_cargo", "cargo_mt",
+    "berth_days", "anchorage_days", "overtime", "tanker", "four_tugs",
+    "usd_eur_rate", "usd_tl_rate", "rate_snapshot_id", "tariff_version", "services",
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Süreç başına bağlantı havuzu (ilk çağrıda oluşturulur)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(DB_PATH, max_size=DB_POOL_SIZE, init_script=_SCHEMA)
+                with pool.connection() as conn:
+                    _migrate(conn)
+                _pool = pool
+    return _pool
+
+
+# Sonradan eklenen sütunlar: eski veritabanlarına ALTER TABLE ile eklenir
+_ADDED_COLUMNS = {
+    "proformas": (("rate_snapshot_id", "TEXT"), ("tariff_version", "TEXT"), ("services", "TEXT")),
+}
+
+
+def _migrate(conn):
+    """Eksik sütunları ekle"""
+    with conn:
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def get_connection():
+    """Havuzdan veritabanı bağlantısı: with get_connection() as conn"""
+    return get_pool().connection()
+
+
+def init_db():
+    """Proforma tablolarını oluştur (ilk havuz bağlantısı şemayı kurar)"""
+    with get_connection():
+        pass
+
+
+def _normalize_vessel_name(name: str) -> str:
+    return " ".join((name or "").split()).upper()
+
+
+def _amount(value: float):
+    """REAL tutarı 2 haneli Decimal'e çevir"""
+    return to_decimal(value).quantize(CENT)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+_SERVICE_DEFAULTS = asdict(NO_SERVICES)
+_SERVICE_NAMES = frozenset(f.name for f in fields(Services))
+
+
+def dump_services(services: Services) -> Optional[str]:
+    """Varsayılandan farklı hizmet alanları JSON olarak; hizmet yoksa None"""
+    values = {k: v for k, v in asdict(services).items() if v != _SERVICE_DEFAULTS[k]}
+    return json.dumps(values, sort_keys=True) if values else None
+
+
+def _service_values(text: Optional[str]) -> dict:
+    # Bilinmeyen alanlar (ileri sürümden kalan) yok sayılır
+    return {k: v for k, v in json.loads(text).items() if k in _SERVICE_NAMES} if text else {}
+
+
+def load_services(text: Optional[str]) -> Services:
+    """dump_services'in tersi (NULL / boş: NO_SERVICES)"""
+    values = _service_values(text)
+    return Services(**values) if values else NO_SERVICES
+
+
+def save_proforma(user_id: int, proforma: Proforma) -> int:
+    """Proformayı kalemleriyle kaydet, proforma id döner"""
+    call = proforma.call
+    v = call.vessel
+    vessel_name = _normalize_vessel_name(v.name)
+
+    with get_connection() as conn:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO vessels (name) VALUES (?)", (vessel_name,))
+            vessel_id = conn.execute("SELECT id FROM vessels WHERE name = ?", (vessel_name,)).fetchone()[0]
+            cur = conn.execute(
+                """
+                INSERT INTO proformas (
+                    user_id, vessel_id, port, purpose, created_at,
+                    nrt, grt, gt, vessel_type, is_turk_flag, kind_of_cargo, cargo_mt,
+                    berth_days, anchorage_days, overtime, tanker, four_tugs,
+                    usd_eur_rate, usd_tl_rate, rate_snapshot_id, tariff_version, services, total_usd, total_eur
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    user_id, vessel_id, call.port, call.purpose, _now(),
+                    v.nrt, v.grt, v.gt, v.vessel_type, int(v.is_turk_flag), call.kind_of_cargo,
+                    call.cargo_mt or 0, call.berth_days, call.anchorage_days,
+                    int(call.options.overtime), int(call.options.tanker), int(call.options.four_tugs),
+                    call.rates.usd_eur, call.rates.usd_tl, call.rates.snapshot_id,
+                    proforma.tariff_version or None, dump_services(call.services),
+                    float(proforma.total_usd), float(proforma.total_eur),
+                ),
+            )
+            proforma_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO proforma_lines (proforma_id, seq, code, label, usd, eur) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (proforma_id, seq, line.code, line.label, float(line.usd), float(line.eur))
+                    for seq, line in enumerate(proforma.lines)
+                ],
+            )
+    return proforma_id
+
+
+def list_proformas(
+    user_id: Optional[int] = None,
+    vessel: str = "",
+    port: str = "",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[tuple] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[dict], Optional[tuple]]:
+    """
+    Proformaları yeniden eskiye listele. (satırlar, sonraki_cursor) döner.
+    vessel: gemi adı öneki, date_to dahil. after: önceki sayfanın cursor'u
+    (created_at, id); son sayfada sonraki_cursor None olur.
+    """
+    where, params = _filters(user_id, vessel, port, date_from, date_to)
+    if after:
+        where.append("(p.created_at, p.id) < (?, ?)")
+        params.extend(after)
+
+    sql = "SELECT {} FROM proformas p JOIN vessels v ON v.id = p.vessel_id".format(", ".join(_SUMMARY_COLUMNS))
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY p.created_at DESC, p.id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    items = [dict(zip(_SUMMARY_KEYS, row)) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = (last["created_at"], last["id"])
+    return items, next_cursor
+
+
+def _filters(user_id, vessel, port, date_from, date_to) -> tuple[list[str], list]:
+    """Liste filtreleri -> (WHERE parçaları, parametreler)"""
+    where = []
+    params = []
+    if user_id is not None:
+        where.append("p.user_id = ?")
+        params.append(user_id)
+    if vessel:
+        prefix = _normalize_vessel_name(vessel)
+        where.append("p.vessel_id IN (SELECT id FROM vessels WHERE name >= ? AND name < ?)")
+        params.extend([prefix, prefix + "\uffff"])
+    if port:
+        where.append("p.port = ?")
+        params.append(port)
+    if date_from:
+        where.append("p.created_at >= ?")
+        params.append(date_from.isoformat())
+    if date_to:
+        where.append("p.created_at < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+    return where, params
+
+
+def get_proforma(proforma_id: int, user_id: Optional[int] = None) -> Optional[dict]:
+    """
+    Tek proforma: başlık, girdiler, kurlar ve kalemler.
+    user_id verilirse sadece o kullanıcının kaydı döner.
+    """
+    sql = "SELECT {}, {} FROM proformas p JOIN vessels v ON v.id = p.vessel_id WHERE p.id = ?".format(
+        ", ".join(_SUMMARY_COLUMNS), ", ".join("p." + k for k in _INPUT_KEYS),
+    )
+    params = [proforma_id]
+    if user_id is not None:
+        sql += " AND p.user_id = ?"
+        params.append(user_id)
+
+    with get_connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+        if not row:
+            return None
+        lines = conn.execute(
+            "SELECT code, label, usd, eur FROM proforma_lines WHERE proforma_id = ? ORDER BY seq",
+            (proforma_id,),
+        ).fetchall()
+
+    return _record(row, lines)
+
+
+def _record(row: tuple, lines: list[tuple]) -> dict:
+    """Başlık satırı + (code, label, usd, eur) kalemleri -> proforma kaydı"""
+    record = dict(zip(_SUMMARY_KEYS + _INPUT_KEYS, row))
+    for key in ("is_turk_flag", "overtime", "tanker", "four_tugs"):
+        record[key] = bool(record[key])
+    # Varsayılandan farklı hizmet alanları (load_services ile aynı); hizmetsizde {}
+    record["services"] = _service_values(record["services"])
+    record["total_usd"] = _amount(record["total_usd"])
+    record["total_eur"] = _amount(record["total_eur"])
+    record["lines"] = [
+        {"code": code, "label": label, "usd": _amount(usd), "eur": _amount(eur)}
+        for code, label, usd, eur in lines
+    ]
+    return record
+
+
+def iter_proformas(
+    user_id: Optional[int] = None,
+    vessel: str = "",
+    port: str = "",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    by_vessel: bool = False,
+    page_size: int = 500,
+) -> Iterator[dict]:
+    """
+    Filtreye uyan proformaları kalemleriyle tek tek üret (dışa aktarma için).
+    Sayfa sayfa okunur, bellekte bir sayfadan fazlası tutulmaz.
+    Sıra: yeniden eskiye; by_vessel=True ise gemi adı, tarih (gemi bazlı sayfalar için).
+    """
+    where, params = _filters(user_id, vessel, port, date_from, date_to)
+    if by_vessel:
+        order = "v.name, p.created_at, p.id"
+        cursor_sql = "(v.name, p.created_at, p.id) > (?, ?, ?)"
+    else:
+        order = "p.created_at DESC, p.id DESC"
+        cursor_sql = "(p.created_at, p.id) < (?, ?)"
+    columns = ", ".join(_SUMMARY_COLUMNS) + ", " + ", ".join("p." + k for k in _INPUT_KEYS)
+
+    cursor = None
+    while True:
+        page_where = where + ([cursor_sql] if cursor else [])
+        sql = f"SELECT {columns} FROM proformas p JOIN vessels v ON v.id = p.vessel_id"
+        if page_where:
+            sql += " WHERE " + " AND ".join(page_where)
+        sql += f" ORDER BY {order} LIMIT ?"
+
+        with get_connection() as conn:
+            rows = conn.execute(sql, params + list(cursor or ()) + [page_size]).fetchall()
+            if not rows:
+                return
+            ids = [row[0] for row in rows]
+            line_rows = conn.execute(
+                "SELECT proforma_id, code, label, usd, eur FROM proforma_lines WHERE proforma_id IN ({}) "
+                "ORDER BY proforma_id, seq".format(", ".join("?" * len(ids))),
+                ids,
+            ).fetchall()
+
+        lines_by_id = {}
+        for proforma_id, *line in line_rows:
+            lines_by_id.setdefault(proforma_id, []).append(line)
+        for row in rows:
+            yield _record(row, lines_by_id.get(row[0], []))
+
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+        # _SUMMARY_COLUMNS sırası: id, user_id, name, port, purpose, created_at
+        cursor = (last[2], last[5], last[0]) if by_vessel else (last[5], last[0])
+
+
+# Simülasyon için uğrama girdileri (kalemsiz); services: JSON metni (load_services) veya None
+CALL_COLUMNS = (
+    "id", "port", "created_at", "nrt", "grt", "gt", "vessel_type", "is_turk_flag", "purpose", "cargo_mt",
+    "berth_days", "anchorage_days", "overtime", "tanker", "four_tugs", "usd_eur_rate", "usd_tl_rate",
+    "tariff_version", "services",
+)
+
+
+def iter_call_batches(
+    user_id: Optional[int] = None,
+    port: str = "",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    batch_size: int = 5000,
+) -> Iterator[list[tuple]]:
+    """
+    Filtreye uyan uğramaların girdileri, CALL_COLUMNS sırasıyla tuple
+    listeleri halinde (id sırasıyla, keyset). Kalemler okunmaz; bellekte
+    bir partiden fazlası tutulmaz.
+    """
+    where, params = _filters(user_id, "", port, date_from, date_to)
+    columns = ", ".join("p." + k for k in CALL_COLUMNS)
+    last_id = 0
+    while True:
+        sql = f"SELECT {columns} FROM proformas p WHERE " + " AND ".join(where + ["p.id > ?"])
+        sql += " ORDER BY p.id LIMIT ?"
+        with get_connection() as conn:
+            rows = conn.execute(sql, params + [last_id, batch_size]).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
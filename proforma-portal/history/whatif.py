@@ -0,0 +1,250 @@
+"""
+Tarife simülasyonu - kayıtlı uğramaların iki tarife sürümüyle yeniden fiyatlanması
+  python -m history.whatif --candidate taslak.yaml                 # aktif sete göre
+  python -m history.whatif --baseline 2026.1 --candidate 2026.2 --port IZMIR --from 2025-01-01
+Geçmiş partiler halinde okunur (history.store.iter_call_batches) ve her parti
+calculators.fleet ile iki setle vektörel fiyatlanır; bellekte sadece toplamlar
+ve uğrama başına toplam farkı (yüzdelikler için) tutulur. Her uğrama kayıtlı
+kurlarıyla fiyatlanır (--usd-eur / --usd-tl ile tek kur verilebilir).
+Opsiyonel hizmet kalemleri (fleet kapsamı dışında) hizmeti kayıtlı
+uğramalarda motorun hizmet düğümleriyle tek tek fiyatlanır. Hizmet girdileri
+saklanmaya başlamadan önce kaydedilmiş proformalar hizmetsiz sayılır.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from calculators import fleet
+from calculators.engine import LINE_NODES, SERVICE_NODES, Options, PortCall, Rates, Vessel
+from calculators.tariff_sets import TariffSet, registry, use_tariffs
+from history.store import CALL_COLUMNS, iter_call_batches, load_services
+from utils.money import exact_money
+
+PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+_LINE_ORDER = {node.code: i for i, node in enumerate(LINE_NODES)}
+
+# Kayıtlı sütun -> fleet girdisi
+_INPUT_SOURCES = {name: name for name in fleet.INPUT_COLUMNS} | {"usd_eur": "usd_eur_rate", "usd_tl": "usd_tl_rate"}
+
+
+@dataclass
+class WhatIfReport:
+    """
+    Simülasyon sonucu (USD). items / ports: code|liman -> [temel, aday]
+    toplamları; port_calls: liman başına uğrama sayısı; deltas / pct_deltas:
+    uğrama başına toplam farkı (aday - temel) ve yüzde farkı.
+    """
+    baseline: str
+    candidate: str
+    calls: int = 0
+    items: dict[str, list[float]] = field(default_factory=dict)
+    ports: dict[str, list[float]] = field(default_factory=dict)
+    port_calls: dict[str, int] = field(default_factory=dict)
+    deltas: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    pct_deltas: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    @property
+    def baseline_usd(self) -> float:
+        return sum(base for base, _ in self.items.values())
+
+    @property
+    def candidate_usd(self) -> float:
+        return sum(cand for _, cand in self.items.values())
+
+    def item_rows(self, only_changed: bool = False) -> list[dict]:
+        """Kalem başına toplamlar (proforma sırasıyla)"""
+        rows = [
+            _delta_row("code", code, base, cand)
+            for code, (base, cand) in sorted(self.items.items(), key=lambda kv: _LINE_ORDER.get(kv[0], len(_LINE_ORDER)))
+        ]
+        return [row for row in rows if row["delta_usd"]] if only_changed else rows
+
+    def port_rows(self) -> list[dict]:
+        """Liman başına toplamlar"""
+        return [
+            {**_delta_row("port", port, base, cand), "calls": self.port_calls[port]}
+            for port, (base, cand) in sorted(self.ports.items())
+        ]
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        """Uğrama başına fark dağılımı: min, p5 ... p99, max (USD ve %)"""
+        result = {}
+        for name, values in (("delta_usd", self.deltas), ("delta_pct", self.pct_deltas)):
+            values = values[~np.isnan(values)]
+            if not len(values):
+                result[name] = {}
+                continue
+            points = np.percentile(values, PERCENTILES)
+            result[name] = {
+                "min": round(float(values.min()), 2),
+                **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, points)},
+                "max": round(float(values.max()), 2),
+            }
+        return result
+
+    def as_dict(self) -> dict:
+        return {
+            "baseline": self.baseline,
+            "candidate": self.candidate,
+            "calls": self.calls,
+            "total": _delta_row("name", "total", self.baseline_usd, self.candidate_usd),
+            "items": self.item_rows(),
+            "ports": self.port_rows(),
+            "percentiles": self.percentiles(),
+        }
+
+
+def _delta_row(key: str, name: str, base: float, cand: float) -> dict:
+    delta = cand - base
+    return {
+        key: name,
+        "baseline_usd": round(base, 2),
+        "candidate_usd": round(cand, 2),
+        "delta_usd": round(delta, 2),
+        "delta_pct": round(delta / base * 100, 2) if base else None,
+    }
+
+
+def call_inputs(rows: list[tuple], usd_eur: Optional[float] = None, usd_tl: Optional[float] = None) -> dict:
+    """CALL_COLUMNS tuple'larından fleet girdileri (sütun dizileri)"""
+    columns = dict(zip(CALL_COLUMNS, zip(*rows)))
+    inputs = {name: np.asarray(columns[source]) for name, source in _INPUT_SOURCES.items()}
+    if usd_eur:
+        inputs["usd_eur"] = np.full(len(rows), usd_eur)
+    if usd_tl:
+        inputs["usd_tl"] = np.full(len(rows), usd_tl)
+    return inputs
+
+
+def service_lines(rows: list[tuple], inputs: dict, tariffs: TariffSet) -> dict[str, np.ndarray]:
+    """
+    Opsiyonel hizmet kalemleri (USD, fleet.price_lines biçiminde): hizmeti
+    kayıtlı uğramalar skaler motorla, diğerleri NaN. inputs: call_inputs çıktısı
+    """
+    lines: dict[str, np.ndarray] = {}
+    services_index = CALL_COLUMNS.index("services")
+    for i, row in enumerate(rows):
+        if not row[services_index]:
+            continue
+        call = PortCall(
+            vessel=Vessel(
+                name="", nrt=float(inputs["nrt"][i]), grt=float(inputs["grt"][i]), gt=float(inputs["gt"][i]),
+                vessel_type=str(inputs["vessel_type"][i]), is_turk_flag=bool(inputs["is_turk_flag"][i]),
+            ),
+            port=str(inputs["port"][i]),
+            rates=Rates(usd_eur=float(inputs["usd_eur"][i]), usd_tl=float(inputs["usd_tl"][i])),
+            options=Options(*(bool(inputs[name][i]) for name in ("overtime", "tanker", "four_tugs"))),
+            services=load_services(row[services_index]),
+        )
+        with exact_money(), use_tariffs(tariffs):
+            for node in SERVICE_NODES:
+                item = node.compute(call, None)
+                if item is not None:
+                    lines.setdefault(node.code, np.full(len(rows), np.nan))[i] = float(item.usd.amount)
+    return lines
+
+
+def simulate(
+    baseline: TariffSet,
+    candidate: TariffSet,
+    batches: Iterable[list[tuple]],
+    usd_eur: Optional[float] = None,
+    usd_tl: Optional[float] = None,
+) -> WhatIfReport:
+    """Partiler halinde gelen uğramaları (CALL_COLUMNS tuple'ları) iki setle fiyatla"""
+    report = WhatIfReport(baseline=baseline.version, candidate=candidate.version)
+    deltas, pct_deltas = [], []
+    for rows in batches:
+        inputs = call_inputs(rows, usd_eur, usd_tl)
+        base_lines = fleet.price_lines(inputs, baseline) | service_lines(rows, inputs, baseline)
+        cand_lines = fleet.price_lines(inputs, candidate) | service_lines(rows, inputs, candidate)
+        for code in base_lines.keys() | cand_lines.keys():
+            sums = report.items.setdefault(code, [0.0, 0.0])
+            if code in base_lines:
+                sums[0] += float(np.nansum(base_lines[code]))
+            if code in cand_lines:
+                sums[1] += float(np.nansum(cand_lines[code]))
+
+        base_total, cand_total = fleet.totals(base_lines), fleet.totals(cand_lines)
+        delta = cand_total - base_total
+        deltas.append(delta)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_deltas.append(np.where(base_total > 0, delta / base_total * 100, np.nan))
+
+        ports = inputs["port"].astype(str)
+        for port in np.unique(ports):
+            mask = ports == port
+            sums = report.ports.setdefault(str(port), [0.0, 0.0])
+            sums[0] += float(base_total[mask].sum())
+            sums[1] += float(cand_total[mask].sum())
+            report.port_calls[str(port)] = report.port_calls.get(str(port), 0) + int(mask.sum())
+        report.calls += len(rows)
+
+    if deltas:
+        report.deltas = np.concatenate(deltas)
+        report.pct_deltas = np.concatenate(pct_deltas)
+    return report
+
+
+def resolve_tariffs(spec: Optional[str]) -> TariffSet:
+    """Sürüm adı, YAML dosya yolu veya None (bugün geçerli set)"""
+    if not spec:
+        return registry().active()
+    if Path(spec).suffix in (".yaml", ".yml") and Path(spec).exists():
+        return TariffSet.from_file(spec)
+    return registry().get(spec)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m history.whatif", description="Tarife değişikliğinin geçmiş uğramalara etkisi")
+    parser.add_argument("--baseline", help="Temel tarife sürümü veya YAML dosyası (varsayılan: bugün geçerli set)")
+    parser.add_argument("--candidate", required=True, help="Aday tarife sürümü veya YAML dosyası")
+    parser.add_argument("--port", default="", help="Sadece bu liman")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="Başlangıç tarihi (YYYY-AA-GG)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Bitiş tarihi (YYYY-AA-GG)")
+    parser.add_argument("--usd-eur", type=float, help="Tüm uğramalar için USD/EUR kuru (varsayılan: kayıtlı kur)")
+    parser.add_argument("--usd-tl", type=float, help="Tüm uğramalar için USD/TL kuru (varsayılan: kayıtlı kur)")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Okuma partisi boyutu")
+    parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yaz")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline, candidate = resolve_tariffs(args.baseline), resolve_tariffs(args.candidate)
+    except (LookupError, OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    batches = iter_call_batches(port=args.port, date_from=args.date_from, date_to=args.date_to, batch_size=args.batch_size)
+    report = simulate(baseline, candidate, batches, args.usd_eur, args.usd_tl)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(report.as_dict(), ensure_ascii=False, indent=2))
+        return 0
+
+    total = report.as_dict()["total"]
+    print(f"{report.baseline} -> {report.candidate}: {report.calls} uğrama, {elapsed:.1f} sn")
+    print(f"Toplam: {total['baseline_usd']:,.2f} -> {total['candidate_usd']:,.2f} USD "
+          f"(fark {total['delta_usd']:+,.2f}, {total['delta_pct'] or 0:+.2f}%)")
+    print("Kalemler:")
+    for row in report.item_rows(only_changed=True):
+        print(f"  {row['code']:<20} {row['delta_usd']:+14,.2f} USD  {row['delta_pct'] or 0:+7.2f}%")
+    print("Limanlar:")
+    for row in report.port_rows():
+        print(f"  {row['port']:<20} {row['calls']:>7} uğrama {row['delta_usd']:+14,.2f} USD  {row['delta_pct'] or 0:+7.2f}%")
+    for name, points in report.percentiles().items():
+        print(f"{name}: " + ", ".join(f"{k} {v:+,.2f}" for k, v in points.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 """
-Proforma Oluştur - Form ve hesaplama
+Proforma Oluştur - Form, canlı önizleme ve kayıt
 """
 import streamlit as st
-from auth.session import init_session, is_logged_in, get_user, logout
-from config.settings import PORTS, PORT_IN_OUT_FEES, PORT_SPECIFIC
-from config.tariffs import MARITIME_ASSOC_EUR
-from calculators import agency, pilotage, tugboat, mooring, berthing, harbour, waste, other, anchorage
-from utils.exchange import usd_to_eur
+from auth.session import init_session, is_logged_in, get_user, is_admin, logout
+from config.settings import PORTS, PROFILE_MODE
+from calculators.engine import PortCall, Vessel, Rates, Options, Services
+from calculators.incremental import IncrementalProforma, SWEEP_FIELDS, sweep
+from history.store import save_proforma
+from utils.rates import get_rate_provider
+from utils.resources import proforma_engine, proforma_excel
 
 init_session()
 if not is_logged_in():
@@ -23,6 +25,15 @@ with st.sidebar:
         if st.button("Çıkış Yap"):
             logout()
             st.rerun()
+    # Profil: sadece yöneticinin isteğiyle, tek seferlik (widget değişikliklerinde tekrarlanmaz)
+    profile_mode = None
+    if is_admin():
+        with st.expander("Profil"):
+            modes = ["cprofile", "sampling"]
+            mode = st.radio("Profil modu", modes, index=modes.index(PROFILE_MODE) if PROFILE_MODE in modes else 0,
+                            horizontal=True)
+            if st.button("Bu hesabı profille", help="Tam hesap profillenir, katlanmış yığın dosyası üretilir"):
+                profile_mode = mode
 
 st.title("Proforma Oluştur")
 
@@ -34,186 +45,173 @@ VESSEL_TYPE_OPTIONS = {
     "diger_tum": "Diğer Tüm Gemiler",
 }
 
-with st.form("proforma_form"):
-    st.subheader("Gemi Bilgileri")
-    col1, col2 = st.columns(2)
-    with col1:
-        vessel_name = st.text_input("Gemi Adı", value="MV SEA SPRINTER")
-        nrt = st.number_input("NRT", min_value=1, value=2196)
-        grt = st.number_input("GRT", min_value=1, value=5197)
-        gt = st.number_input("GT (Gross Tonnage)", min_value=1, value=5197, help="Barınma için")
-        flag = st.selectbox("Bayrak", ["Yabancı", "Türkiye"])
-    with col2:
-        port = st.selectbox("Liman", PORTS)
-        purpose = st.selectbox("Uğrama Nedeni", ["Loading", "Discharging"])
-        vessel_type = st.selectbox(
-            "Gemi Tipi",
-            list(VESSEL_TYPE_OPTIONS.keys()),
-            format_func=lambda k: VESSEL_TYPE_OPTIONS[k],
-        )
-        kind_of_cargo = st.text_input("Yük Türü", value="SFS PELLETS")
-        cargo_mt = st.number_input("Yük Miktarı (MT)", min_value=0, value=5520)
-        berth_days = st.number_input("Rıhtımda Kalış (gün)", min_value=1, value=7)
-        anchorage_days = st.number_input("Demirde Kalış (gün)", min_value=0, value=10, help="Demirleme ücreti için")
-
-    st.subheader("Kurlar ve Seçenekler")
-    col3, col4 = st.columns(2)
-    with col3:
-        usd_eur_rate = st.number_input("1 USD = ? EUR", value=1.1801, format="%.4f")
-        usd_tl_rate = st.number_input("1 USD = ? TL", value=34.50, format="%.2f")
-    with col4:
-        overtime = st.checkbox("%50 Mesai (Hafta sonu / Bayram)", value=False)
-        tanker = st.checkbox("Tanker Zammı (%0.30)", value=False)
-        four_tugs = st.checkbox("4 Römorkör (5000+ GRT)", value=False)
-
-    submitted = st.form_submit_button("Hesapla")
-
-if submitted:
-    overtime_pct = 50 if overtime else 0
-    tanker_pct = 0.30 if tanker else 0
-    is_turk = flag == "Türkiye"
-    is_kabotaj = vessel_type == "kabotaj"
-    is_import = purpose == "Discharging"
-    is_domestic = is_turk and is_kabotaj  # Supervision dahili gemilerden alınmıyor
-
-    lines = []
-
-    # CEYPORT port in/out (Tekirdağ)
-    port_in_out = PORT_IN_OUT_FEES.get(port, 0)
-    if port_in_out > 0:
-        eur = usd_to_eur(port_in_out, usd_eur_rate)
-        lines.append(("CEYPORT port in Turkey in/out exp. (estimated)", port_in_out, eur))
-
-    # Pilotage
-    pilot_usd = pilotage.calc_port_pilotage(grt, vessel_type, port, tanker_pct)
-    if overtime_pct:
-        pilot_usd *= 1.50
-    eur = usd_to_eur(pilot_usd, usd_eur_rate)
-    lines.append(("Pilotage", pilot_usd, eur))
-
-    # Tugboats
-    tug_usd = tugboat.calc_tugboat(grt, vessel_type, four_tugs, overtime_pct)
-    eur = usd_to_eur(tug_usd, usd_eur_rate)
-    lines.append(("Tugboats", tug_usd, eur))
-
-    # Wharfage / Quay dues
-    wharf_usd = berthing.calc_berthing(gt, berth_days, is_turk, is_kabotaj)
-    eur = usd_to_eur(wharf_usd, usd_eur_rate)
-    lines.append(("Wharfage / Quay dues (For {} days)".format(berth_days), wharf_usd, eur))
-
-    # Mooring boat
-    moor_usd = mooring.calc_mooring(grt, is_kabotaj, overtime_pct=overtime_pct)
-    eur = usd_to_eur(moor_usd, usd_eur_rate)
-    lines.append(("Mooring boat", moor_usd, eur))
-
-    # Garbage (compulsory)
-    garb_eur = waste.calc_garbage(use_fixed=True)
-    garb_usd = garb_eur * usd_eur_rate  # EUR -> USD
-    lines.append(("Garbage (Compulsory charge)", round(garb_usd, 2), garb_eur))
-
-    # Harbour Master dues
-    lcb_usd = harbour.calc_lcb(nrt, usd_tl_rate)
-    eur = usd_to_eur(lcb_usd, usd_eur_rate)
-    lines.append(("Harbour Master dues", lcb_usd, eur))
-
-    # Liman Hizmet Ücreti / Port Service Fee (2026 TL tarifesi)
-    liman_hizmet_usd = harbour.calc_liman_hizmet(gt, is_turk, usd_tl_rate)
-    lines.append(("Port Service Fee", liman_hizmet_usd, usd_to_eur(liman_hizmet_usd, usd_eur_rate)))
-
-    # Sanitary dues
-    san_usd = harbour.calc_sahil_saglik(nrt, usd_tl_rate)
-    eur = usd_to_eur(san_usd, usd_eur_rate)
-    lines.append(("Sanitary dues", san_usd, eur))
-
-    # Light dues
-    light_usd = other.calc_light_dues()
-    eur = usd_to_eur(light_usd, usd_eur_rate)
-    lines.append(("Light dues", light_usd, eur))
-
-    # Customs Overtime
-    customs_usd = harbour.calc_customs_overtime(cargo_mt or 0, is_import, usd_tl_rate)
-    eur = usd_to_eur(customs_usd, usd_eur_rate)
-    lines.append(("Customs Overtime", customs_usd, eur))
-
-    # Anchorage dues
-    if anchorage_days > 0:
-        anch_usd = anchorage.calc_anchorage(grt, anchorage_days, is_turk)
-        eur = usd_to_eur(anch_usd, usd_eur_rate)
-        lines.append(("Anchorage dues (For {} days)".format(anchorage_days), anch_usd, eur))
-
-    # Chamber of shipping fee
-    chamber_fee_usd = other.calc_chamber_shipping_fee()
-    eur = usd_to_eur(chamber_fee_usd, usd_eur_rate)
-    lines.append(("Chamber of shipping fee", chamber_fee_usd, eur))
-
-    # Chamber of shipping share on freight
-    chamber_share_usd = harbour.calc_chamber_freight(cargo_mt or 0, is_turk)
-    if chamber_share_usd > 0:
-        eur = usd_to_eur(chamber_share_usd, usd_eur_rate)
-        lines.append(("Chamber of shipping share on freight", chamber_share_usd, eur))
-
-    # Maritime Association
-    mar_eur = other.calc_maritime_assoc()
-    mar_usd = mar_eur / usd_eur_rate
-    lines.append(("Contr. to Maritime Association fee", round(mar_usd, 2), mar_eur))
-
-    # Motorboat (port'a göre: İzmir 225 USD, diğer 500 USD)
-    motor_usd = other.calc_motorboat(port)
-    eur = usd_to_eur(motor_usd, usd_eur_rate)
-    lines.append(("Motorboat exp.", motor_usd, eur))
-
-    # Port bazlı ek kalemler
-    port_cfg = PORT_SPECIFIC.get(port.upper(), {})
-    if port_cfg.get("yolluk") and port.upper() == "IZMIR":
-        yolluk_usd = harbour.calc_izmir_yolluk(usd_tl_rate)
-        lines.append(("İzmir Yolluk", yolluk_usd, usd_to_eur(yolluk_usd, usd_eur_rate)))
-    if port_cfg.get("muhafaza") and port.upper() == "ALIAGA":
-        muh_usd, yolluk_usd = harbour.calc_aliaga_guards(usd_tl_rate)
-        lines.append(("Aliaga Muhafaza Mesai", muh_usd, usd_to_eur(muh_usd, usd_eur_rate)))
-        lines.append(("Aliaga Muhafaza Yolluk", yolluk_usd, usd_to_eur(yolluk_usd, usd_eur_rate)))
-
-    # Facilities, Transportation, Fiscal, Communication
-    fac_eur = other.calc_facilities()
-    fac_usd = fac_eur / usd_eur_rate
-    lines.append(("Facilities & Other exp.", round(fac_usd, 2), fac_eur))
-
-    trans_eur = other.calc_transportation()
-    trans_usd = trans_eur / usd_eur_rate
-    lines.append(("Transportation exp.", round(trans_usd, 2), trans_eur))
-
-    fisc_eur = other.calc_fiscal_notary()
-    fisc_usd = fisc_eur / usd_eur_rate
-    lines.append(("Fiscal & Notary exp.", round(fisc_usd, 2), fisc_eur))
-
-    comm_eur = other.calc_communication_stamp()
-    comm_usd = comm_eur / usd_eur_rate
-    lines.append(("Communication & Copy & Stamp exp.", round(comm_usd, 2), comm_eur))
-
-    # Supervision (USD cinsinden hesaplanır, proforma örneğine göre)
-    superv_usd = other.calc_supervision(cargo_mt or 0, goproz_rate=None, is_domestic=is_domestic)
-    if superv_usd > 0:
-        superv_eur = usd_to_eur(superv_usd, usd_eur_rate)
-        lines.append(("Supervision fee (as per official tariff)", round(superv_usd, 2), round(superv_eur, 2)))
-
-    # Agency fee
-    agency_eur = agency.calc_agency_fee(nrt, berth_days)
-    agency_usd = agency_eur / usd_eur_rate
-    lines.append(("Agency fee (as per official tariff)", round(agency_usd, 2), round(agency_eur, 2)))
-
-    # Total
-    total_usd = sum(l[1] for l in lines)
-    total_eur = sum(l[2] for l in lines)
-
-    st.subheader("Proforma Sonucu")
-    st.markdown(f"**{vessel_name}** - {port} - {purpose}")
-    st.markdown("---")
-
-    import pandas as pd
-    df = pd.DataFrame(lines, columns=["Açıklama", "USD", "EUR"])
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    st.markdown("---")
-    st.metric("Toplam Port Masrafları (USD)", f"{total_usd:,.2f}")
-    st.metric("Toplam Port Masrafları (EUR)", f"{total_eur:,.2f}")
-
-    st.caption("E. & O.E. - All items are subject to final verification against official tariffs.")
+# Güncel kur snapshot'ı (form varsayılanları)
+rate_snapshot = get_rate_provider().get()
+
+# Form yok: her değişiklikte önizleme güncellenir, sadece etkilenen kalemler yeniden hesaplanır
+st.subheader("Gemi Bilgileri")
+col1, col2 = st.columns(2)
+with col1:
+    vessel_name = st.text_input("Gemi Adı", value="MV SEA SPRINTER")
+    nrt = st.number_input("NRT", min_value=1, value=2196)
+    grt = st.number_input("GRT", min_value=1, value=5197)
+    gt = st.number_input("GT (Gross Tonnage)", min_value=1, value=5197, help="Barınma için")
+    flag = st.selectbox("Bayrak", ["Yabancı", "Türkiye"])
+with col2:
+    port = st.selectbox("Liman", PORTS)
+    purpose = st.selectbox("Uğrama Nedeni", ["Loading", "Discharging"])
+    vessel_type = st.selectbox(
+        "Gemi Tipi",
+        list(VESSEL_TYPE_OPTIONS.keys()),
+        format_func=lambda k: VESSEL_TYPE_OPTIONS[k],
+    )
+    kind_of_cargo = st.text_input("Yük Türü", value="SFS PELLETS")
+    cargo_mt = st.number_input("Yük Miktarı (MT)", min_value=0, value=5520)
+    berth_days = st.number_input("Rıhtımda Kalış (gün)", min_value=1, value=7)
+    anchorage_days = st.number_input("Demirde Kalış (gün)", min_value=0, value=10, help="Demirleme ücreti için")
+
+st.subheader("Kurlar ve Seçenekler")
+col3, col4 = st.columns(2)
+with col3:
+    usd_eur_rate = st.number_input("1 USD = ? EUR", value=rate_snapshot.usd_eur, format="%.4f")
+    usd_tl_rate = st.number_input("1 USD = ? TL", value=rate_snapshot.usd_tl, format="%.2f")
+with col4:
+    overtime = st.checkbox("%50 Mesai (Hafta sonu / Bayram)", value=False)
+    tanker = st.checkbox("Tanker Zammı (%0.30)", value=False)
+    four_tugs = st.checkbox("4 Römorkör (5000+ GRT)", value=False)
+
+with st.expander("Opsiyonel Hizmetler"):
+    col5, col6, col7 = st.columns(3)
+    with col5:
+        protective_agency = st.checkbox("Koruyucu Acentelik (Tarife 2)")
+        auto_service = st.checkbox("Oto Servis")
+        stamp_duties = st.checkbox("Damga Pulu (özet beyan, ordino, talepname)")
+        spare_parts_kg = st.number_input("Yedek Parça (kg)", min_value=0.0, value=0.0, step=10.0)
+        bunker_operations = st.number_input("Bunker Gözetimi (operasyon)", min_value=0, value=0)
+    with col6:
+        crew_change_persons = st.number_input("Mürettebat Değişimi (kişi)", min_value=0, value=0)
+        medical_patients = st.number_input("Doktor / Hastane (hasta)", min_value=0, value=0)
+        transit_visa_persons = st.number_input("Transit Vize (kişi)", min_value=0, value=0)
+        captain_advance_eur = st.number_input("Kaptana Avans (EUR)", min_value=0.0, value=0.0, step=500.0)
+    with col7:
+        st.caption("Dahil miktarı aşan atık (m³) - mesai seçiliyse hafta sonu fiyatı")
+        waste_slop = st.number_input("MARPOL I Slop", min_value=0.0, value=0.0)
+        waste_bilge = st.number_input("MARPOL I Sintine", min_value=0.0, value=0.0)
+        waste_marpol4 = st.number_input("MARPOL IV", min_value=0.0, value=0.0)
+        waste_marpol5 = st.number_input("MARPOL V", min_value=0.0, value=0.0)
+
+
+def _form_rates(usd_eur: float, usd_tl: float) -> Rates:
+    """Form kurları snapshot'la aynıysa snapshot kimliği kaydedilir, elle değiştirildiyse None"""
+    if usd_eur == rate_snapshot.usd_eur and usd_tl == rate_snapshot.usd_tl:
+        return Rates.from_snapshot(rate_snapshot)
+    return Rates(usd_eur=usd_eur, usd_tl=usd_tl)
+
+
+call = PortCall(
+    vessel=Vessel(
+        name=vessel_name,
+        nrt=nrt,
+        grt=grt,
+        gt=gt,
+        vessel_type=vessel_type,
+        is_turk_flag=flag == "Türkiye",
+    ),
+    port=port,
+    purpose=purpose,
+    kind_of_cargo=kind_of_cargo,
+    cargo_mt=cargo_mt,
+    berth_days=berth_days,
+    anchorage_days=anchorage_days,
+    rates=_form_rates(usd_eur_rate, usd_tl_rate),
+    options=Options(overtime=overtime, tanker=tanker, four_tugs=four_tugs),
+    services=Services(
+        protective_agency=protective_agency,
+        spare_parts_kg=spare_parts_kg,
+        bunker_operations=bunker_operations,
+        crew_change_persons=crew_change_persons,
+        medical_patients=medical_patients,
+        captain_advance_eur=captain_advance_eur,
+        transit_visa_persons=transit_visa_persons,
+        waste_marpol1_slop_m3=waste_slop,
+        waste_marpol1_bilge_m3=waste_bilge,
+        waste_marpol4_m3=waste_marpol4,
+        waste_marpol5_m3=waste_marpol5,
+        auto_service=auto_service,
+        stamp_duties=stamp_duties,
+    ),
+)
+
+# Oturum başına artımlı hesap: önceki girdilerle aynı kalemler tekrar kullanılır
+if "proforma_preview" not in st.session_state:
+    st.session_state.proforma_preview = IncrementalProforma(proforma_engine())
+preview = st.session_state.proforma_preview
+if profile_mode:
+    # Tam hesap: artımlı önbellek boşaltılıp tüm kalemler yeniden hesaplanır
+    from utils.profiling import profile_call
+    preview.reset()
+    proforma, profile = profile_call(preview.update, call, mode=profile_mode, label="proforma")
+    st.session_state.proforma_profile = (profile, profile.save())
+else:
+    proforma = preview.update(call)
+
+# Kaydedilmiş proforma girdiler değişince geçersiz olur
+saved = st.session_state.get("proforma_saved")
+if saved and saved[0] != call:
+    saved = st.session_state.proforma_saved = None
+
+st.subheader("Proforma Önizleme")
+st.markdown(f"**{vessel_name}** - {port} - {purpose}")
+st.caption(f"Tarife: {proforma.tariff_version} - {len(preview.last_recomputed)} kalem yeniden hesaplandı")
+st.markdown("---")
+
+import pandas as pd
+df = pd.DataFrame(proforma.as_rows(), columns=["Açıklama", "USD", "EUR"])
+st.dataframe(df, use_container_width=True, hide_index=True)
+
+st.markdown("---")
+st.metric("Toplam Port Masrafları (USD)", f"{proforma.total_usd:,.2f}")
+st.metric("Toplam Port Masrafları (EUR)", f"{proforma.total_eur:,.2f}")
+
+st.caption("E. & O.E. - All items are subject to final verification against official tariffs.")
+
+# Son profil, bir sonraki isteğe kadar gösterilir (indirme düğmesi sayfayı yeniden çalıştırır)
+if st.session_state.get("proforma_profile") and is_admin():
+    profile, profile_path = st.session_state.proforma_profile
+    with st.expander(f"Profil ({profile.mode}) - {profile.seconds * 1000:.1f} ms", expanded=profile_mode is not None):
+        st.dataframe(profile.top, use_container_width=True, hide_index=True)
+        st.caption(f"Kaydedildi: {profile_path}")
+        st.download_button("Katlanmış yığın (.folded) indir", data=profile.folded_text(),
+                           file_name=profile_path.name, mime="text/plain")
+
+if st.button("Kaydet", type="primary", disabled=saved is not None):
+    saved = st.session_state.proforma_saved = (call, save_proforma(user["id"], proforma))
+    st.rerun()
+
+if saved:
+    proforma_id = saved[1]
+    st.caption(f"Proforma No: {proforma_id} - Geçmiş Proformalar sayfasından tekrar görüntülenebilir.")
+    # Excel: kaydedilen kalemlerden (hesap tekrarlanmaz, openpyxl burada yüklenir)
+    from history.export import XLSX_MIME
+    st.download_button(
+        "Excel İndir",
+        data=proforma_excel(proforma_id, user["id"]),
+        file_name=f"proforma_{proforma_id}.xlsx",
+        mime=XLSX_MIME,
+    )
+
+# Kalış süresi duyarlılığı: her adımda sadece kalış süresine bağlı kalemler hesaplanır.
+# Expander içeriği kapalıyken de çalıştığından grafik sadece açıldığında üretilir.
+if st.toggle("Kalış Süresi Duyarlılığı"):
+    sweep_field = st.radio(
+        "Değişken", SWEEP_FIELDS[:2], horizontal=True,
+        format_func={"berth_days": "Rıhtımda kalış", "anchorage_days": "Demirde kalış"}.get,
+    )
+    max_days = st.slider("En fazla gün", min_value=5, max_value=60, value=30)
+    start_day = 1 if sweep_field == "berth_days" else 0
+    days = list(range(start_day, max_days + 1))
+    results = sweep(call, sweep_field, days, engine=proforma_engine())
+    sensitivity = pd.DataFrame(
+        {"Gün": days, "Toplam USD": [float(p.total_usd) for p in results], "Toplam EUR": [float(p.total_eur) for p in results]},
+    ).set_index("Gün")
+    st.line_chart(sensitivity)
@@ -1,8 +1,15 @@
 """
-Geçmiş Proformalar - (İleride proforma kayıtları listelenecek)
+Geçmiş Proformalar - Kaydedilen proformaların listesi, arama ve detay
 """
 import streamlit as st
-from auth.session import init_session, is_logged_in
+from auth.session import init_session, is_logged_in, get_user
+from config.settings import PORTS
+from history.store import list_proformas, get_proforma, iter_proformas
+from utils.resources import proforma_excel
+
+# history.export (openpyxl) sadece Excel üretilirken yüklenir
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_LAYOUTS = {"summary": "Tek özet sayfası", "per_vessel": "Gemi başına sayfa"}
 
 init_session()
 if not is_logged_in():
@@ -11,4 +18,92 @@ if not is_logged_in():
 
 st.set_page_config(page_title="Geçmiş Proformalar", page_icon="📁", layout="wide")
 st.title("Geçmiş Proformalar")
-st.info("Bu bölüm yakında eklenecek. Oluşturduğunuz proformalar burada listelenecek.")
+
+user = get_user()
+
+# Filtreler
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    vessel_filter = st.text_input("Gemi Adı (başlangıç)")
+with col2:
+    port_filter = st.selectbox("Liman", ["Tümü"] + PORTS)
+with col3:
+    date_from = st.date_input("Başlangıç Tarihi", value=None)
+with col4:
+    date_to = st.date_input("Bitiş Tarihi", value=None)
+
+filters = (vessel_filter, port_filter, date_from, date_to)
+
+# Keyset sayfalama: her sayfanın başlangıç cursor'u bir yığında tutulur
+if st.session_state.get("history_filters") != filters:
+    st.session_state.history_filters = filters
+    st.session_state.history_cursors = [None]
+    st.session_state.history_export = None
+
+cursors = st.session_state.history_cursors
+items, next_cursor = list_proformas(
+    user_id=user["id"],
+    vessel=vessel_filter,
+    port="" if port_filter == "Tümü" else port_filter,
+    date_from=date_from,
+    date_to=date_to,
+    after=cursors[-1],
+)
+
+if not items:
+    st.info("Kayıtlı proforma bulunamadı.")
+    st.stop()
+
+import pandas as pd
+df = pd.DataFrame(items)[["id", "created_at", "vessel_name", "port", "purpose", "total_usd", "total_eur"]]
+df.columns = ["No", "Tarih (UTC)", "Gemi", "Liman", "Uğrama Nedeni", "Toplam USD", "Toplam EUR"]
+st.dataframe(df, use_container_width=True, hide_index=True)
+
+nav1, nav2, _ = st.columns([1, 1, 6])
+with nav1:
+    if len(cursors) > 1 and st.button("Önceki Sayfa"):
+        cursors.pop()
+        st.rerun()
+with nav2:
+    if next_cursor and st.button("Sonraki Sayfa"):
+        cursors.append(next_cursor)
+        st.rerun()
+
+# Filtreye uyan tüm proformaları Excel'e aktar (sadece sayfa değil)
+with st.expander("Excel'e Aktar"):
+    layout = st.radio("Düzen", list(EXPORT_LAYOUTS), format_func=EXPORT_LAYOUTS.get, horizontal=True)
+    if st.button("Excel Hazırla"):
+        from history.export import batch_xlsx
+        records = iter_proformas(
+            user_id=user["id"],
+            vessel=vessel_filter,
+            port="" if port_filter == "Tümü" else port_filter,
+            date_from=date_from,
+            date_to=date_to,
+            by_vessel=layout == "per_vessel",
+        )
+        st.session_state.history_export = batch_xlsx(records, layout)
+    if st.session_state.get("history_export"):
+        st.download_button("Excel İndir", data=st.session_state.history_export,
+                           file_name="proformalar.xlsx", mime=XLSX_MIME)
+
+st.markdown("---")
+selected_id = st.selectbox("Proforma Detayı", [item["id"] for item in items])
+record = get_proforma(selected_id, user_id=user["id"])
+if record:
+    st.subheader(f"{record['vessel_name']} - {record['port']} - {record['purpose']}")
+    st.caption(
+        f"NRT {record['nrt']:g} / GRT {record['grt']:g} / GT {record['gt']:g} - "
+        f"Kur: 1 USD = {record['usd_eur_rate']:.4f} EUR, {record['usd_tl_rate']:.2f} TL "
+        f"({record['rate_snapshot_id'] or 'elle girildi'}) - "
+        f"Tarife: {record['tariff_version'] or '-'}"
+    )
+    lines = pd.DataFrame(
+        [(l["label"], float(l["usd"]), float(l["eur"])) for l in record["lines"]],
+    )
+    lines.columns = ["Açıklama", "USD", "EUR"]
+    st.dataframe(lines, use_container_width=True, hide_index=True)
+    st.metric("Toplam Port Masrafları (USD)", f"{record['total_usd']:,.2f}")
+    st.metric("Toplam Port Masrafları (EUR)", f"{record['total_eur']:,.2f}")
+    st.download_button("Proforma Excel İndir", data=proforma_excel(record["id"], user["id"]),
+                       file_name=f"proforma_{record['id']}.xlsx", mime=XLSX_MIME)
@@ -0,0 +1,112 @@
+"""
+Senaryo Karşılaştırma - Tek gemi için tüm limanlar ve seçenekler (mesai, 4 römorkör, tanker)
+"""
+import streamlit as st
+from auth.session import init_session, is_logged_in
+from config.settings import PORTS
+from calculators.engine import PortCall, Vessel, Rates, Options
+from calculators.scenarios import compare_scenarios
+from utils.rates import get_rate_provider
+from utils.resources import proforma_engine
+
+init_session()
+if not is_logged_in():
+    st.warning("Giriş yapmalısınız.")
+    st.stop()
+
+st.set_page_config(page_title="Senaryo Karşılaştırma", page_icon="🔀", layout="wide")
+st.title("Senaryo Karşılaştırma")
+st.caption("Aynı gemi tüm limanlar ve mesai / 4 römorkör / tanker kombinasyonlarıyla tek seferde fiyatlanır.")
+
+VESSEL_TYPE_OPTIONS = {
+    "kabotaj": "Kabotaj Hattında Çalışan",
+    "yolcu_feribot": "Yolcu / Feribot / Ro-Ro",
+    "konteyner": "Konteyner",
+    "diger_yuk": "Diğer Yük Gemisi",
+    "diger_tum": "Diğer Tüm Gemiler",
+}
+
+rate_snapshot = get_rate_provider().get()
+
+with st.form("scenario_form"):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        vessel_name = st.text_input("Gemi Adı", value="MV SEA SPRINTER")
+        nrt = st.number_input("NRT", min_value=1, value=2196)
+        grt = st.number_input("GRT", min_value=1, value=5197)
+        gt = st.number_input("GT (Gross Tonnage)", min_value=1, value=5197)
+        flag = st.selectbox("Bayrak", ["Yabancı", "Türkiye"])
+    with col2:
+        vessel_type = st.selectbox(
+            "Gemi Tipi",
+            list(VESSEL_TYPE_OPTIONS.keys()),
+            format_func=lambda k: VESSEL_TYPE_OPTIONS[k],
+        )
+        purpose = st.selectbox("Uğrama Nedeni", ["Loading", "Discharging"])
+        cargo_mt = st.number_input("Yük Miktarı (MT)", min_value=0, value=5520)
+        berth_days = st.number_input("Rıhtımda Kalış (gün)", min_value=1, value=7)
+        anchorage_days = st.number_input("Demirde Kalış (gün)", min_value=0, value=10)
+    with col3:
+        base_port = st.selectbox("Temel Liman", PORTS, help="Farklar bu senaryoya göre gösterilir")
+        overtime = st.checkbox("Temel: %50 Mesai", value=False)
+        four_tugs = st.checkbox("Temel: 4 Römorkör", value=False)
+        tanker = st.checkbox("Temel: Tanker Zammı", value=False)
+        ports = st.multiselect("Karşılaştırılacak Limanlar", PORTS, default=PORTS)
+
+    submitted = st.form_submit_button("Karşılaştır")
+
+if submitted:
+    if not ports:
+        st.error("En az bir liman seçin.")
+        st.stop()
+    call = PortCall(
+        vessel=Vessel(
+            name=vessel_name,
+            nrt=nrt,
+            grt=grt,
+            gt=gt,
+            vessel_type=vessel_type,
+            is_turk_flag=flag == "Türkiye",
+        ),
+        port=base_port,
+        purpose=purpose,
+        cargo_mt=cargo_mt,
+        berth_days=berth_days,
+        anchorage_days=anchorage_days,
+        rates=Rates.from_snapshot(rate_snapshot),
+        options=Options(overtime=overtime, tanker=tanker, four_tugs=four_tugs),
+    )
+    st.session_state.scenario_matrix = compare_scenarios(call, ports=ports, engine=proforma_engine())
+
+matrix = st.session_state.get("scenario_matrix")
+if matrix is not None:
+    import pandas as pd
+
+    base = matrix.scenarios[matrix.baseline]
+    cheapest = matrix.cheapest()
+    st.markdown(f"**Temel senaryo:** {base.label} - **En düşük:** {cheapest.label}")
+
+    only_varying = st.checkbox("Sadece senaryoya göre değişen kalemler", value=True)
+    rows = matrix.rows(only_varying=only_varying)
+    deltas = matrix.deltas_usd()
+
+    # Senaryo başına bir satır: değişen kalemler, toplam ve temel senaryoya göre fark
+    table = pd.DataFrame(
+        [
+            [scenario.label]
+            + [float(row.usd[i]) if row.usd[i] is not None else None for row in rows]
+            + [float(matrix.totals_usd[i]), float(matrix.totals_eur[i]), float(deltas[i])]
+            for i, scenario in enumerate(matrix.scenarios)
+        ],
+        columns=["Senaryo"] + [row.label for row in rows] + ["Toplam USD", "Toplam EUR", "Fark USD"],
+    )
+    st.dataframe(
+        table.style.format(precision=2, na_rep="-").map(
+            lambda d: "color: #c0392b" if d > 0 else ("color: #1e8449" if d < 0 else ""),
+            subset=["Fark USD"],
+        ),
+        use_container_width=True,
+        hide_index=True,
+        height=min(38 * (len(table) + 1), 900),
+    )
+    st.caption("Tutarlar USD. Boş hücre: kalem o senaryoda uygulanmıyor.")
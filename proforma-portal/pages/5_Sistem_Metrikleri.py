@@ -0,0 +1,93 @@
+"""
+Sistem Metrikleri - Yönetici için süre ölçümleri (hesaplayıcı, kur, DB, proforma kalemleri)
+"""
+import streamlit as st
+from auth.session import init_session, is_logged_in, is_admin
+from auth.hashing import hash_metrics
+from calculators.memo import memo_stats
+from utils import metrics
+from utils.profiling import recent_profiles
+from utils.resources import metrics as configure_metrics
+
+init_session()
+if not is_logged_in():
+    st.warning("Giriş yapmalısınız.")
+    st.stop()
+if not is_admin():
+    st.warning("Bu sayfa yalnızca yöneticiler içindir.")
+    st.stop()
+
+st.set_page_config(page_title="Sistem Metrikleri", page_icon="📈", layout="wide")
+st.title("Sistem Metrikleri")
+st.caption("Süreç içi sayaçlar ve gecikme histogramları. Ölçüm kapalıyken çağrılara ek maliyet yoktur.")
+
+configure_metrics()
+
+col1, col2 = st.columns([3, 1])
+with col1:
+    enabled = st.toggle("Süre ölçümü açık", value=metrics.is_enabled(),
+                        help="Bu Streamlit sürecindeki tüm oturumlar için geçerlidir.")
+    if enabled != metrics.is_enabled():
+        metrics.set_enabled(enabled)
+with col2:
+    if st.button("Sıfırla"):
+        metrics.reset()
+
+GROUPS = {
+    "build_seconds": "Proforma hesabı",
+    "line_seconds": "Proforma kalemleri",
+    "calculator_seconds": "Hesaplayıcılar (calc_*)",
+    "exchange_seconds": "Kur dönüşümleri",
+    "db_seconds": "Veritabanı (SQLite, bcrypt hariç)",
+    "hash_seconds": "bcrypt",
+}
+
+rows = metrics.snapshot()
+if not rows:
+    st.info("Henüz ölçüm yok. Ölçümü açıp birkaç proforma oluşturun.")
+for name, title in GROUPS.items():
+    group = [row for row in rows if row["name"] == name]
+    if not group:
+        continue
+    st.subheader(title)
+    st.dataframe(
+        [
+            {
+                "Ad": ", ".join(str(v) for v in row["labels"].values()),
+                "Çağrı": row["count"],
+                "Toplam (ms)": round(row["total"] * 1000, 3),
+                "Ort. (µs)": round(row["avg"] * 1e6, 1),
+                "p50 ≤ (µs)": round(row["p50"] * 1e6, 1),
+                "p95 ≤ (µs)": round(row["p95"] * 1e6, 1),
+                "Maks. (µs)": round(row["max"] * 1e6, 1),
+            }
+            for row in group
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+st.subheader("Tarife memo cache")
+st.dataframe(
+    [{"Fonksiyon": fn, **stats} for fn, stats in memo_stats().items()],
+    use_container_width=True,
+    hide_index=True,
+)
+
+hashing = hash_metrics()
+st.caption(f"bcrypt: {hashing['workers']} işçi, cost {hashing['rounds']}, kuyruk dolu reddi: {hashing['busy']}")
+
+st.subheader("Prometheus çıktısı")
+text = metrics.render_prometheus()
+st.download_button("metrics.txt indir", data=text, file_name="metrics.txt", mime="text/plain")
+with st.expander("Metin"):
+    st.code(text, language="text")
+
+st.subheader("Profiller")
+st.caption("Proforma Oluştur'daki \"Bu hesabı profille\" düğmesi veya toplu işlerin ürettiği katlanmış yığınlar "
+           "(flamegraph.pl / speedscope). PROFILE_DIR'de son PROFILE_KEEP profil tutulur.")
+profiles = recent_profiles()
+if not profiles:
+    st.info("Henüz profil yok.")
+for path in profiles:
+    st.download_button(path.name, data=path.read_bytes(), file_name=path.name, mime="text/plain", key=f"profile_{path.name}")
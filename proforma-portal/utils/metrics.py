@@ -0,0 +1,339 @@
+"""
+Süreç içi metrikler - sayaçlar ve gecikme histogramları
+set_enabled(True) hesaplayıcı (calc_*), kur dönüşümü, SQLite bağlantı
+blokları, proforma kalemleri ve motor çağrılarını süre ölçen sarmalayıcılarla
+değiştirir; kapatınca orijinal fonksiyonlar geri konur. Kapalıyken çağrı
+başına ek maliyet yoktur. bcrypt süreleri (auth.hashing) her zaman tutulur;
+db_seconds bcrypt'i içermez, ikisi doğrudan karşılaştırılabilir.
+Çıktı: snapshot() (admin sayfası) ve render_prometheus() (metin biçimi).
+"""
+import importlib
+import sys
+import threading
+from dataclasses import replace
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional
+
+from config.settings import METRICS_ENABLED
+
+# Hızlı çağrılar için histogram üst sınırları (saniye)
+FAST_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+PREFIX = "proforma_"
+
+_CALCULATOR_MODULES = (
+    "agency", "anchorage", "berthing", "harbour", "mooring", "other", "pilotage", "tugboat", "waste",
+)
+_EXCHANGE_FUNCTIONS = ("usd_to_eur", "eur_to_usd", "usd_to_tl", "tl_to_usd", "convert_line_usd_eur")
+# Havuz bağlantısını kullanan modül -> db etiketi (diğerleri: dosya adı)
+_DB_MODULES = {"auth.database": "users", "history.store": "history"}
+
+
+class LatencyStats:
+    """Gecikme metrikleri: sayı, toplam, maksimum, histogram"""
+
+    def __init__(self, buckets=FAST_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+            else:
+                self.bucket_counts[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Histogramdan yaklaşık yüzdelik: değerin düştüğü kovanın üst sınırı (son kovada max)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            seen = 0
+            for bound, n in zip(self.buckets, self.bucket_counts):
+                seen += n
+                if seen >= target:
+                    return min(bound, self.max)
+            return self.max
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg": self.total / self.count if self.count else 0.0,
+                "max": self.max,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.bucket_counts)),
+            }
+
+
+class Counter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+
+_lock = threading.Lock()
+_histograms: dict[tuple, LatencyStats] = {}
+_counters: dict[tuple, Counter] = {}
+_help: dict[str, str] = {}
+_installed: list[tuple[object, str, object]] = []   # (sahip, ad, orijinal)
+_enabled = False
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def histogram(name: str, help: str = "", buckets=FAST_BUCKETS, **labels) -> LatencyStats:
+    """Ad + etiketlerle histogram (yoksa oluşturulur)"""
+    key = _key(name, labels)
+    with _lock:
+        stats = _histograms.get(key)
+        if stats is None:
+            stats = _histograms[key] = LatencyStats(buckets)
+        if help:
+            _help.setdefault(name, help)
+        return stats
+
+
+def counter(name: str, help: str = "", **labels) -> Counter:
+    """Ad + etiketlerle sayaç (yoksa oluşturulur)"""
+    key = _key(name, labels)
+    with _lock:
+        value = _counters.get(key)
+        if value is None:
+            value = _counters[key] = Counter()
+        if help:
+            _help.setdefault(name, help)
+        return value
+
+
+def timed(fn: Callable, stats: LatencyStats) -> Callable:
+    """fn'in her çağrısının süresini stats'a yazan sarmalayıcı"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.observe(perf_counter() - start)
+    return wrapper
+
+
+def _targets():
+    """(sahip, öznitelik, histogram) - ölçülen tüm çağrı noktaları"""
+    exchange = importlib.import_module("utils.exchange")
+    for name in _EXCHANGE_FUNCTIONS:
+        yield exchange, name, histogram("exchange_seconds", "Kur dönüşümü süresi", fn=name)
+    money = importlib.import_module("utils.money")
+    yield money.Money, "to", histogram("exchange_seconds", fn="Money.to")
+
+    for module_name in _CALCULATOR_MODULES:
+        module = importlib.import_module(f"calculators.{module_name}")
+        for name in sorted(vars(module)):
+            if name.startswith("calc_") and callable(getattr(module, name)):
+                yield module, name, histogram("calculator_seconds", "calc_* fonksiyon süresi", fn=f"{module_name}.{name}")
+        if hasattr(module, "tl_to_usd"):
+            yield module, "tl_to_usd", histogram("exchange_seconds", fn="tl_to_usd")
+
+    engine = importlib.import_module("calculators.engine")
+    for name in ("compute", "compute_scenarios"):
+        yield engine.ProformaEngine, name, histogram("build_seconds", "Proforma hesap süresi", fn=name)
+
+
+class _TimedBlock:
+    """Bağlantı bloğunu saran context manager: havuzdan alma + sorgular + bırakma"""
+    __slots__ = ("_block", "_stats", "_start")
+
+    def __init__(self, block, stats: LatencyStats):
+        self._block = block
+        self._stats = stats
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self._block.__enter__()
+
+    def __exit__(self, *exc):
+        try:
+            return self._block.__exit__(*exc)
+        finally:
+            self._stats.observe(perf_counter() - self._start)
+
+
+def _timed_connection(original: Callable) -> Callable:
+    """
+    ConnectionPool.connection sarmalayıcısı: sadece with bloğunun SQLite
+    işi ölçülür. Blok dışındaki bcrypt (register_user / login_user) sayılmaz.
+    fn etiketi bloğu açan fonksiyondur (get_connection atlanır).
+    """
+    @wraps(original)
+    def connection(pool):
+        frame = sys._getframe(1)
+        if frame.f_code.co_name == "get_connection" and frame.f_back is not None:
+            frame = frame.f_back
+        module = frame.f_globals.get("__name__", "")
+        stats = histogram(
+            "db_seconds", "SQLite süresi: bağlantı bloğu (bekleme + sorgular, bcrypt hariç)",
+            db=_DB_MODULES.get(module, pool.path.stem), fn=frame.f_code.co_name,
+        )
+        return _TimedBlock(original(pool), stats)
+    return connection
+
+
+def _instrument_nodes(engine) -> list[tuple[object, str, object]]:
+    """Kalem düğümlerinin compute'larını sar; motor modülündeki düğüm tuple'ları değiştirilir"""
+    wrapped = {
+        node.code: replace(node, compute=timed(node.compute, histogram(
+            "line_seconds", "Proforma kalemi hesap süresi", code=node.code,
+        )))
+        for node in engine.LINE_NODES
+    }
+    originals = []
+    for name in ("CORE_NODES", "SERVICE_NODES", "LINE_NODES"):
+        nodes = getattr(engine, name)
+        originals.append((engine, name, nodes))
+        setattr(engine, name, tuple(wrapped[node.code] for node in nodes))
+    return originals
+
+
+def set_enabled(enabled: bool):
+    """Ölçümü aç / kapat (süreç genelinde)"""
+    global _enabled
+    with _lock:
+        if enabled == _enabled:
+            return
+        _enabled = enabled
+    if enabled:
+        installed = []
+        for owner, name, stats in _targets():
+            original = getattr(owner, name)
+            installed.append((owner, name, original))
+            setattr(owner, name, timed(original, stats))
+        pool = importlib.import_module("utils.sqlite_pool").ConnectionPool
+        installed.append((pool, "connection", pool.connection))
+        pool.connection = _timed_connection(pool.connection)
+        installed += _instrument_nodes(importlib.import_module("calculators.engine"))
+        _installed[:] = installed
+    else:
+        for owner, name, original in reversed(_installed):
+            setattr(owner, name, original)
+        _installed.clear()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def configure():
+    """Ortam ayarına göre başlangıç durumu (METRICS_ENABLED)"""
+    if METRICS_ENABLED:
+        set_enabled(True)
+
+
+def reset():
+    """Tüm sayaç ve histogramları sıfırla"""
+    with _lock:
+        items = list(_histograms.values()) + list(_counters.values())
+    for item in items:
+        item.reset()
+
+
+def snapshot() -> list[dict]:
+    """Histogram özetleri: ad, etiketler, sayı, toplam / ortalama / p50 / p95 / max (sn)"""
+    with _lock:
+        items = list(_histograms.items())
+    rows = []
+    for (name, labels), stats in items:
+        if not stats.count:
+            continue
+        rows.append({
+            "name": name,
+            "labels": dict(labels),
+            "count": stats.count,
+            "total": stats.total,
+            "avg": stats.total / stats.count,
+            "p50": stats.quantile(0.50),
+            "p95": stats.quantile(0.95),
+            "max": stats.max,
+        })
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def counters() -> list[dict]:
+    with _lock:
+        items = list(_counters.items())
+    return [{"name": name, "labels": dict(labels), "value": c.value} for (name, labels), c in items]
+
+
+def _labels(labels, extra: Optional[tuple] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render_prometheus() -> str:
+    """Prometheus metin biçimi (text/plain; version=0.0.4)"""
+    from calculators.memo import memo_stats
+
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counter_items = sorted(_counters.items())
+    out = []
+    seen = set()
+    for (name, labels), stats in histograms:
+        full = PREFIX + name
+        if full not in seen:
+            seen.add(full)
+            if name in _help:
+                out.append(f"# HELP {full} {_help[name]}")
+            out.append(f"# TYPE {full} histogram")
+        snap = stats.snapshot()
+        cumulative = 0
+        for bound, n in snap["buckets"].items():
+            cumulative += n
+            out.append(f"{full}_bucket{_labels(labels, ('le', bound))} {cumulative}")
+        out.append(f"{full}_sum{_labels(labels)} {stats.total:.9f}")
+        out.append(f"{full}_count{_labels(labels)} {stats.count}")
+    for (name, labels), value in counter_items:
+        full = PREFIX + name
+        if full not in seen:
+            seen.add(full)
+            if name in _help:
+                out.append(f"# HELP {full} {_help[name]}")
+            out.append(f"# TYPE {full} counter")
+        out.append(f"{full}{_labels(labels)} {value.value}")
+
+    memo = memo_stats()
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("size", "gauge")):
+        full = f"{PREFIX}memo_{field}" + ("_total" if kind == "counter" else "")
+        out.append(f"# TYPE {full} {kind}")
+        for fn, stats in memo.items():
+            out.append(f'{full}{{fn="{fn}"}} {stats[field]}')
+    out.append(f"# TYPE {PREFIX}metrics_enabled gauge")
+    out.append(f"{PREFIX}metrics_enabled {int(_enabled)}")
+    return "\n".join(out) + "\n"
@@ -0,0 +1,131 @@
+"""
+Para tipi - Decimal tutar + para birimi (USD / EUR / TL)
+Hesaplayıcılar tam (yuvarlanmamış) değer üretir; yuvarlama proforma
+çıktısında kalem başına bir kez yapılır, toplamlar yuvarlanmış kalemlerin
+tam Decimal toplamıdır (faturayla kuruşu kuruşuna tutar).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+USD = "USD"
+EUR = "EUR"
+TL = "TL"
+
+CENT = Decimal("0.01")
+
+_EXACT = ContextVar("exact_money", default=False)
+
+
+def money_round(value: float) -> float:
+    """
+    Hesaplayıcıların ara yuvarlaması: round(value, 2).
+    exact_money() bloğu içinde değer yuvarlanmadan döner.
+    """
+    if _EXACT.get():
+        return value
+    return round(value, 2)
+
+
+def is_exact() -> bool:
+    """exact_money() bloğu içinde mi"""
+    return _EXACT.get()
+
+
+@contextmanager
+def exact_money():
+    """Blok içinde calculators.* ve utils.exchange yuvarlamasız çalışır"""
+    token = _EXACT.set(True)
+    try:
+        yield
+    finally:
+        _EXACT.reset(token)
+
+
+@lru_cache(maxsize=1024)
+def to_decimal(value) -> Decimal:
+    """float/int -> Decimal (float'ın kısa gösterimi üzerinden, ikili artık taşımaz)"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(repr(float(value)))
+
+
+class Money:
+    """Para birimi etiketli Decimal tutar"""
+    __slots__ = ("amount", "currency")
+
+    def __init__(self, amount: Decimal, currency: str):
+        self.amount = amount
+        self.currency = currency
+
+    @classmethod
+    def of(cls, value, currency: str) -> "Money":
+        return cls(to_decimal(value), currency)
+
+    def rounded(self) -> "Money":
+        """Kuruşa yuvarla (ROUND_HALF_UP) - sunum aşaması"""
+        return Money(self.amount.quantize(CENT, rounding=ROUND_HALF_UP), self.currency)
+
+    def to(self, currency: str, rate, multiply: bool = False) -> "Money":
+        """Kur ile çevir: varsayılan tutar / rate, multiply=True ise tutar * rate"""
+        rate = to_decimal(rate)
+        if rate <= 0:
+            return Money(Decimal(0), currency)
+        amount = self.amount * rate if multiply else self.amount / rate
+        return Money(amount, currency)
+
+    @property
+    def minor(self) -> int:
+        """Kuruş cinsinden tam sayı (yuvarlanmış tutar için)"""
+        return int(self.amount.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+    def _check(self, other: "Money"):
+        if self.currency != other.currency:
+            raise ValueError(f"Farklı para birimleri: {self.currency} / {other.currency}")
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            self._check(other)
+            return Money(self.amount + other.amount, self.currency)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other: "Money") -> "Money":
+        self._check(other)
+        return Money(self.amount - other.amount, self.currency)
+
+    def __mul__(self, factor) -> "Money":
+        return Money(self.amount * to_decimal(factor), self.currency)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.currency == other.currency and self.amount == other.amount
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.amount, self.currency))
+
+    def __lt__(self, other: "Money") -> bool:
+        self._check(other)
+        return self.amount < other.amount
+
+    def __bool__(self) -> bool:
+        return bool(self.amount)
+
+    def __float__(self) -> float:
+        return float(self.amount)
+
+    def __format__(self, spec: str) -> str:
+        return format(self.amount, spec)
+
+    def __str__(self) -> str:
+        return f"{self.amount} {self.currency}"
+
+    def __repr__(self) -> str:
+        return f"Money({str(self.amount)!r}, {self.currency!r})"
@@ -0,0 +1,238 @@
+"""
+İsteğe bağlı profil çıkarma - tek proforma hesabı veya tek toplu iş
+İki mod: "cprofile" (deterministik, çağrı sayıları kesin) ve "sampling"
+(ayrı thread çalışan thread'in yığınını PROFILE_INTERVAL_MS aralıkla
+örnekler, ek yükü düşüktür). Her iki mod da aynı çıktıyı üretir:
+flame graph araçlarının okuduğu katlanmış yığın metni (flamegraph.pl,
+speedscope, inferno) ve en sıcak N fonksiyonun tablosu. Süreç içinde
+çalışır; Streamlit sunucusunda kullanıcının kendi kur ve seçenekleriyle.
+Profiller sırayla çalışır (switch interval süreç genelidir); PROFILE_DIR'e
+otomatik adla yazılanlardan son PROFILE_KEEP tanesi tutulur.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from config.settings import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_TOP_N
+
+MODES = ("cprofile", "sampling")
+
+# cProfile çağrı grafiğinden yığın türetirken en fazla derinlik
+MAX_DEPTH = 64
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Aynı anda tek profil: sys.setswitchinterval süreç genelidir, iç içe kaydet/geri yükle
+# adımları karışırsa sunucu düşük aralıkta kalır
+_LOCK = threading.Lock()
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_APP_DIR):
+        return os.path.relpath(filename, _APP_DIR)
+    parts = Path(filename).parts
+    return "/".join(parts[-2:]) if len(parts) > 1 else filename
+
+
+def frame_name(filename: str, line: int, name: str) -> str:
+    """Yığın elemanı: fonksiyon (dosya:satır) - katlanmış metinde ';' kullanılamaz"""
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{name} ({_short_path(filename)}:{line})".replace(";", ",")
+
+
+@dataclass
+class Profile:
+    """Tek profil sonucu: katlanmış yığınlar ve en sıcak fonksiyonlar"""
+    label: str
+    mode: str
+    seconds: float
+    # yığın ("a;b;c") -> ağırlık: cprofile'da mikro saniye, sampling'de örnek sayısı
+    folded: dict[str, int]
+    top: list[dict] = field(default_factory=list)
+    stats: Optional[pstats.Stats] = None
+
+    def folded_text(self) -> str:
+        return "".join(f"{stack} {weight}\n" for stack, weight in sorted(self.folded.items()) if weight > 0)
+
+    def top_text(self) -> str:
+        lines = [f"{'fonksiyon':<72} {'çağrı':>9} {'öz (ms)':>10} {'toplam (ms)':>12}"]
+        for row in self.top:
+            calls = "-" if row["calls"] is None else str(row["calls"])
+            lines.append(f"{row['function'][:72]:<72} {calls:>9} {row['self_ms']:>10.2f} {row['total_ms']:>12.2f}")
+        return "\n".join(lines)
+
+    def save(self, directory=PROFILE_DIR, path: Optional[str] = None, keep: int = PROFILE_KEEP) -> Path:
+        """
+        Katlanmış yığınları yaz (cprofile'da yanına .pstats da); dosya yolunu döndür.
+        path verilmezse directory'ye zaman damgalı adla yazılır ve en yeni keep profil tutulur.
+        """
+        prune = path is None
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+            path = Path(directory) / f"{stamp}-{self.label}-{self.mode}.folded"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded_text(), encoding="utf-8")
+        if self.stats is not None:
+            self.stats.dump_stats(str(path.with_suffix(".pstats")))
+        if prune:
+            prune_profiles(path.parent, keep)
+        return path
+
+
+def _cprofile_folded(stats: pstats.Stats) -> dict[str, int]:
+    """
+    Çağrı grafiğinden yaklaşık yığınlar: her kenarın toplam süresi
+    çağıranın yoldaki payıyla ölçeklenir. Özyinelemeli kenarlar atlanır.
+    """
+    entries = stats.stats
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, entry in entries.items() if not any(c in entries for c in entry[4])]
+    folded: Counter = Counter()
+
+    def walk(func, path: tuple, names: str, cumulative: float):
+        _cc, _nc, tt, ct, _callers = entries[func]
+        share = cumulative / ct if ct > 0 else 0.0
+        folded[names] += int(round(tt * share * 1e6))
+        if len(path) >= MAX_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            if callee in path or callee not in entries:
+                continue
+            time_on_path = edge_ct * share
+            if time_on_path < 1e-6:
+                continue
+            walk(callee, path + (callee,), f"{names};{frame_name(*callee)}", time_on_path)
+
+    for root in roots:
+        walk(root, (root,), frame_name(*root), entries[root][3])
+    return dict(folded)
+
+
+def _cprofile_top(stats: pstats.Stats, n: int) -> list[dict]:
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:n]
+    return [
+        {"function": frame_name(*func), "calls": nc, "self_ms": tt * 1000, "total_ms": ct * 1000}
+        for func, (_cc, nc, tt, ct, _callers) in rows
+    ]
+
+
+class _Sampler(threading.Thread):
+    """Hedef thread'in yığınını aralıkla örnekle; root çerçevesinin üstü atılır"""
+
+    def __init__(self, thread_id: int, root, interval: float):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            code = None
+            while frame is not None and frame is not self.root:
+                code = frame.f_code
+                stack.append(frame_name(code.co_filename, code.co_firstlineno, code.co_qualname))
+                frame = frame.f_back
+            # fn döndükten sonra stop() içindeki örnekler sayılmaz
+            if stack and code is not _Sampler.stop.__code__:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _sampling_top(samples: Counter, seconds: float, n: int) -> list[dict]:
+    """Örnek sayıları süreye ölçeklenir (gerçek örnekleme aralığı ayardan uzun olabilir)"""
+    ms = seconds * 1000 / max(1, sum(samples.values()))
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in samples.items():
+        names = stack.split(";")
+        own[names[-1]] += count
+        for name in set(names):
+            total[name] += count
+    return [
+        {"function": name, "calls": None, "self_ms": own[name] * ms, "total_ms": total[name] * ms}
+        for name, _ in sorted(total.items(), key=lambda item: (own[item[0]], item[1]), reverse=True)[:n]
+    ]
+
+
+def profile_call(fn: Callable, *args, mode: str = "cprofile", label: str = "run", top_n: int = PROFILE_TOP_N, **kwargs):
+    """fn(*args, **kwargs) çağrısını profille: (sonuç, Profile). Eşzamanlı çağrılar sırayla çalışır"""
+    if mode not in MODES:
+        raise ValueError(f"Profil modu {MODES} içinden olmalı: {mode!r}")
+    with _LOCK:
+        return _profile_call(fn, args, kwargs, mode, label, top_n)
+
+
+def _profile_call(fn: Callable, args: tuple, kwargs: dict, mode: str, label: str, top_n: int):
+    start = time.perf_counter()
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn, *args, **kwargs)
+        seconds = time.perf_counter() - start
+        stats = pstats.Stats(profiler)
+        # runcall'ın kendi disable() çağrısı ölçüme dahil değil
+        for func in [f for f in stats.stats if f[0] == "~" and "_lsprof.Profiler" in f[2]]:
+            del stats.stats[func]
+        return result, Profile(label, mode, seconds, _cprofile_folded(stats), _cprofile_top(stats, top_n), stats)
+
+    interval = PROFILE_INTERVAL_MS / 1000
+    sampler = _Sampler(threading.get_ident(), sys._getframe(), interval)
+    # Örnekleyici GIL'i ancak thread geçiş aralığında alabilir (varsayılan 5 ms)
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch, interval / 2))
+    sampler.start()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        sampler.stop()
+        sys.setswitchinterval(switch)
+    seconds = time.perf_counter() - start
+    return result, Profile(label, mode, seconds, dict(sampler.samples), _sampling_top(sampler.samples, seconds, top_n))
+
+
+def prune_profiles(directory=PROFILE_DIR, keep: int = PROFILE_KEEP) -> int:
+    """En yeni keep profil dışındakileri (.folded ve .pstats) sil; silinen profil sayısı"""
+    removed = 0
+    for path in recent_profiles(directory, limit=None)[max(keep, 0):]:
+        for stale in (path, path.with_suffix(".pstats")):
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+        removed += 1
+    return removed
+
+
+def recent_profiles(directory=PROFILE_DIR, limit: Optional[int] = 20) -> list[Path]:
+    """Dizindeki en yeni katlanmış yığın dosyaları (limit=None: hepsi)"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.folded"), key=lambda p: (_mtime(p), p.name), reverse=True)[:limit]
+
+
+def _mtime(path: Path) -> float:
+    # Eşzamanlı prune_profiles dosyayı silmiş olabilir
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
@@ -0,0 +1,148 @@
+"""
+Kur servisi - değiştirilebilir kaynak, TTL cache ve tarih bazlı disk snapshot'ları
+Her snapshot'ın sabit bir kimliği vardır (tarih + kur özeti); proforma
+hangi snapshot'la hesaplandığını kaydeder, geçmiş proformalar aynı kurla
+tekrar hesaplanabilir.
+"""
+import csv
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from config.settings import DEFAULT_USD_EUR_RATE, DEFAULT_USD_TL_RATE, RATES_CSV_PATH, RATES_TTL_SEC
+
+SNAPSHOT_DIR = Path(__file__).parent.parent / "data" / "rates"
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """Belirli bir tarih için kurlar. snapshot_id: '2026-10-18-1a2b3c4d'"""
+    snapshot_id: str
+    rate_date: str
+    usd_eur: float
+    usd_tl: float
+    source: str
+    fetched_at: str
+
+
+class StaticRateSource:
+    """Sabit kurlar (varsayılan / form değerleri)"""
+    name = "static"
+
+    def __init__(self, usd_eur: float = DEFAULT_USD_EUR_RATE, usd_tl: float = DEFAULT_USD_TL_RATE):
+        self.usd_eur = usd_eur
+        self.usd_tl = usd_tl
+
+    def fetch(self, rate_date: date) -> tuple[float, float]:
+        return self.usd_eur, self.usd_tl
+
+
+class CsvRateSource:
+    """
+    CSV kur dosyası: date,usd_eur,usd_tl başlıklı. İstenen tarihe eşit
+    veya önceki en son satır kullanılır.
+    """
+    name = "csv"
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def fetch(self, rate_date: date) -> tuple[float, float]:
+        wanted = rate_date.isoformat()
+        best = None
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                row_date = row["date"].strip()
+                if row_date <= wanted and (best is None or row_date >= best[0]):
+                    best = (row_date, float(row["usd_eur"]), float(row["usd_tl"]))
+        if best is None:
+            raise LookupError(f"{self.path} içinde {wanted} veya öncesine ait kur yok")
+        return best[1], best[2]
+
+
+def _snapshot_id(rate_date: str, usd_eur: float, usd_tl: float, source: str) -> str:
+    digest = hashlib.sha1(f"{usd_eur!r}|{usd_tl!r}|{source}".encode("utf-8")).hexdigest()[:8]
+    return f"{rate_date}-{digest}"
+
+
+class RateProvider:
+    """
+    Kur sağlayıcı: kaynak -> bellek içi TTL cache -> disk snapshot.
+    get() tarih başına TTL süresince kaynağa tekrar gitmez; load() snapshot
+    kimliğiyle diskteki kaydı okur (deterministik tekrar hesap için).
+    """
+
+    def __init__(self, source, snapshot_dir: Path = SNAPSHOT_DIR, ttl: float = RATES_TTL_SEC):
+        self.source = source
+        self.snapshot_dir = Path(snapshot_dir)
+        self.ttl = ttl
+        self._cache: dict[str, tuple[float, RateSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, rate_date: Optional[date] = None) -> RateSnapshot:
+        """Tarih için güncel snapshot (varsayılan: bugün)"""
+        rate_date = rate_date or date.today()
+        key = rate_date.isoformat()
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and now - cached[0] < self.ttl:
+                return cached[1]
+
+        usd_eur, usd_tl = self.source.fetch(rate_date)
+        snapshot = RateSnapshot(
+            snapshot_id=_snapshot_id(key, usd_eur, usd_tl, self.source.name),
+            rate_date=key,
+            usd_eur=usd_eur,
+            usd_tl=usd_tl,
+            source=self.source.name,
+            fetched_at=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        snapshot = self._persist(snapshot)
+        with self._lock:
+            self._cache[key] = (now, snapshot)
+        return snapshot
+
+    def load(self, snapshot_id: str) -> RateSnapshot:
+        """Diskteki snapshot'ı kimliğiyle oku"""
+        path = self.snapshot_dir / f"{snapshot_id}.json"
+        with open(path, encoding="utf-8") as f:
+            return RateSnapshot(**json.load(f))
+
+    def invalidate(self):
+        """Bellek cache'ini boşalt (kaynak dosyası değiştiğinde)"""
+        with self._lock:
+            self._cache.clear()
+
+    def _persist(self, snapshot: RateSnapshot) -> RateSnapshot:
+        """Snapshot'ı yaz; aynı kimlik zaten varsa diskteki kayıt esas alınır"""
+        path = self.snapshot_dir / f"{snapshot.snapshot_id}.json"
+        if path.exists():
+            return self.load(snapshot.snapshot_id)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(snapshot), f, ensure_ascii=False, indent=2)
+        tmp.replace(path)
+        return snapshot
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_rate_provider() -> RateProvider:
+    """Süreç başına kur sağlayıcı: RATES_CSV dosyası varsa CSV, yoksa varsayılan kurlar"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                csv_path = Path(RATES_CSV_PATH)
+                source = CsvRateSource(csv_path) if csv_path.exists() else StaticRateSource()
+                _provider = RateProvider(source)
+    return _provider
@@ -0,0 +1,56 @@
+"""
+Süreç başına paylaşılan Streamlit kaynakları
+Sayfalar her etkileşimde baştan çalışır. Proforma motoru, derlenmiş tarife
+setleri ve DB havuzları st.cache_resource ile süreç başına bir kez kurulur;
+kayıtlı proformaların Excel çıktısı (değişmez) st.cache_data ile tutulur.
+METRICS_ENABLED ise süre ölçümü motorla birlikte bir kez açılır.
+openpyxl ve pandas gibi ağır modüller ancak gerçekten kullanıldığında yüklenir.
+"""
+import streamlit as st
+
+from calculators.engine import ProformaEngine
+from calculators.tariff_sets import TariffRegistry, registry
+
+
+@st.cache_resource(show_spinner=False)
+def proforma_engine() -> ProformaEngine:
+    """Tüm oturumların paylaştığı motor (sabit kalem cache'i korunur)"""
+    metrics()
+    return ProformaEngine()
+
+
+@st.cache_resource(show_spinner=False)
+def tariff_registry() -> TariffRegistry:
+    """Tarife YAML'ları ilk yüklemede bir kez okunup derlenir"""
+    return registry()
+
+
+@st.cache_resource(show_spinner=False)
+def databases() -> tuple:
+    """Kullanıcı ve proforma DB havuzları (şema / migration bir kez)"""
+    from auth.database import get_pool as users_pool
+    from history.store import get_pool as history_pool
+    return users_pool(), history_pool()
+
+
+@st.cache_resource(show_spinner=False)
+def metrics() -> bool:
+    """METRICS_ENABLED ise süre ölçümü süreç başına bir kez açılır"""
+    from utils.metrics import configure, is_enabled
+    configure()
+    return is_enabled()
+
+
+def warm_up():
+    """İlk sayfa yüklemesinde paylaşılan kaynakları hazırla"""
+    tariff_registry()
+    databases()
+    proforma_engine()
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def proforma_excel(proforma_id: int, user_id: int) -> bytes:
+    """Kayıtlı proformanın .xlsx içeriği (kayıtlar değişmez, güvenle cache'lenir)"""
+    from history.export import proforma_xlsx
+    from history.store import get_proforma
+    return proforma_xlsx(get_proforma(proforma_id, user_id=user_id))
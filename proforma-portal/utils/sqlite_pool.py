@@ -0,0 +1,127 @@
+"""
+Thread-safe SQLite bağlantı havuzu - WAL modu ve ayarlı pragmalar
+Streamlit oturumları thread'lerden çalıştığı için bağlantılar thread'ler
+arasında paylaşılır (check_same_thread=False) ama aynı anda tek thread kullanır.
+Bağlantılar kapanmadığı için sqlite3'ün statement cache'i (cached_statements)
+aynı SQL metinlerini çağrılar arasında hazır (prepared) tutar.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA foreign_keys = ON",
+)
+
+STATEMENT_CACHE_SIZE = 256
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Havuzda süre içinde boş bağlantı bulunamadı"""
+
+
+class ConnectionPool:
+    """
+    Süreç başına SQLite bağlantı havuzu.
+    init_script ilk bağlantı açılırken bir kez çalışır (şema).
+    Fork sonrası yeni süreçte havuz sıfırlanır.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_size: int = 8,
+        init_script: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.init_script = init_script
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if self.init_script and not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    conn.executescript(self.init_script)
+                    self._initialized = True
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            create = self._created < self.max_size
+            if create:
+                if self._created == 0:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._created += 1
+
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"Veritabanı bağlantı havuzu dolu ({self.max_size})") from None
+
+    def _release(self, conn: sqlite3.Connection):
+        if self._pid != os.getpid():
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Havuzdan bağlantı al, blok sonunda geri ver (açık transaction geri alınır)"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapat"""
+        with self._lock:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                self._created -= 1
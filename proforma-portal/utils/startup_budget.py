@@ -0,0 +1,115 @@
+"""
+Sayfa açılış süresi bütçesi - Streamlit AppTest ile ölçüm
+  python -m utils.startup_budget            # tüm sayfalar, bütçe aşılırsa çıkış kodu 1
+  python -m utils.startup_budget --runs 20  # sıcak tekrar sayısı
+Her sayfa ayrı süreçte ölçülür: soğuk = yeni süreçte ilk çalıştırma (modül
+importları ve cache_resource kurulumu dahil, streamlit importu hariç),
+sıcak = aynı oturumda tekrar çalıştırmaların medyanı (Proforma Oluştur'da
+canlı önizleme dahil), kayıt = Kaydet butonuyla kayıt + Excel turu.
+Veritabanları geçici dizinde açılır.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from config.settings import STARTUP_BUDGET_MS, RERUN_BUDGET_MS, SUBMIT_BUDGET_MS
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+PAGES = (
+    "app.py",
+    "pages/1_Proforma_Olustur.py",
+    "pages/2_Gecmis_Proformalar.py",
+    "pages/4_Senaryo_Karsilastirma.py",
+)
+
+_BUDGET_USER = {"id": 1, "email": "budget@example.com", "full_name": "Budget", "company_name": ""}
+
+
+def _use_temp_databases(directory: str):
+    """Ölçüm kayıtları gerçek veritabanına yazılmasın"""
+    import auth.database
+    import history.store
+    auth.database.DB_PATH = Path(directory) / "users.db"
+    history.store.DB_PATH = Path(directory) / "proformas.db"
+
+
+def _elapsed_ms(at) -> float:
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def measure_page(page: str, runs: int) -> dict:
+    """Tek sayfa ölçümü (yeni süreçte çağrılmalı)"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_DIR / page), default_timeout=60)
+    if page != "app.py":
+        at.session_state["user"] = dict(_BUDGET_USER)
+    result = {"page": page, "cold_ms": _elapsed_ms(at)}
+    result["rerun_ms"] = statistics.median(_elapsed_ms(at) for _ in range(runs))
+    submit = [b for b in at.button if b.label == "Kaydet"]
+    if submit:
+        submit[0].click()
+        result["submit_ms"] = _elapsed_ms(at)
+    return result
+
+
+def _measure_in_subprocess(page: str, runs: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "utils.startup_budget", "--child", page, "--runs", str(runs)],
+        cwd=APP_DIR, capture_output=True, text=True, check=False,
+    )
+    if out.returncode != 0:
+        return {"page": page, "error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "hata"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.startup_budget", description="Sayfa açılış süresi bütçesi")
+    parser.add_argument("--runs", type=int, default=10, help="Sıcak tekrar sayısı")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yaz")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        with tempfile.TemporaryDirectory() as tmp:
+            _use_temp_databases(tmp)
+            print(json.dumps(measure_page(args.child, args.runs)))
+        return 0
+
+    budgets = {"cold_ms": STARTUP_BUDGET_MS, "rerun_ms": RERUN_BUDGET_MS, "submit_ms": SUBMIT_BUDGET_MS}
+    results = [_measure_in_subprocess(page, args.runs) for page in PAGES]
+    failed = False
+    for result in results:
+        over = [k for k, limit in budgets.items() if result.get(k, 0) > limit]
+        result["over_budget"] = over
+        failed = failed or bool(over) or "error" in result
+
+    if args.json:
+        print(json.dumps({"budgets": budgets, "pages": results}, indent=2))
+    else:
+        print(f"Bütçe: soğuk {STARTUP_BUDGET_MS:.0f} ms, sıcak {RERUN_BUDGET_MS:.0f} ms, kayıt {SUBMIT_BUDGET_MS:.0f} ms")
+        for result in results:
+            if "error" in result:
+                print(f"  {result['page']}: HATA {result['error']}")
+                continue
+            parts = [f"soğuk {result['cold_ms']:.0f} ms", f"sıcak {result['rerun_ms']:.0f} ms"]
+            if "submit_ms" in result:
+                parts.append(f"kayıt {result['submit_ms']:.0f} ms")
+            flag = f"  AŞILDI: {', '.join(result['over_budget'])}" if result["over_budget"] else ""
+            print(f"  {result['page']}: {', '.join(parts)}{flag}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())